@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+カテゴリ振り分けのベンチマーク
+同じテスト結果から詳細レポートを作成し、従来方式（結果を辞書のリストで保持し、保存時に
+カテゴリごとに全件を再フィルタ＋結果ごとに全件を再集計）と現在の ExcelReporter
+（add_test_result 時に振り分け・集計）の処理時間を比較する。
+結果の追加（add_test_result）、シートの作成（create_detail_sheet / create_summary_sheet）、
+ファイルへの保存（workbook.save）の時間を分けて表示する
+
+使い方:
+    python benchmarks/bench_category_partitioning.py [--categories 50] [--results 50000]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from excel_reporter import ExcelReporter, RESULT_FIELDS  # noqa: E402
+
+STATUSES = ["passed", "failed", "skipped"]
+
+
+class LegacyResults:
+    """従来方式の結果の保持（辞書のリスト。カテゴリ別の結果は取得のたびに全件をフィルタする）"""
+    
+    def __init__(self):
+        """初期化"""
+        self.test_results = []
+    
+    def append(self, result):
+        """テスト結果の追加"""
+        self.test_results.append(result)
+    
+    def categories(self):
+        """カテゴリの一覧（全件から抽出）"""
+        return set(r["category"] for r in self.test_results)
+    
+    def rows(self, category=None):
+        """RESULT_FIELDS の順のタプル（カテゴリ指定時は全件をフィルタ）"""
+        return [tuple(r[field] for field in RESULT_FIELDS) for r in self.test_results
+                if category is None or r["category"] == category]
+
+
+class LegacyReporter(ExcelReporter):
+    """従来方式の ExcelReporter（シートの書き込みは現在と同じ処理を使用する）"""
+    
+    def __init__(self, output_dir: str):
+        """初期化"""
+        super().__init__(output_dir=output_dir)
+        self.results = LegacyResults()
+    
+    def add_test_result(self, test_name, status, duration, error_message="", category="General",
+                        timestamp=None):
+        """テスト結果の追加（振り分け・集計を行わずに追加のみ）"""
+        self.results.append({
+            "test_name": test_name,
+            "status": status,
+            "duration": duration,
+            "error_message": error_message,
+            "category": category,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    
+    def _summary_stats(self):
+        """サマリーの統計データ（全件を再集計）"""
+        results = self.results.test_results
+        total = len(results)
+        stats = [("総テスト数", total, 100.0, "")]
+        for item, status in (("成功", "passed"), ("失敗", "failed"), ("スキップ", "skipped")):
+            count = sum(1 for r in results if r["status"] == status)
+            stats.append((item, count, (count/total*100 if total > 0 else 0), ""))
+        return stats
+
+
+def measure(reporter: ExcelReporter, inputs: list) -> dict:
+    """
+    1つの方式の計測
+    
+    Args:
+        reporter: 計測する ExcelReporter
+        inputs: add_test_result の引数のリスト
+    
+    Returns:
+        {"add", "build", "save": 所要時間（秒）, "sheets": (シート名, 行数) のリスト}
+    """
+    reporter.initialize_workbook()
+    
+    start = time.perf_counter()
+    for kwargs in inputs:
+        reporter.add_test_result(**kwargs)
+    add_time = time.perf_counter() - start
+    
+    # ExcelReporter.save と同じ順でシートを作成
+    start = time.perf_counter()
+    for category in sorted(reporter.results.categories()):
+        reporter.create_detail_sheet(category)
+    reporter.create_detail_sheet()
+    reporter.create_summary_sheet()
+    build_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    reporter.workbook.save(reporter.excel_file)
+    save_time = time.perf_counter() - start
+    
+    sheets = [(ws.title, ws.max_row) for ws in reporter.workbook.worksheets]
+    return {"add": add_time, "build": build_time, "save": save_time, "sheets": sheets}
+
+
+def run(num_categories: int, num_results: int):
+    """
+    ベンチマークの実行
+    
+    Args:
+        num_categories: カテゴリ数
+        num_results: テスト結果の件数
+    """
+    random.seed(0)
+    categories = [f"Category {i:02d}" for i in range(num_categories)]
+    inputs = [
+        {
+            "test_name": f"tests/test_bench.py::test_{i}",
+            "status": random.choice(STATUSES),
+            "duration": random.random(),
+            "category": random.choice(categories),
+        }
+        for i in range(num_results)
+    ]
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        legacy = measure(LegacyReporter(output_dir=os.path.join(output_dir, "legacy")), inputs)
+        current = measure(ExcelReporter(output_dir=os.path.join(output_dir, "current")), inputs)
+    
+    # 同じシート構成・行数のレポートが作成されていること
+    assert legacy["sheets"] == current["sheets"]
+    
+    print(f"カテゴリ数: {num_categories}, 結果件数: {num_results}")
+    for label, times in (("従来方式（再フィルタ）  ", legacy), ("現在（追加時に振り分け）", current)):
+        total = times["add"] + times["build"] + times["save"]
+        print(f"  {label}: 結果の追加 {times['add']:.3f}秒, シート作成 {times['build']:.3f}秒, "
+              f"保存 {times['save']:.3f}秒, 合計 {total:.3f}秒")
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, default=50, help="カテゴリ数")
+    parser.add_argument("--results", type=int, default=50000, help="テスト結果の件数（最大）")
+    args = parser.parse_args()
+    
+    # ExcelReporter のログ出力を抑制
+    logging.getLogger("pytest_logger").setLevel(logging.WARNING)
+    
+    for num_results in (args.results // 100, args.results // 10, args.results):
+        run(args.categories, num_results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+セルスタイル適用のベンチマーク
+詳細シートと同じ構成のシートを作成し、従来方式（セルごとにPatternFill/Borderを生成）と
+StyleRegistry（スタイルIDのキャッシュ）の処理時間・メモリ割り当て量・保存時間を比較する。
+StyleRegistry で短縮されるのはシートの作成時間のみで、割り当てピーク（セルオブジェクトが大半）と
+保存時間（セルのXMLのシリアライズが大半）はほぼ変わらない
+（20000行の計測例: 作成 7.05秒 → 0.95秒、割り当てピーク 48.7MB → 48.6MB、保存 2.16秒 → 2.51秒（ばらつきの範囲））
+
+使い方:
+    python benchmarks/bench_cell_styles.py [--rows 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook  # noqa: E402
+from openpyxl.styles import PatternFill, Border, Side  # noqa: E402
+from testlib.excel_styles import StyleRegistry, status_style  # noqa: E402
+
+STATUSES = ["passed", "failed", "skipped"]
+STATUS_COLORS = {"passed": "C6EFCE", "failed": "FFC7CE", "skipped": "FFEB9C"}
+
+
+def fill_legacy(ws, rows):
+    """従来方式: セルごとにスタイルオブジェクトを生成"""
+    for row_idx, status in enumerate(rows, start=2):
+        border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        for col in (1, 2, 3, 5, 6, 7):
+            ws.cell(row=row_idx, column=col, value=f"value{col}").border = border
+        status_cell = ws.cell(row=row_idx, column=4, value=status)
+        status_cell.border = border
+        color = STATUS_COLORS[status]
+        status_cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+def fill_registry(ws, rows):
+    """新方式: StyleRegistry でスタイルIDを再利用"""
+    apply_style = StyleRegistry().apply
+    for row_idx, status in enumerate(rows, start=2):
+        for col in (1, 2, 3, 5, 6, 7):
+            apply_style(ws.cell(row=row_idx, column=col, value=f"value{col}"), "body")
+        apply_style(ws.cell(row=row_idx, column=4, value=status), status_style(status))
+
+
+def measure(fill, rows, output_dir):
+    """
+    シート作成と保存の計測
+    
+    Args:
+        fill: シート作成関数
+        rows: 各行のテスト結果
+        output_dir: 保存先ディレクトリ
+        
+    Returns:
+        (作成時間, 割り当てピーク(バイト), 保存時間)
+    """
+    # 割り当てピークは別のワークブックで計測する（tracemalloc 有効時は処理が遅くなるため、作成時間は含めない）
+    tracemalloc.start()
+    fill(Workbook().active, rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    workbook = Workbook()
+    ws = workbook.active
+    start = time.perf_counter()
+    fill(ws, rows)
+    build_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    workbook.save(os.path.join(output_dir, f"{fill.__name__}.xlsx"))
+    save_time = time.perf_counter() - start
+    return build_time, peak, save_time
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="行数")
+    args = parser.parse_args()
+    
+    random.seed(0)
+    rows = [random.choice(STATUSES) for _ in range(args.rows)]
+    
+    print(f"行数: {args.rows}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for fill in (fill_legacy, fill_registry):
+            build_time, peak, save_time = measure(fill, rows, output_dir)
+            print(f"  {fill.__name__:14s} 作成: {build_time:.3f}秒  "
+                  f"割り当てピーク: {peak / 1024 / 1024:.1f}MB  保存: {save_time:.3f}秒")
+
+
+if __name__ == "__main__":
+    main()
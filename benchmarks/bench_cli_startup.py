@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+pytest の起動時間のベンチマーク
+conftest の読み込み時間と、テストを実行しない起動（--collect-only / --help / --fixtures 等）の
+所要時間を計測する。テストを実行しない起動で output/ にログファイル・結果ファイルが
+作成されないことも確認する
+
+使い方:
+    python benchmarks/bench_cli_startup.py [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(ROOT_DIR, "output")
+
+# 計測する pytest のコマンドライン
+COMMAND_LINES = [
+    ["--collect-only", "-q"],
+    ["--collect-only", "-q", "--skip-ok"],
+    ["--help"],
+    ["--fixtures"],
+    ["--markers"],
+]
+
+# テストを実行する場合にのみ読み込むモジュール（conftest の読み込み時には読み込まれないこと）
+DEFERRED_MODULES = ["excel_reporter", "openpyxl", "pyarrow", "yaml"]
+
+# conftest の読み込み時間を計測するスクリプト（pytest 本体の読み込み時間は含めない）
+IMPORT_SCRIPT = """
+import sys, time
+import pytest
+start = time.perf_counter()
+import conftest
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(name for name in {modules!r} if name in sys.modules))
+"""
+
+# テストを実行する場合に読み込むモジュールの読み込み時間を計測するスクリプト
+DEFERRED_SCRIPT = """
+import time
+start = time.perf_counter()
+import excel_reporter
+import testlib.config_manager, testlib.excel_manager_group, testlib.result_history
+from testlib.result_exporter import load_pyarrow
+load_pyarrow()
+print(time.perf_counter() - start)
+"""
+
+
+def run_python(script: str) -> str:
+    """
+    リポジトリのルートで Python スクリプトを実行
+    
+    Args:
+        script: スクリプト
+    
+    Returns:
+        標準出力
+    """
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT_DIR,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def list_output_files() -> set:
+    """output/ のファイル一覧"""
+    if not os.path.isdir(OUTPUT_DIR):
+        return set()
+    return set(os.listdir(OUTPUT_DIR))
+
+
+def measure_command(args: list, repeat: int):
+    """
+    pytest の起動時間の計測
+    
+    Args:
+        args: pytest のコマンドライン引数
+        repeat: 繰り返し回数
+    
+    Returns:
+        (所要時間の中央値（秒）, 作成されたファイルの一覧)
+    """
+    before = list_output_files()
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "pytest", "-p", "no:cacheprovider"] + args, cwd=ROOT_DIR,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed.append(time.perf_counter() - start)
+    return statistics.median(elapsed), sorted(list_output_files() - before)
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="各計測の繰り返し回数（中央値を表示）")
+    args = parser.parse_args()
+    
+    import_times = []
+    loaded = ""
+    for _ in range(args.repeat):
+        elapsed, _, loaded = run_python(IMPORT_SCRIPT.format(modules=DEFERRED_MODULES)).partition(" ")
+        import_times.append(float(elapsed))
+    deferred_times = [float(run_python(DEFERRED_SCRIPT)) for _ in range(args.repeat)]
+    
+    print(f"conftest の読み込み: {statistics.median(import_times) * 1000:.1f}ms"
+          f"（読み込み済みの重いモジュール: {loaded or 'なし'}）")
+    print(f"テスト実行時にのみ読み込むモジュール: {statistics.median(deferred_times) * 1000:.1f}ms")
+    
+    failed = False
+    for command in COMMAND_LINES:
+        elapsed, created = measure_command(command, args.repeat)
+        print(f"  pytest {' '.join(command)}: {elapsed * 1000:.1f}ms"
+              + (f"  作成されたファイル: {', '.join(created)}" if created else ""))
+        failed = failed or bool(created)
+    
+    if loaded or failed:
+        print("NG: テストを実行しない起動で、重いモジュールの読み込みまたはファイルの作成が行われました")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+レポート処理全体のベンチマーク
+テンプレートブックとテスト結果を規模（件数）ごとに生成し、次の処理の所要時間と
+ピークメモリ（最大RSS）を計測する。結果は JSON で出力し、--compare で以前の結果と比較できる。
+
+    excel_manager            : ExcelManager（遅延読み込み）の open / lookup / write / save
+    excel_manager_patch      : ExcelManager（パッチモード）の open / lookup / write / save
+    excel_reporter           : ExcelReporter（通常モード）の add / save
+    excel_reporter_streaming : ExcelReporter（ストリーミングモード）の add / save
+    hooks                    : conftest.pytest_runtest_logreport（詳細レポート・テンプレート・ジャーナルへの記録）
+
+最大RSSはプロセス全体の最大値のため、規模・対象ごとに子プロセスで計測する。
+テンプレートの行数は --max-template-rows で頭打ちにし、それを超える結果は
+同じテスト番号に繰り返し書き込む（パラメータ化テストで同じテスト番号を共有する場合に相当）。
+
+使い方:
+    python benchmarks/bench_reporting_suite.py [--scales 1000,10000,100000,1000000]
+        [--components excel_manager,hooks] [--output result.json]
+        [--compare baseline.json --threshold 1.2]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List
+
+try:
+    import resource
+except ImportError:  # Windows では最大RSSを取得しない
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import openpyxl  # noqa: E402
+from openpyxl import Workbook  # noqa: E402
+from excel_reporter import ExcelReporter  # noqa: E402
+from testlib.excel_manager import ExcelManager, HEADER_ROW  # noqa: E402
+from testlib.result_history import percentile  # noqa: E402
+from testlib.result_journal import ResultJournal  # noqa: E402
+
+SHEET_NAME = "テスト結果"
+COMPONENTS = ("excel_manager", "excel_manager_patch", "excel_reporter", "excel_reporter_streaming", "hooks")
+DEFAULT_SCALES = "1000,10000,100000,1000000"
+STATUSES = ("passed", "passed", "passed", "failed", "skipped")
+CATEGORIES = [f"Category {i:02d}" for i in range(20)]
+ERROR_TEXT = "def test_case():\n>       assert 1 == 2\nE       AssertionError: assert 1 == 2\n"
+
+
+def create_template(path: str, rows: int):
+    """
+    ベンチマーク用テンプレートの生成（書き込み専用モードで作成）
+    
+    Args:
+        path: 保存先のパス
+        rows: テストケースの行数
+    """
+    workbook = Workbook(write_only=True)
+    ws = workbook.create_sheet(SHEET_NAME)
+    ws.append(["ターゲットROMバージョン:", ""])
+    for _ in range(HEADER_ROW - 2):
+        ws.append([])
+    ws.append(["テスト番号", "テスト分類１", "テスト分類２", "テスト手順",
+               "期待値", "テスト実施日付", "テスト結果", "テスト結果補足"])
+    for i in range(rows):
+        ws.append([case_id(i), f"分類 {i % 50}", f"分類 {i % 7}", f"手順 {i}", f"期待値 {i}"])
+    workbook.save(path)
+
+
+def case_id(i: int) -> str:
+    """i 番目のテストケースのテスト番号"""
+    return f"TC{i:07d}"
+
+
+def synthetic_results(count: int, template_rows: int) -> Iterable[Dict[str, Any]]:
+    """
+    テスト結果の生成
+    
+    Args:
+        count: 結果の件数
+        template_rows: テンプレートの行数（テスト番号はこの範囲で繰り返す）
+    
+    Yields:
+        テスト結果（ジャーナルと同じ形式の辞書）
+    """
+    for i in range(count):
+        status = STATUSES[i % len(STATUSES)]
+        yield {
+            "test_name": f"tests/test_bench.py::test_case[{i}]",
+            "test_id": case_id(i % template_rows),
+            "status": status,
+            "duration": (i % 1000) / 1000,
+            "error_message": ERROR_TEXT if status == "failed" else "",
+            "error_info": "AssertionError: assert 1 == 2" if status == "failed" else "",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+        }
+
+
+def latency_stats(samples: array) -> Dict[str, float]:
+    """
+    1回ごとの所要時間（ナノ秒）の集計
+    
+    Args:
+        samples: 所要時間の配列
+    
+    Returns:
+        件数・合計（秒）・平均・中央値・99パーセンタイル・最大（マイクロ秒）
+    """
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "total_s": round(total / 1e9, 6),
+        "mean_us": round(total / len(ordered) / 1e3, 3),
+        "p50_us": round(percentile(ordered, 50) / 1e3, 3),
+        "p99_us": round(percentile(ordered, 99) / 1e3, 3),
+        "max_us": round(ordered[-1] / 1e3, 3),
+    }
+
+
+def time_once(func: Callable, *args) -> Dict[str, float]:
+    """
+    1回だけ行う処理（読み込み・保存）の所要時間
+    
+    Args:
+        func: 処理
+        args: 引数
+    
+    Returns:
+        件数（1）と合計（秒）
+    """
+    start = time.perf_counter_ns()
+    func(*args)
+    return {"count": 1, "total_s": round((time.perf_counter_ns() - start) / 1e9, 6)}
+
+
+def time_each(func: Callable, argument_lists: Iterable[tuple]) -> Dict[str, float]:
+    """
+    繰り返し行う処理の1回ごとの所要時間の計測
+    
+    Args:
+        func: 処理
+        argument_lists: 1回ごとの引数のタプル
+    
+    Returns:
+        latency_stats の戻り値
+    """
+    samples = array("q")
+    clock = time.perf_counter_ns
+    for args in argument_lists:
+        start = clock()
+        func(*args)
+        samples.append(clock() - start)
+    return latency_stats(samples)
+
+
+def bench_excel_manager(work_dir: str, template: str, count: int, template_rows: int,
+                        patch_mode: bool) -> Dict[str, Dict[str, float]]:
+    """ExcelManager の読み込み・検索・書き込み・保存"""
+    output = os.path.join(work_dir, "results.xlsx")
+    manager = ExcelManager(template_path=template, output_path=output, sheet_name=SHEET_NAME,
+                           rom_version="v0.0", tester_name="", patch_mode=patch_mode)
+    manager.prepare_output_file()
+    operations = {"open": time_once(manager.open_workbook, True)}
+    manager.write_test_info()
+    operations["lookup"] = time_each(manager.find_test_row,
+                                     ((case_id(i % template_rows),) for i in range(count)))
+    operations["write"] = time_each(manager.write_test_result,
+                                    ((r["test_id"], r["status"], r["error_info"])
+                                     for r in synthetic_results(count, template_rows)))
+    operations["save"] = time_once(manager.save)
+    manager.close()
+    return operations
+
+
+def bench_excel_reporter(work_dir: str, count: int, template_rows: int,
+                         streaming: bool) -> Dict[str, Dict[str, float]]:
+    """ExcelReporter の結果追加・保存"""
+    reporter = ExcelReporter(output_dir=work_dir, streaming=streaming)
+    reporter.initialize_workbook()
+    timestamp = time.time()
+    operations = {"add": time_each(reporter.add_test_result,
+                                   ((r["test_name"], r["status"], r["duration"], r["error_message"],
+                                     r["category"], timestamp)
+                                    for r in synthetic_results(count, template_rows)))}
+    operations["save"] = time_once(reporter.save)
+    return operations
+
+
+def bench_hooks(work_dir: str, template: str, count: int, template_rows: int) -> Dict[str, Dict[str, float]]:
+    """conftest.pytest_runtest_logreport（1件の結果を全ての出力先に記録する処理）"""
+    import conftest
+    
+    conftest.logger = logging.getLogger("pytest_logger")
+    conftest.excel_reporter = ExcelReporter(output_dir=work_dir)
+    conftest.excel_reporter.initialize_workbook()
+    conftest.excel_manager = ExcelManager(template_path=template, output_path=os.path.join(work_dir, "results.xlsx"),
+                                          sheet_name=SHEET_NAME, rom_version="v0.0", tester_name="")
+    conftest.excel_manager.prepare_output_file()
+    conftest.excel_manager.open_workbook(lazy=True)
+    conftest.result_journal = ResultJournal(os.path.join(work_dir, "journal.jsonl"))
+    
+    reports = (
+        (SimpleNamespace(when="call", nodeid=r["test_name"], outcome=r["status"], duration=r["duration"],
+                         longrepr=r["error_message"] or None, excel_test_id=r["test_id"],
+                         excel_category=r["category"]),)
+        for r in synthetic_results(count, template_rows)
+    )
+    operations = {"logreport": time_each(conftest.pytest_runtest_logreport, reports)}
+    conftest.result_journal.close()
+    conftest.excel_manager.close()
+    return operations
+
+
+def peak_rss_mb() -> float:
+    """
+    このプロセスの最大RSS
+    
+    Returns:
+        最大RSS（MB）。取得できない場合はNone
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux は KB、macOS はバイト単位
+    return round(peak / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+
+def run_one(component: str, count: int, template_rows: int) -> Dict[str, Any]:
+    """
+    1つの対象・規模の計測（子プロセスで実行）
+    
+    Args:
+        component: 計測対象
+        count: 結果の件数
+        template_rows: テンプレートの行数
+    
+    Returns:
+        計測結果
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        template = os.path.join(work_dir, "template.xlsx")
+        if not component.startswith("excel_reporter"):
+            create_template(template, template_rows)
+        baseline_rss = peak_rss_mb()
+        
+        if component == "excel_manager":
+            operations = bench_excel_manager(work_dir, template, count, template_rows, patch_mode=False)
+        elif component == "excel_manager_patch":
+            operations = bench_excel_manager(work_dir, template, count, template_rows, patch_mode=True)
+        elif component == "excel_reporter":
+            operations = bench_excel_reporter(work_dir, count, template_rows, streaming=False)
+        elif component == "excel_reporter_streaming":
+            operations = bench_excel_reporter(work_dir, count, template_rows, streaming=True)
+        else:
+            operations = bench_hooks(work_dir, template, count, template_rows)
+    
+    return {
+        "component": component,
+        "scale": count,
+        "template_rows": template_rows,
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": peak_rss_mb(),
+        "operations": operations,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """計測環境（バージョン間の比較用）"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "openpyxl": openpyxl.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def print_results(results: List[Dict[str, Any]]):
+    """計測結果の表示"""
+    for result in results:
+        print(f"[{result['component']}] 件数 {result['scale']} (テンプレート {result['template_rows']}行), "
+              f"最大RSS {result['peak_rss_mb']}MB")
+        for name, stats in result["operations"].items():
+            line = f"  {name:<10}: {stats['total_s']:.3f}秒"
+            if stats["count"] > 1:
+                line += (f" (平均 {stats['mean_us']:.1f}µs, 中央値 {stats['p50_us']:.1f}µs, "
+                         f"99% {stats['p99_us']:.1f}µs, 最大 {stats['max_us']:.1f}µs)")
+            print(line)
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float, min_seconds: float) -> int:
+    """
+    以前の計測結果との比較
+    
+    Args:
+        results: 今回の計測結果
+        baseline_path: 以前の計測結果（--output で保存した JSON）
+        threshold: 悪化と判定する倍率
+        min_seconds: 比較する最小の所要時間（これより短い処理は誤差が大きいため対象外）
+    
+    Returns:
+        悪化した項目の数
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["component"], r["scale"]): r for r in json.load(f)["results"]}
+    
+    regressions = 0
+    print(f"比較対象: {baseline_path}（{threshold}倍を超えたものを悪化とする）")
+    for result in results:
+        previous = baseline.get((result["component"], result["scale"]))
+        if previous is None:
+            continue
+        pairs = [(name, stats["total_s"], previous["operations"][name]["total_s"])
+                 for name, stats in result["operations"].items()
+                 if name in previous["operations"] and previous["operations"][name]["total_s"] >= min_seconds]
+        if result["peak_rss_mb"] and previous.get("peak_rss_mb"):
+            pairs.append(("peak_rss_mb", result["peak_rss_mb"], previous["peak_rss_mb"]))
+        for name, current, before in pairs:
+            ratio = current / before if before else 0.0
+            if ratio > threshold:
+                regressions += 1
+                print(f"  悪化: [{result['component']}] 件数 {result['scale']} {name}: "
+                      f"{before:.3f} -> {current:.3f} (x{ratio:.2f})")
+    if not regressions:
+        print("  悪化した項目はありません")
+    return regressions
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="結果の件数（カンマ区切り）")
+    parser.add_argument("--components", default=",".join(COMPONENTS), help="計測対象（カンマ区切り）")
+    parser.add_argument("--max-template-rows", type=int, default=100000, help="テンプレートの最大行数")
+    parser.add_argument("--output", help="計測結果の JSON の保存先")
+    parser.add_argument("--compare", metavar="BASELINE", help="比較する以前の計測結果の JSON")
+    parser.add_argument("--threshold", type=float, default=1.2, help="悪化と判定する倍率")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="比較する最小の所要時間（秒）")
+    parser.add_argument("--run-one", nargs=2, metavar=("COMPONENT", "SCALE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    # レポート処理のログ出力を抑制
+    logging.getLogger("pytest_logger").setLevel(logging.WARNING)
+    
+    # 子プロセス: 1つの対象・規模を計測して JSON を出力
+    if args.run_one:
+        component, count = args.run_one[0], int(args.run_one[1])
+        result = run_one(component, count, min(count, args.max_template_rows))
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    
+    components = [c for c in args.components.split(",") if c]
+    unknown = set(components) - set(COMPONENTS)
+    if unknown:
+        parser.error(f"未対応の計測対象です: {', '.join(sorted(unknown))}")
+    scales = [int(s) for s in args.scales.split(",") if s]
+    
+    results = []
+    for count in scales:
+        for component in components:
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run-one", component, str(count),
+                 "--max-template-rows", str(args.max_template_rows)],
+                capture_output=True, text=True
+            )
+            if completed.returncode != 0:
+                print(f"[{component}] 件数 {count}: 計測に失敗しました\n{completed.stderr}", file=sys.stderr)
+                continue
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+            print_results(results[-1:])
+    
+    document = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+        print(f"計測結果を保存しました: {args.output}")
+    
+    if args.compare and compare(results, args.compare, args.threshold, args.min_seconds):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
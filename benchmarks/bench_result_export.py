@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+テスト結果エクスポートのベンチマーク
+ResultExporter で大量のテスト結果を各形式で書き出し、書き出しと読み込み
+（ダッシュボードでの傾向分析を想定した全件読み込み）の所要時間を比較する
+
+使い方:
+    python benchmarks/bench_result_export.py [--results 1000000] [--batch-size 10000]
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from testlib import result_exporter  # noqa: E402
+from testlib.result_exporter import ResultExporter  # noqa: E402
+
+CATEGORIES = ["Calculation", "String Processing", "List Operations", "Data Validation"]
+STATUSES = ["passed", "passed", "passed", "failed", "skipped"]
+
+
+def make_record(i: int) -> dict:
+    """
+    ベンチマーク用のテスト結果の作成
+    
+    Args:
+        i: 通し番号
+        
+    Returns:
+        テスト結果（ジャーナルと同じ形式）
+    """
+    status = STATUSES[i % len(STATUSES)]
+    return {
+        "test_name": f"tests/test_bench.py::TestBench::test_case_{i}",
+        "test_id": f"TC{i:07d}",
+        "status": status,
+        "duration": (i % 1000) / 1000,
+        "error_message": "AssertionError: assert 1 == 2" if status == "failed" else "",
+        "category": CATEGORIES[i % len(CATEGORIES)],
+        "timestamp": "2026-01-01 12:00:00",
+    }
+
+
+def load(path: str, fmt: str) -> int:
+    """
+    エクスポートしたファイルの全件読み込み
+    
+    Args:
+        path: ファイルのパス
+        fmt: 出力形式
+        
+    Returns:
+        読み込んだ件数
+    """
+    if fmt == "parquet":
+        return result_exporter.pq.read_table(path).num_rows
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            return sum(1 for _ in csv.DictReader(f))
+        return sum(1 for line in f if json.loads(line))
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=1000000, help="テスト結果の件数")
+    parser.add_argument("--batch-size", type=int, default=10000, help="まとめて書き出す件数")
+    args = parser.parse_args()
+    
+    # ResultExporter のログ出力を抑制
+    logging.getLogger("pytest_logger").setLevel(logging.WARNING)
+    
+    formats = ["csv", "jsonl"]
+    if result_exporter.load_pyarrow():
+        formats.insert(0, "parquet")
+    else:
+        print("pyarrow がインストールされていないため、Parquet は計測しません")
+    
+    records = [make_record(i) for i in range(args.results)]
+    print(f"件数: {args.results}, バッチ: {args.batch_size}")
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        for fmt in formats:
+            exporter = ResultExporter(os.path.join(work_dir, "export"), fmt=fmt, batch_size=args.batch_size)
+            start = time.perf_counter()
+            for record in records:
+                exporter.add(record)
+            path = exporter.close()
+            write_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            count = load(path, fmt)
+            read_time = time.perf_counter() - start
+            assert count == args.results
+            
+            size = os.path.getsize(path)
+            print(f"  {fmt:8s}: 書き出し {write_time:.3f}秒, 読み込み {read_time:.3f}秒, "
+                  f"ファイルサイズ {size / 1024 / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
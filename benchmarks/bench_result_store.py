@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+テスト結果の保持に必要なメモリのベンチマーク
+従来方式（結果ごとに6項目の辞書＋実行日時の文字列を保持）と
+ResultStore（項目ごとの配列、カテゴリ・結果は番号、実行日時はエポック秒）の
+メモリ使用量（tracemalloc で計測）と追加の所要時間を比較する
+
+使い方:
+    python benchmarks/bench_result_store.py [--results 1000000] [--categories 50]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from testlib.result_store import ResultStore  # noqa: E402
+
+STATUSES = ["passed", "passed", "passed", "failed", "skipped"]
+
+
+def legacy_store(num_results: int, categories: list) -> list:
+    """従来方式: 結果ごとの辞書（実行日時は追加時に文字列化）"""
+    results = []
+    for i in range(num_results):
+        status = STATUSES[i % len(STATUSES)]
+        results.append({
+            "test_name": f"tests/test_bench.py::test_case[{i}]",
+            "status": status,
+            "duration": (i % 1000) / 1000,
+            "error_message": "AssertionError: assert 1 == 2" if status == "failed" else "",
+            "category": categories[i % len(categories)],
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    return results
+
+
+def compact_store(num_results: int, categories: list) -> ResultStore:
+    """新方式: ResultStore（実行日時はエポック秒）"""
+    store = ResultStore()
+    for i in range(num_results):
+        status = STATUSES[i % len(STATUSES)]
+        store.append(
+            f"tests/test_bench.py::test_case[{i}]",
+            status,
+            (i % 1000) / 1000,
+            "AssertionError: assert 1 == 2" if status == "failed" else "",
+            categories[i % len(categories)],
+        )
+    return store
+
+
+def measure(build, num_results: int, categories: list):
+    """
+    メモリ使用量と所要時間の計測
+    
+    Args:
+        build: 結果を作成する関数
+        num_results: テスト結果の件数
+        categories: カテゴリ名のリスト
+        
+    Returns:
+        (保持しているメモリ（バイト）, 所要時間（秒）)
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = build(num_results, categories)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return current, elapsed
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=1000000, help="テスト結果の件数")
+    parser.add_argument("--categories", type=int, default=50, help="カテゴリ数")
+    args = parser.parse_args()
+    
+    categories = [f"Category {i:02d}" for i in range(args.categories)]
+    print(f"結果件数: {args.results}, カテゴリ数: {args.categories}")
+    for label, build in (("従来方式（辞書のリスト）", legacy_store), ("ResultStore         ", compact_store)):
+        memory, elapsed = measure(build, args.results, categories)
+        print(f"  {label}: {memory / 1024 / 1024:.1f}MB, 追加 {elapsed:.3f}秒")
+
+
+if __name__ == "__main__":
+    main()
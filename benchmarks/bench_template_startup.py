@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+テンプレート読み込み（セッション開始時）のベンチマーク
+大きなテスト仕様書を模したワークブックを生成し、ExcelManager.open_workbook の
+全体読み込みと遅延読み込み（A列のみ読み取り専用で読み込み）の所要時間を比較する
+
+使い方:
+    python benchmarks/bench_template_startup.py [--rows 20000] [--extra-sheets 3]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook  # noqa: E402
+from testlib.excel_manager import ExcelManager, FIRST_DATA_ROW  # noqa: E402
+from testlib.excel_styles import StyleRegistry  # noqa: E402
+
+SHEET_NAME = "テスト結果"
+
+
+def create_template(path: str, rows: int, extra_sheets: int):
+    """
+    ベンチマーク用テンプレートの生成
+    
+    Args:
+        path: 保存先のパス
+        rows: テストケースの行数
+        extra_sheets: 結果シート以外のシート数（同じ行数の仕様シート）
+    """
+    workbook = Workbook()
+    styles = StyleRegistry()
+    sheets = [workbook.active]
+    sheets[0].title = SHEET_NAME
+    for i in range(extra_sheets):
+        sheets.append(workbook.create_sheet(f"仕様{i + 1}"))
+    
+    for ws in sheets:
+        ws["A1"] = "ターゲットROMバージョン:"
+        for col, header in enumerate(["テスト番号", "テスト分類１", "テスト分類２", "テスト手順",
+                                      "期待値", "テスト実施日付", "テスト結果", "テスト結果補足"], start=1):
+            styles.apply(ws.cell(row=FIRST_DATA_ROW - 1, column=col, value=header), "header")
+        for row in range(FIRST_DATA_ROW, FIRST_DATA_ROW + rows):
+            ws.cell(row=row, column=1, value=f"TC{row:06d}")
+            for col in range(2, 6):
+                styles.apply(ws.cell(row=row, column=col, value=f"仕様 {row}-{col}"), "body")
+    workbook.save(path)
+
+
+def measure(path: str, lazy: bool) -> float:
+    """
+    open_workbook の所要時間の計測
+    
+    Args:
+        path: ワークブックのパス
+        lazy: 遅延読み込みを使用するか
+        
+    Returns:
+        所要時間（秒）
+    """
+    manager = ExcelManager(template_path=path, output_path=path, sheet_name=SHEET_NAME,
+                           rom_version="v0.0", tester_name="")
+    start = time.perf_counter()
+    manager.open_workbook(lazy=lazy)
+    manager.write_test_info()
+    elapsed = time.perf_counter() - start
+    assert manager.find_test_row(f"TC{FIRST_DATA_ROW:06d}") == FIRST_DATA_ROW
+    manager.close()
+    return elapsed
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="テストケースの行数")
+    parser.add_argument("--extra-sheets", type=int, default=3, help="結果シート以外のシート数")
+    args = parser.parse_args()
+    
+    # ExcelManager のログ出力を抑制
+    logging.getLogger("pytest_logger").setLevel(logging.WARNING)
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, "template.xlsx")
+        create_template(path, args.rows, args.extra_sheets)
+        size = os.path.getsize(path)
+        
+        print(f"行数: {args.rows}, シート数: {args.extra_sheets + 1}, ファイルサイズ: {size / 1024 / 1024:.1f}MB")
+        print(f"  全体読み込み: {measure(path, lazy=False):.3f}秒")
+        print(f"  遅延読み込み: {measure(path, lazy=True):.3f}秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+テンプレートベースの結果ファイルへの書き込みのベンチマーク
+テストごとにシートへ書き込む方式（template_buffered_writes: false）と、
+結果を記録しておき保存時に行番号順にまとめて反映する方式（template_buffered_writes: true）の
+書き込み・保存の所要時間を比較する（両方式の出力内容が一致することも確認する）
+
+使い方:
+    python benchmarks/bench_template_writes.py [--rows 20000] [--results 100000]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook, load_workbook  # noqa: E402
+from testlib.excel_manager import ExcelManager, FIRST_DATA_ROW, HEADER_ROW  # noqa: E402
+
+SHEET_NAME = "テスト結果"
+STATUSES = ["passed", "passed", "passed", "failed", "skipped"]
+
+
+def create_template(path: str, rows: int):
+    """
+    ベンチマーク用テンプレートの生成
+    
+    Args:
+        path: 保存先のパス
+        rows: テストケースの行数
+    """
+    workbook = Workbook(write_only=True)
+    ws = workbook.create_sheet(SHEET_NAME)
+    ws.append(["ターゲットROMバージョン:", ""])
+    for _ in range(HEADER_ROW - 2):
+        ws.append([])
+    ws.append(["テスト番号", "テスト分類１", "テスト分類２", "テスト手順",
+               "期待値", "テスト実施日付", "テスト結果", "テスト結果補足"])
+    for i in range(rows):
+        ws.append([f"TC{i:06d}", f"分類 {i % 50}", f"分類 {i % 7}", f"手順 {i}", f"期待値 {i}"])
+    workbook.save(path)
+
+
+def measure(template: str, output: str, results: list, buffered: bool):
+    """
+    書き込みと保存の所要時間の計測
+    
+    Args:
+        template: テンプレートのパス
+        output: 出力ファイルのパス
+        results: (テスト番号, 結果, エラー情報) のリスト
+        buffered: 保存時にまとめて反映するか
+    
+    Returns:
+        (書き込みの所要時間（秒）, 保存の所要時間（秒）)
+    """
+    manager = ExcelManager(template_path=template, output_path=output, sheet_name=SHEET_NAME,
+                           rom_version="v0.0", tester_name="", buffered=buffered)
+    manager.prepare_output_file()
+    manager.open_workbook(lazy=True)
+    manager.write_test_info()
+    
+    start = time.perf_counter()
+    for test_id, status, error_info in results:
+        manager.write_test_result(test_id, status, error_info)
+    write_elapsed = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    manager.save()
+    save_elapsed = time.perf_counter() - start
+    manager.close()
+    return write_elapsed, save_elapsed
+
+
+def read_results(path: str) -> list:
+    """出力ファイルのF〜H列の値"""
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return list(workbook[SHEET_NAME].iter_rows(min_row=FIRST_DATA_ROW, min_col=6, max_col=8, values_only=True))
+    finally:
+        workbook.close()
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="テンプレートのテストケースの行数")
+    parser.add_argument("--results", type=int, default=100000, help="書き込むテスト結果の件数")
+    args = parser.parse_args()
+    
+    # ExcelManager のログ出力を抑制
+    logging.getLogger("pytest_logger").setLevel(logging.WARNING)
+    
+    # テストの実行順はテンプレートの行順と一致しない（並列実行・実行時間順の並べ替え等）
+    rng = random.Random(0)
+    results = []
+    for i in range(args.results):
+        status = STATUSES[i % len(STATUSES)]
+        results.append((f"TC{rng.randrange(args.rows):06d}", status,
+                        f"AssertionError: case {i}" if status == "failed" else ""))
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        template = os.path.join(work_dir, "template.xlsx")
+        create_template(template, args.rows)
+        
+        print(f"テンプレート: {args.rows}行, 結果: {args.results}件")
+        outputs = {}
+        for label, buffered in (("テストごとに書き込み", False), ("保存時にまとめて反映", True)):
+            output = os.path.join(work_dir, f"results_{buffered}.xlsx")
+            write_elapsed, save_elapsed = measure(template, output, results, buffered)
+            outputs[buffered] = output
+            print(f"  {label}: 書き込み {write_elapsed:.3f}秒, 保存 {save_elapsed:.3f}秒, "
+                  f"合計 {write_elapsed + save_elapsed:.3f}秒")
+        
+        same = read_results(outputs[False]) == read_results(outputs[True])
+        print(f"  出力内容の一致: {'OK' if same else 'NG'}")
+
+
+if __name__ == "__main__":
+    main()
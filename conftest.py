@@ -2,35 +2,152 @@
 pytest設定ファイル
 テスト実行時のフックを定義し、Excel出力とロギングを統合
 """
+import heapq
+import os
+import re
 import pytest
 import logging
-from datetime import datetime
-from logger_config import setup_logger
-from excel_reporter import ExcelReporter
-from testlib.config_manager import ConfigManager
-from testlib.excel_manager import ExcelManager
+from time import perf_counter_ns, time
+from logger_config import setup_logger, shutdown_logger
+from testlib.result_journal import ResultJournal, apply_result
+from testlib.scheduling import load_durations, parse_shard, schedule_items, select_by_recorded_results
+from testlib.overhead import OverheadCounters
+
+# openpyxl・pyarrow・yaml を使用するモジュール（excel_reporter、testlib の ConfigManager・
+# create_excel_manager・ResultExporter・ResultHistory）は読み込みに時間がかかるため、
+# pytest_configure でレポートを準備する場合にのみ読み込む（--collect-only / --help 等の起動を速くする）
 
 # グローバル変数
 excel_reporter = None
 excel_manager = None
 config_manager = None
+result_journal = None
+result_exporter = None
+result_history = None
 logger = None
 
+# Excelの1セルに格納できる最大文字数
+EXCEL_CELL_MAX_LENGTH = 32767
+
+# エラーメッセージ（トレースバック）の最大文字数（設定ファイルで変更可能）
+max_error_length = EXCEL_CELL_MAX_LENGTH
+
+# Excelのセル（XML 1.0）に書き込めない制御文字（openpyxl.cell.cell.ILLEGAL_CHARACTERS_RE と同じ。
+# 起動時に openpyxl を読み込まないよう、ここで定義する）
+ILLEGAL_CHARACTERS_RE = re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
+
+# pytest-xdist の各ワーカーで収集されたテスト番号（コントローラーで集約）
+collected_test_ids = set()
+
+# 過去の実行時間（--duration-order / --shard 指定時、コントローラーで読み込みワーカーに渡す）
+scheduling_durations = None
+
+# 結果ファイルに記録済みのテスト結果（--skip-ok 指定時、コントローラーで読み込みワーカーに渡す）。
+# テンプレートの全テスト番号 -> OK/NG/SKIP（未記入の場合はNone）
+recorded_results = None
+
+# レポート処理のオーバーヘッド計測（reporter_overhead: true の場合のみ作成）
+overhead = None
+
+# テスト本体のプロファイリング（--profile-tests / --profile-slowest 指定時のみ作成）
+test_profiler = None
+
+# セッション開始時刻（perf_counter_ns、オーバーヘッドの割合の算出用）
+session_start_ns = 0
+
+# テスト本体（call フェーズ）の実行時間の合計（秒）
+test_call_seconds = 0.0
+
+# テストを実行しないオプション（指定時はExcel・ログファイルを作成しない）
+NON_EXECUTING_OPTIONS = ("collectonly", "help", "showfixtures", "show_fixtures_per_test", "markers")
+
+# オーバーヘッド計測の対象とするフック（入れ子にならないため、合計をフック全体のオーバーヘッドとする）
+OVERHEAD_HOOKS = ("pytest_runtest_setup", "pytest_runtest_makereport", "pytest_runtest_logreport")
+
+
+def is_xdist_worker(config) -> bool:
+    """
+    pytest-xdist のワーカープロセスかどうか
+    
+    Args:
+        config: pytest の設定オブジェクト
+    
+    Returns:
+        ワーカープロセスの場合True
+    """
+    return hasattr(config, "workerinput")
+
+
+def runs_tests(config) -> bool:
+    """
+    テストを実行する起動かどうか
+    
+    Args:
+        config: pytest の設定オブジェクト
+    
+    Returns:
+        --collect-only / --help / --fixtures 等のテストを実行しないオプションが指定されていない場合True
+    """
+    return not any(config.getoption(name, default=False) for name in NON_EXECUTING_OPTIONS)
+
+
+def truncate_text(text: str, max_length: int) -> str:
+    """
+    長いテキストの切り詰め
+    
+    先頭と末尾（トレースバックの場合はエラー発生箇所）を残し、中間を省略する。
+    
+    Args:
+        text: テキスト
+        max_length: 最大文字数
+    
+    Returns:
+        切り詰めたテキスト
+    """
+    if len(text) <= max_length:
+        return text
+    
+    marker = f"\n... ({len(text) - max_length}文字省略) ...\n"
+    keep = max(0, max_length - len(marker))
+    head = keep // 2
+    return text[:head] + marker + text[len(text) - (keep - head):]
+
 
-def extract_error_info(longrepr) -> str:
+def clean_text(text: str) -> str:
+    """
+    Excelのセルに書き込めない制御文字（ANSIエスケープシーケンスの ESC 等）の除去
+    
+    Args:
+        text: テキスト
+    
+    Returns:
+        制御文字を除去したテキスト
+    """
+    return ILLEGAL_CHARACTERS_RE.sub("", text)
+
+
+def extract_error_info(longrepr, longrepr_str: str = None) -> str:
     """
     テスト失敗時のエラー情報を抽出
     
     Args:
         longrepr: pytest のエラー詳細情報
-        
+        longrepr_str: 文字列化済みのエラー詳細情報（省略時は longrepr を文字列化する）
+    
     Returns:
         エラー情報の文字列
     """
     if not longrepr:
         return ""
     
-    longrepr_str = str(longrepr)
+    # 例外情報（reprcrash）がある場合は、トレースバック全体を走査せずに使用する
+    reprcrash = getattr(longrepr, "reprcrash", None)
+    message = getattr(reprcrash, "message", None)
+    if message and message.strip():
+        return message.strip().split('\n', 1)[0].strip()
+    
+    if longrepr_str is None:
+        longrepr_str = str(longrepr)
     lines = longrepr_str.split('\n')
     
     # アサーションエラーの詳細を抽出
@@ -46,150 +163,668 @@ def extract_error_info(longrepr) -> str:
     return ""
 
 
+def resolve_test_metadata(item):
+    """
+    テスト番号とカテゴリの取得（収集時に1回だけ行い、結果をテスト項目に保持する）
+    
+    マーカーは iter_markers で関数・クラス・モジュールの順に探し、テスト関数に最も近いものを使用する。
+    カテゴリが設定されていない場合、ファイル名から推測する。
+    
+    Args:
+        item: テスト項目
+    
+    Returns:
+        (テスト番号（未設定の場合はNone）, カテゴリ)
+    """
+    marker = next(item.iter_markers("test_id"), None)
+    test_id = marker.args[0] if marker and marker.args else None
+    
+    marker = next(item.iter_markers("category"), None)
+    category = marker.args[0] if marker and marker.args else "General"
+    
+    # カテゴリが設定されていない場合、ファイル名から推測
+    if category == "General" and "::" in item.nodeid:
+        file_part = item.nodeid.split("::")[0]
+        if "test_" in file_part:
+            category = file_part.split("test_")[-1].replace(".py", "").replace("_", " ").title()
+    
+    item.excel_test_id = test_id
+    item.excel_category = category
+    return test_id, category
+
+
+def pytest_addoption(parser):
+    """コマンドラインオプションの追加"""
+    group = parser.getgroup("excel-report", "テスト結果のExcel出力")
+    group.addoption("--duration-order", action="store_true", default=False,
+                    help="過去の実行時間の長いモジュールから順に実行する（モジュール内は収集順）")
+    group.addoption("--shard", default=None, metavar="i/N",
+                    help="過去の実行時間が均等になるようにテストをモジュール単位でN個に分割し、i番目（1始まり）のみ実行する")
+    group.addoption("--skip-ok", action="store_true", default=False,
+                    help="結果ファイルで現在のROMバージョンの結果がOKのテストを実行しない（NG・SKIP・未記入のテストを実行する）")
+    group.addoption("--profile-tests", action="store_true", default=False,
+                    help="テスト本体を cProfile で計測し、output/ と詳細レポートの Profile シートに出力する")
+    group.addoption("--profile-slowest", type=int, default=0, metavar="N",
+                    help="過去の実行時間の長いN件のテストのみ cProfile で計測する（--profile-tests の対象を絞る）")
+
+
+def load_scheduling_durations(manager_config) -> dict:
+    """
+    過去の実行時間の読み込み（--duration-order / --shard 指定時）
+    
+    Args:
+        manager_config: ConfigManager（設定ファイルを読み込めなかった場合はNone）
+    
+    Returns:
+        テスト名 -> 過去の実行時間（読み込めなかった場合は空）
+    """
+    try:
+        return load_durations(
+            manager_config.history_path if manager_config else os.path.join("output", "test_history.db"),
+            window=manager_config.history_window if manager_config else 10
+        )
+    except Exception as e:
+        logger.error("過去の実行時間を読み込めませんでした: %s", e)
+        return {}
+
+
+def load_recorded_results(manager, rom_version: str) -> dict:
+    """
+    記録済みのテスト結果の読み込み（--skip-ok 指定時）
+    
+    Args:
+        manager: ワークブックを開いた ExcelManager / ExcelManagerGroup
+        rom_version: 現在のROMバージョン
+    
+    Returns:
+        テンプレートの全テスト番号 -> テスト結果 (OK/NG/SKIP、未記入の場合はNone)
+        （ROMバージョンが異なる場合は全て未実施とみなし、全てNone）
+    """
+    recorded_version, results = manager.read_recorded_results()
+    if recorded_version != rom_version:
+        logger.info("結果ファイルのROMバージョン（%s）が異なるため、全てのテストを未実施とみなします", recorded_version)
+        results = {}
+    logger.info("記録済みのテスト結果を読み込みました: %d件", len(results))
+    return {test_id: results.get(test_id) for test_id in manager.test_ids()}
+
+
+def create_profiler(config, stats_dir: str):
+    """
+    テスト本体のプロファイラの作成（--profile-tests / --profile-slowest 指定時）
+    
+    --profile-slowest 指定時は、過去の実行時間の長いテストのみを計測対象とする
+    （過去の実行時間がない場合は全てのテストを計測する）。
+    
+    Args:
+        config: pytest の設定オブジェクト
+        stats_dir: テストごとの計測結果の保存先
+    
+    Returns:
+        CallProfiler（指定がない場合はNone）
+    """
+    profile_slowest = config.getoption("profile_slowest")
+    if not (config.getoption("profile_tests") or profile_slowest > 0):
+        return None
+    
+    from testlib.profiler import CallProfiler
+    targets = None
+    if profile_slowest > 0:
+        durations = scheduling_durations if scheduling_durations is not None else load_scheduling_durations(config_manager)
+        if durations:
+            targets = heapq.nlargest(profile_slowest, durations, key=durations.get)
+            logger.info("過去の実行時間の長い%d件のテストをプロファイリングします", len(targets))
+        else:
+            logger.warning("過去の実行時間がないため、全てのテストをプロファイリングします")
+    return CallProfiler(top_n=config_manager.profile_top_n if config_manager else 20, targets=targets,
+                        max_tests=config_manager.profile_max_tests if config_manager else 50,
+                        stats_dir=stats_dir)
+
+
+def configure_without_reporting(config, shard: str):
+    """
+    テストを実行しない起動（--collect-only 等）の設定
+    
+    ログファイル・結果ファイルの作成やテンプレートのコピーは行わず、
+    --shard / --duration-order / --skip-ok によるテストの選択に必要な情報のみ読み込む
+    （出力ファイルは読み取り専用で開き、まだ無い場合は実行時と同様にテンプレートの内容を使用する）。
+    
+    Args:
+        config: pytest の設定オブジェクト
+        shard: --shard の値
+    """
+    global config_manager, logger, scheduling_durations, recorded_results
+    
+    logger = logging.getLogger("pytest_logger")
+    logger.addHandler(logging.NullHandler())
+    
+    select_by_results = config.getoption("skip_ok")
+    if not (config.getoption("duration_order") or shard or select_by_results):
+        return
+    
+    from testlib.config_manager import ConfigManager
+    try:
+        config_manager = ConfigManager()
+    except Exception as e:
+        logger.error("設定ファイルを読み込めませんでした: %s", e)
+    
+    if config.getoption("duration_order") or shard:
+        scheduling_durations = load_scheduling_durations(config_manager)
+    
+    if select_by_results and config_manager:
+        from testlib.excel_manager_group import create_excel_manager
+        try:
+            targets = [dict(target, output_path=target["output_path"]
+                            if os.path.exists(target["output_path"]) else target["template_path"])
+                       for target in config_manager.template_targets]
+            manager = create_excel_manager(targets, rom_version=config_manager.rom_version,
+                                           tester_name=config_manager.tester_name)
+            manager.open_workbook(lazy=True)
+            try:
+                recorded_results = load_recorded_results(manager, config_manager.rom_version)
+            finally:
+                manager.close()
+        except Exception as e:
+            logger.error("記録済みのテスト結果を読み込めませんでした: %s", e)
+
+
 def pytest_configure(config):
     """pytest開始時の設定"""
-    global excel_reporter, excel_manager, config_manager, logger
+    global excel_reporter, excel_manager, config_manager, result_journal, result_exporter, result_history
+    global max_error_length, logger, scheduling_durations, recorded_results, overhead, session_start_ns
+    global test_profiler
+    
+    session_start_ns = perf_counter_ns()
+    
+    # 分割指定の確認（誤りがある場合はテスト実行前にエラーとする）
+    shard = config.getoption("shard")
+    if shard:
+        try:
+            parse_shard(shard)
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+    
+    # pytest-xdist のワーカーではExcel・ログファイルを作成しない
+    # （結果はレポート経由でコントローラーに送られ、コントローラーが1回だけ保存する）
+    if is_xdist_worker(config):
+        logger = logging.getLogger("pytest_logger")
+        logger.addHandler(logging.NullHandler())
+        # 全ワーカーで同じ並び順になるよう、コントローラーで読み込んだ実行時間を使用する
+        scheduling_durations = config.workerinput.get("excel_durations")
+        recorded_results = config.workerinput.get("excel_recorded_results")
+        if config.workerinput.get("excel_overhead"):
+            overhead = OverheadCounters()
+        profile_settings = config.workerinput.get("excel_profile")
+        if profile_settings:
+            from testlib.profiler import CallProfiler
+            test_profiler = CallProfiler(**profile_settings)
+        return
+    
+    # --collect-only / --help 等のテストを実行しない起動では、レポートの準備を行わない
+    if not runs_tests(config):
+        configure_without_reporting(config, shard)
+        return
+    
+    from excel_reporter import ExcelReporter
+    from testlib.config_manager import ConfigManager
+    from testlib.excel_manager_group import create_excel_manager
+    from testlib.result_exporter import ResultExporter
+    from testlib.result_history import ResultHistory
+    
+    # 設定ファイルの読み込み（ログ設定を参照するため、ロガーより先に読み込む）
+    config_error = None
+    try:
+        config_manager = ConfigManager()
+    except Exception as e:
+        config_error = e
     
     # ロガーのセットアップ
-    logger = setup_logger()
+    logger = setup_logger(
+        queued=config_manager.log_queue if config_manager else False,
+        flush_interval=config_manager.log_flush_interval if config_manager else 100
+    )
     logger.info("=" * 80)
     logger.info("pytestテスト実行を開始します")
     logger.info("=" * 80)
     
-    # 設定ファイルの読み込み
     try:
-        config_manager = ConfigManager()
-        logger.info(f"設定ファイルを読み込みました: {config_manager.config_path}")
-        logger.info(f"  テンプレートファイル: {config_manager.template_file}")
-        logger.info(f"  出力ファイル: {config_manager.output_file}")
-        logger.info(f"  出力シート: {config_manager.output_sheet}")
-        logger.info(f"  ROMバージョン: {config_manager.rom_version}")
-        logger.info(f"  テスト実施者: {config_manager.tester_name}")
+        if config_error:
+            raise config_error
+        logger.info("設定ファイルを読み込みました: %s", config_manager.config_path)
+        for target in config_manager.template_targets:
+            logger.info("  テンプレートファイル: %s", target['template_path'])
+            logger.info("    出力ファイル: %s", target['output_path'])
+            logger.info("    出力シート: %s", ', '.join(target['sheet_names']))
+        logger.info("  ROMバージョン: %s", config_manager.rom_version)
+        logger.info("  テスト実施者: %s", config_manager.tester_name)
+        
+        # エラーメッセージの最大文字数（Excelのセル上限を超えないようにする）
+        max_error_length = min(config_manager.max_error_length, EXCEL_CELL_MAX_LENGTH)
         
         # テンプレートベースのExcelマネージャーの初期化
-        excel_manager = ExcelManager(
-            template_path=config_manager.template_path,
-            output_path=config_manager.output_path,
-            sheet_name=config_manager.output_sheet,
+        # （テンプレートが複数の場合は、全テンプレートのテスト番号から記録先を振り分ける）
+        excel_manager = create_excel_manager(
+            config_manager.template_targets,
             rom_version=config_manager.rom_version,
-            tester_name=config_manager.tester_name
+            tester_name=config_manager.tester_name,
+            patch_mode=config_manager.template_patch_mode,
+            buffered=config_manager.template_buffered_writes
         )
         
         # 出力ファイルの準備（テンプレートのコピー）
         excel_manager.prepare_output_file()
         
-        # ワークブックを開く
-        excel_manager.open_workbook()
+        # ワークブックを開く（遅延読み込みの場合はテスト番号インデックスのみ構築）
+        excel_manager.open_workbook(lazy=config_manager.lazy_template_load)
+        
+        # 記録済みのテスト結果の読み込み（ROMバージョンが異なる場合は全て未実施とみなす）
+        if config.getoption("skip_ok"):
+            recorded_results = load_recorded_results(excel_manager, config_manager.rom_version)
         
         # テスト諸情報の書き込み
         excel_manager.write_test_info()
         
+        # 結果の書き込みをバックグラウンドスレッドで行う
+        if config_manager.background_writer:
+            excel_manager.start_background_writer(
+                queue_size=config_manager.writer_queue_size,
+                overflow=config_manager.writer_overflow,
+                on_error=config_manager.writer_on_error
+            )
+    
     except Exception as e:
-        logger.error(f"テンプレートベースの初期化に失敗しました: {e}")
+        logger.error("テンプレートベースの初期化に失敗しました: %s", e)
         logger.info("フォールバック: 従来の方式でExcelレポーターを初期化します")
         excel_manager = None
     
+    # 過去の実行時間の読み込み（今回の実行の結果ジャーナル・履歴を作成する前に行う）
+    if config.getoption("duration_order") or shard:
+        scheduling_durations = load_scheduling_durations(config_manager)
+    
     # 従来のExcelレポーターも初期化（両方のレポートを生成）
-    excel_reporter = ExcelReporter()
+    streaming = config_manager.report_streaming if config_manager else False
+    excel_reporter = ExcelReporter(streaming=streaming)
     excel_reporter.initialize_workbook()
+    
+    # テスト本体のプロファイリング（計測対象の選択に過去の実行時間を使用するため、読み込み後に作成する）
+    test_profiler = create_profiler(
+        config, os.path.join(excel_reporter.output_dir, f"test_profile_{excel_reporter.timestamp}"))
+    
+    # 結果ジャーナルの作成（異常終了時にレポートを再生成できるよう、結果を1件ずつ記録）
+    if config_manager is None or config_manager.result_journal:
+        journal_path = os.path.join(excel_reporter.output_dir,
+                                    f"test_results_{excel_reporter.timestamp}.jsonl")
+        fsync_interval = config_manager.journal_fsync_interval if config_manager else 100
+        result_journal = ResultJournal(journal_path, fsync_interval=fsync_interval)
+    
+    # 結果のエクスポート（ダッシュボード等で読み込むための列指向ファイル）
+    if config_manager and config_manager.result_export != "none":
+        try:
+            result_exporter = ResultExporter(
+                os.path.join(excel_reporter.output_dir, f"test_export_{excel_reporter.timestamp}"),
+                fmt=config_manager.result_export,
+                batch_size=config_manager.export_batch_size
+            )
+        except Exception as e:
+            logger.error("結果のエクスポートを初期化できませんでした: %s", e)
+    
+    # テスト結果履歴（実行時間の推移・悪化の検出用）
+    if config_manager and config_manager.result_history:
+        try:
+            result_history = ResultHistory(config_manager.history_path)
+            result_history.start_run(excel_reporter.timestamp, config_manager.rom_version)
+        except Exception as e:
+            logger.error("テスト結果履歴を初期化できませんでした: %s", e)
+            result_history = None
+    
+    # レポート処理のオーバーヘッド計測（各フックと、その中で呼び出すレポート処理の所要時間）
+    if config_manager is not None and config_manager.reporter_overhead:
+        overhead = OverheadCounters()
+        for obj, method_name in ((excel_reporter, "add_test_result"), (excel_manager, "write_test_result"),
+                                 (result_journal, "append"), (result_exporter, "add"),
+                                 (result_history, "add")):
+            if obj is not None:
+                overhead.instrument(obj, method_name)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """pytest-xdist のワーカー起動時の処理（コントローラーで実行）"""
+    if scheduling_durations is not None:
+        node.workerinput["excel_durations"] = scheduling_durations
+    if recorded_results is not None:
+        node.workerinput["excel_recorded_results"] = recorded_results
+    node.workerinput["excel_overhead"] = overhead is not None
+    if test_profiler:
+        targets = test_profiler.targets
+        node.workerinput["excel_profile"] = {"top_n": test_profiler.top_n,
+                                             "targets": sorted(targets) if targets is not None else None,
+                                             "max_tests": test_profiler.max_tests,
+                                             "stats_dir": test_profiler.stats_dir}
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    """テスト収集後の処理（-k / -m による選択の後に実行）"""
+    for item in items:
+        resolve_test_metadata(item)
+    
+    # 結果ファイルに記録済みのテスト結果による選択
+    if config.getoption("skip_ok"):
+        if recorded_results is None:
+            logger.warning("結果ファイルを読み込めなかったため、--skip-ok を無視します")
+        else:
+            items[:], deselected, unknown_ids = select_by_recorded_results(items, recorded_results)
+            if unknown_ids:
+                logger.warning("テンプレートに存在しないテスト番号のテストは実行しません: %s", ", ".join(unknown_ids))
+            if deselected:
+                config.hook.pytest_deselected(items=deselected)
+    
+    # 過去の実行時間をもとに並べ替え・分割
+    if scheduling_durations is not None:
+        shard = config.getoption("shard")
+        deselected = schedule_items(items, scheduling_durations, parse_shard(shard) if shard else None)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+    
+    test_ids = {item.excel_test_id for item in items if item.excel_test_id}
+    
+    # pytest-xdist のワーカーでは、セッション終了時にコントローラーへ送る
+    if is_xdist_worker(config):
+        collected_test_ids.update(test_ids)
+        return
+    
+    # テンプレートに存在しないテスト番号を事前に報告
+    if excel_manager:
+        excel_manager.check_test_ids(test_ids)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """pytest-xdist のワーカー終了時の処理（コントローラーで実行）"""
+    workeroutput = getattr(node, "workeroutput", None) or {}
+    collected_test_ids.update(workeroutput.get("excel_test_ids", []))
+    if overhead and workeroutput.get("excel_overhead"):
+        overhead.merge(workeroutput["excel_overhead"])
+    if test_profiler and workeroutput.get("excel_profile"):
+        test_profiler.merge(workeroutput["excel_profile"])
 
 
 def pytest_runtest_setup(item):
     """各テスト実行前の処理"""
-    logger.info(f"テスト開始: {item.nodeid}")
+    start = perf_counter_ns()
+    logger.info("テスト開始: %s", item.nodeid)
+    if overhead:
+        overhead.add("pytest_runtest_setup", perf_counter_ns() - start)
 
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """テスト実行レポートの作成"""
     outcome = yield
+    start = perf_counter_ns()
     rep = outcome.get_result()
     
     if rep.when == "call":
-        # テスト名の取得
-        test_name = item.nodeid
-        
-        # テスト番号の取得（test_idマーカーから）
-        test_id = None
-        if hasattr(item, "own_markers"):
-            for marker in item.own_markers:
-                if marker.name == "test_id":
-                    test_id = marker.args[0] if marker.args else None
-                    break
+        # 収集時に取得済みのテスト番号・カテゴリを使用
+        if not hasattr(item, "excel_category"):
+            resolve_test_metadata(item)
         
-        # カテゴリの取得
-        category = "General"
-        if hasattr(item, "own_markers"):
-            for marker in item.own_markers:
-                if marker.name == "category":
-                    category = marker.args[0] if marker.args else "General"
-                    break
-        
-        # カテゴリが設定されていない場合、ファイル名から推測
-        if category == "General" and "::" in test_name:
-            file_part = test_name.split("::")[0]
-            if "test_" in file_part:
-                category = file_part.split("test_")[-1].replace(".py", "").replace("_", " ").title()
-        
-        # 結果の取得
-        status = rep.outcome  # passed, failed, skipped
-        duration = rep.duration
-        error_message = ""
-        
-        if status == "failed" and rep.longrepr:
-            error_message = str(rep.longrepr)
-        elif status == "skipped" and rep.longrepr:
-            error_message = str(rep.longrepr)
-        
-        # テンプレートベースのExcelに結果を記録
-        if excel_manager and test_id:
-            try:
-                # エラー情報の抽出
-                error_info = ""
-                if status == "failed" and rep.longrepr:
-                    error_info = extract_error_info(rep.longrepr)
-                
-                excel_manager.write_test_result(test_id, status, error_info)
-            except Exception as e:
-                logger.error(f"テンプレートベースのExcel記録に失敗しました: {e}")
-        
-        # 従来のレポートにも追加
-        excel_reporter.add_test_result(
-            test_name=test_name,
-            status=status,
-            duration=duration,
-            error_message=error_message,
-            category=category
-        )
-        
-        # ログ出力
-        if status == "passed":
-            logger.info(f"✓ テスト成功: {test_name} ({duration:.3f}秒)")
-        elif status == "failed":
-            logger.error(f"✗ テスト失敗: {test_name} ({duration:.3f}秒)")
-            logger.error(f"  エラー: {error_message}")
-        elif status == "skipped":
-            logger.warning(f"⊘ テストスキップ: {test_name}")
+        # レポートの属性として保持する
+        # （pytest-xdist ではレポートと一緒にシリアライズされ、コントローラーに送られる）
+        rep.excel_test_id = item.excel_test_id
+        rep.excel_category = item.excel_category
+    
+    if overhead:
+        overhead.add("pytest_runtest_makereport", perf_counter_ns() - start)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """テスト関数の呼び出し（--profile-tests 指定時は cProfile で計測）"""
+    if test_profiler is None or not test_profiler.is_target(pyfuncitem.nodeid):
+        yield
+        return
+    profiler = test_profiler.start(pyfuncitem.nodeid)
+    yield
+    test_profiler.stop(pyfuncitem.nodeid, profiler)
+
+
+def pytest_runtest_logreport(report):
+    """テスト結果の記録（pytest-xdist 使用時はコントローラーで実行）"""
+    global test_call_seconds
+    if report.when != "call" or excel_reporter is None:
+        return
+    start = perf_counter_ns()
+    
+    test_name = report.nodeid
+    test_id = getattr(report, "excel_test_id", None)
+    category = getattr(report, "excel_category", "General")
+    
+    # 結果の取得
+    status = report.outcome  # passed, failed, skipped
+    duration = report.duration
+    test_call_seconds += duration
+    error_message = ""
+    error_info = ""
+    
+    # エラー詳細の文字列化は1回だけ行い、メモリやExcelに保持する前に制御文字を除去して切り詰める
+    if status in ("failed", "skipped") and report.longrepr:
+        error_message = truncate_text(clean_text(str(report.longrepr)), max_error_length)
+        if status == "failed":
+            # テンプレートに記録するエラー情報の抽出（例外メッセージの1行目は切り詰められていないため、同様に処理する）
+            error_info = truncate_text(clean_text(extract_error_info(report.longrepr, error_message)),
+                                       max_error_length)
+    
+    record = {
+        "test_name": test_name,
+        "test_id": test_id,
+        "status": status,
+        "duration": duration,
+        "error_message": error_message,
+        "error_info": error_info,
+        "category": category,
+        # 実行日時はエポック秒で保持し、ジャーナル・レポートへの書き込み時に文字列に変換する
+        "timestamp": time(),
+    }
+    
+    # ジャーナルに記録してから、テンプレートベースのExcelと従来のレポートに反映
+    if result_journal:
+        try:
+            result_journal.append(record)
+        except Exception as e:
+            logger.error("結果ジャーナルへの記録に失敗しました: %s", e)
+    apply_result(record, excel_reporter, excel_manager, result_exporter, result_history)
+    
+    # ログ出力
+    log_start = perf_counter_ns()
+    if status == "passed":
+        logger.info("✓ テスト成功: %s (%.3f秒)", test_name, duration)
+    elif status == "failed":
+        logger.error("✗ テスト失敗: %s (%.3f秒)", test_name, duration)
+        logger.error("  エラー: %s", error_message)
+    elif status == "skipped":
+        logger.warning("⊘ テストスキップ: %s", test_name)
+    
+    if overhead:
+        end = perf_counter_ns()
+        overhead.add("logging", end - log_start)
+        overhead.add("pytest_runtest_logreport", end - start)
+
+
+def report_overhead(reporter):
+    """
+    レポート処理のオーバーヘッドをログに出力し、詳細レポートに設定
+    
+    フックの所要時間の合計を、セッションの実行時間・テスト本体の実行時間の合計と比較する。
+    pytest-xdist 使用時はワーカーでのフックの所要時間も合算する
+    （ワーカーは並列に動作するため、セッションの実行時間に対する割合は実際より大きくなる）。
+    
+    Args:
+        reporter: 詳細レポート（Noneの場合はログ出力のみ）
+    """
+    session_seconds = (perf_counter_ns() - session_start_ns) / 1e9
+    hook_seconds = overhead.total_seconds(OVERHEAD_HOOKS)
+    session_ratio = hook_seconds / session_seconds * 100 if session_seconds else 0.0
+    test_ratio = hook_seconds / test_call_seconds * 100 if test_call_seconds else 0.0
+    rows = overhead.rows(order=OVERHEAD_HOOKS)
+    
+    logger.info("レポート処理のオーバーヘッド: %.3f秒 (セッションの実行時間 %.3f秒の %.2f%%, テスト本体の実行時間 %.3f秒の %.2f%%)",
+                hook_seconds, session_seconds, session_ratio, test_call_seconds, test_ratio)
+    for name, count, total_ms, avg_us, max_us in rows:
+        logger.info("  %s: %d回, 合計 %.1fms, 平均 %.1fµs, 最大 %.1fµs", name, count, total_ms, avg_us, max_us)
+    
+    if reporter:
+        reporter.set_overhead(rows, [
+            ("セッションの実行時間(秒)", round(session_seconds, 3)),
+            ("テスト本体の実行時間の合計(秒)", round(test_call_seconds, 3)),
+            ("フックの所要時間の合計(秒)", round(hook_seconds, 3)),
+            ("セッションの実行時間に対する割合(%)", round(session_ratio, 2)),
+            ("テスト本体の実行時間に対する割合(%)", round(test_ratio, 2)),
+        ])
+
+
+def report_profile(reporter):
+    """
+    テスト本体のプロファイルを output/ に保存し、ログと詳細レポートに出力
+    
+    Args:
+        reporter: 詳細レポート
+    """
+    from testlib.profiler import ALL_TESTS_LABEL
+    if not test_profiler.profiled_count:
+        logger.warning("プロファイリングの対象のテストが実行されませんでした")
+        return
+    
+    path = os.path.join(reporter.output_dir, f"test_profile_{reporter.timestamp}.prof")
+    try:
+        test_profiler.save(path)
+        logger.info("テスト本体のプロファイルを保存しました: %s（%d件）", path, test_profiler.profiled_count)
+        logger.info("テストごとのプロファイルを保存しました: %s", test_profiler.stats_dir)
+    except Exception as e:
+        logger.error("テスト本体のプロファイルの保存に失敗しました: %s", e)
+    
+    rows = test_profiler.rows()
+    logger.info("テスト本体の累積時間の上位の関数（全テスト）:")
+    for test_name, rank, function, ncalls, tottime, cumtime in rows[:10]:
+        if test_name != ALL_TESTS_LABEL:
+            break
+        logger.info("  %d. %s: %d回, 自身 %.3f秒, 累積 %.3f秒", rank, function, ncalls, tottime, cumtime)
+    reporter.set_profile(rows)
 
 
 def pytest_sessionfinish(session, exitstatus):
     """テストセッション終了時の処理"""
-    global excel_reporter, excel_manager, logger
+    global excel_reporter, excel_manager, result_journal, result_exporter, result_history, logger
+    
+    # pytest-xdist のワーカーは収集したテスト番号をコントローラーに渡すのみ
+    if is_xdist_worker(session.config):
+        session.config.workeroutput["excel_test_ids"] = sorted(collected_test_ids)
+        if overhead:
+            session.config.workeroutput["excel_overhead"] = overhead.snapshot()
+        if test_profiler:
+            session.config.workeroutput["excel_profile"] = test_profiler.snapshot()
+        return
     
+    # テストを実行しない起動（--collect-only 等）ではレポートを準備していない
+    if excel_reporter is None:
+        return
+    
+    finish_start = perf_counter_ns()
     logger.info("=" * 80)
     logger.info("pytestテスト実行が完了しました")
     logger.info("=" * 80)
     
+    # pytest-xdist 使用時、ワーカーで収集されたテスト番号をここで確認する
+    if excel_manager and collected_test_ids:
+        excel_manager.check_test_ids(collected_test_ids)
+    
+    # ジャーナルを閉じる（Excel保存に失敗しても結果はジャーナルに残る）
+    if result_journal:
+        result_journal.close()
+        logger.info("結果ジャーナル: %s", result_journal.path)
+    
+    # エクスポートの残りの結果を書き出す
+    if result_exporter:
+        try:
+            result_exporter.close()
+        except Exception as e:
+            logger.error("結果のエクスポートに失敗しました: %s", e)
+    
+    # テスト結果履歴から実行時間の上位・悪化テストを求め、サマリーシートに表示する
+    if result_history:
+        try:
+            top_n = config_manager.history_top_n
+            regressions = result_history.find_regressions(
+                threshold=config_manager.regression_threshold,
+                window=config_manager.history_window
+            )
+            for test_name, duration, baseline, ratio in regressions:
+                logger.warning("実行時間が悪化しました: %s (%.3f秒, 過去の中央値 %.3f秒, x%.2f)",
+                               test_name, duration, baseline, ratio)
+            excel_reporter.set_duration_history(result_history.slowest(top_n), regressions[:top_n])
+        except Exception as e:
+            logger.error("テスト結果履歴の集計に失敗しました: %s", e)
+        finally:
+            result_history.close()
+    
+    # テスト本体のプロファイルの保存（ログとレポートのシートに出力）
+    if test_profiler:
+        report_profile(excel_reporter)
+    
+    # レポート処理のオーバーヘッドの集計（ログとレポートのシートに出力）
+    if overhead:
+        report_overhead(excel_reporter)
+    
+    # バックグラウンド書き込みの完了を待つ（writer_on_error: raise の場合はエラーで失敗扱い）
+    # 保存用の子プロセスを作成する前に、書き込みスレッドを終了させておく
+    if excel_manager:
+        try:
+            excel_manager.join_background_writer()
+        except Exception as e:
+            logger.error("テンプレートベースのExcel記録に失敗しました: %s", e)
+            if session.exitstatus == pytest.ExitCode.OK:
+                session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    
+    # 詳細レポートの保存を別プロセスに依頼し、テンプレートベースのExcelの保存と並列に行う
+    report_pool = None
+    report_futures = []
+    if excel_reporter and config_manager and config_manager.parallel_report:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        split_categories = config_manager.report_split_categories
+        # ログのキュー・バックグラウンド書き込みのスレッドが動作中のため、fork ではなく spawn で子プロセスを起動する
+        # （fork ではロックを保持した状態のスレッドの状態が子プロセスに複製され、停止するおそれがある）
+        report_pool = ProcessPoolExecutor(max_workers=None if split_categories else 1,
+                                          mp_context=multiprocessing.get_context("spawn"))
+        report_futures = excel_reporter.submit_save(report_pool, split_categories=split_categories)
+    
     # テンプレートベースのExcelを保存
     if excel_manager:
         try:
             excel_manager.save()
+            logger.info("テンプレートベースの結果ファイルを保存しました: %s", excel_manager.output_path)
+        except Exception as e:
+            logger.error("テンプレートベースのExcel保存に失敗しました: %s", e)
+        # 保存に失敗した場合もワークブックを閉じる
+        try:
             excel_manager.close()
-            logger.info(f"テンプレートベースの結果ファイルを保存しました: {excel_manager.output_path}")
         except Exception as e:
-            logger.error(f"テンプレートベースのExcel保存に失敗しました: {e}")
+            logger.error("テンプレートベースのExcelを閉じられませんでした: %s", e)
     
     # 従来のExcelファイルの保存
-    if excel_reporter:
+    if report_pool:
+        for future in report_futures:
+            try:
+                logger.info("詳細レポートをExcelファイルに出力しました: %s", future.result())
+            except Exception as e:
+                logger.error("詳細レポートの保存に失敗しました: %s", e)
+        report_pool.shutdown()
+    elif excel_reporter:
         excel_file = excel_reporter.save()
-        logger.info(f"詳細レポートをExcelファイルに出力しました: {excel_file}")
+        logger.info("詳細レポートをExcelファイルに出力しました: %s", excel_file)
+    
+    if overhead:
+        logger.info("セッション終了処理（集計・保存）: %.3f秒", (perf_counter_ns() - finish_start) / 1e9)
+    
+    # キュー経由のロギングの場合、残りのログを出力してリスナーを停止
+    shutdown_logger()
@@ -3,43 +3,218 @@ Excelレポート生成モジュール
 pytestの実行結果をExcelファイルに出力
 """
 import os
+from concurrent.futures import Executor, Future
+from copy import copy
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
 from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
 import logging
+from testlib.excel_styles import (
+    NAMED_STYLE_PREFIX, StyleRegistry, register_named_styles, status_style
+)
+from testlib.result_store import ResultStore, TIMESTAMP_FORMAT, format_timestamp
 
 logger = logging.getLogger("pytest_logger")
 
+# 詳細シートのヘッダーとカラム幅
+DETAIL_HEADERS = ["No.", "テスト名", "カテゴリ", "結果", "実行時間(秒)", "実行日時", "エラーメッセージ"]
+DETAIL_COLUMN_WIDTHS = {"A": 6, "B": 40, "C": 15, "D": 12, "E": 15, "F": 20, "G": 50}
+
+# サマリーシートのカラム幅
+SUMMARY_COLUMN_WIDTHS = {"A": 15, "B": 12, "C": 12, "D": 30}
+
+# サマリーシートの実行時間の表（テスト結果履歴を使用する場合のみ作成）
+DURATION_TABLE_TITLE = "実行時間の上位・悪化テスト"
+DURATION_TABLE_HEADERS = ["区分", "実行時間(秒)", "過去の中央値(秒)", "倍率", "テスト名"]
+DURATION_TABLE_NAME_WIDTH = 60
+
+# 全件シートの名前
+ALL_TESTS_SHEET = "All Tests"
+
+# レポート処理のオーバーヘッドのシート（オーバーヘッドを計測した場合のみ作成）
+OVERHEAD_SHEET = "Reporter Overhead"
+OVERHEAD_TITLE = "レポート処理のオーバーヘッド"
+OVERHEAD_HEADERS = ["処理", "呼び出し回数", "合計(ms)", "平均(µs)", "最大(µs)"]
+OVERHEAD_COLUMN_WIDTHS = {"A": 40, "B": 14, "C": 12, "D": 12, "E": 12}
+
+# テスト本体のプロファイルのシート（--profile-tests 指定時のみ作成）
+PROFILE_SHEET = "Profile"
+PROFILE_TITLE = "テスト本体のプロファイル（累積時間の上位の関数）"
+PROFILE_HEADERS = ["テスト名", "順位", "関数", "呼び出し回数", "自身の時間(秒)", "累積時間(秒)"]
+PROFILE_COLUMN_WIDTHS = {"A": 50, "B": 8, "C": 70, "D": 14, "E": 16, "F": 16}
+
+# テスト結果の項目（ResultStore.rows のタプルの順）
+RESULT_FIELDS = ("test_name", "status", "duration", "error_message", "category", "timestamp")
+
+
+def _build_report(output_dir: str, excel_file: str, results: ResultStore,
+                  include_all_tests: bool = True, duration_rows: Optional[List[Tuple]] = None,
+                  overhead: Optional[Tuple[List[Tuple], List[Tuple]]] = None,
+                  profile_rows: Optional[List[Tuple]] = None) -> str:
+    """
+    テスト結果のストアから詳細レポートを作成して保存（プロセスプールで実行）
+    
+    結果は番号・エポック秒の配列のまま受け取り、文字列への変換はシートの作成時にこのプロセスで行う。
+    
+    Args:
+        output_dir: 出力ディレクトリのパス
+        excel_file: 出力ファイルのパス
+        results: テスト結果（ExcelReporter.results、カテゴリ別ファイルの場合は ResultStore.subset）
+        include_all_tests: 全件シートを作成するか
+        duration_rows: サマリーシートの実行時間の表（ExcelReporter.duration_rows）
+        overhead: レポート処理のオーバーヘッド（ExcelReporter.set_overhead の引数）
+        profile_rows: テスト本体のプロファイル（ExcelReporter.set_profile の引数）
+    
+    Returns:
+        保存したファイルのパス
+    """
+    reporter = ExcelReporter(output_dir=output_dir)
+    reporter.excel_file = excel_file
+    reporter.include_all_tests = include_all_tests
+    reporter.duration_rows = duration_rows or []
+    if overhead:
+        reporter.set_overhead(*overhead)
+    if profile_rows:
+        reporter.set_profile(profile_rows)
+    reporter.initialize_workbook()
+    reporter.results = results
+    reporter.status_counts.update(results.status_counts())
+    reporter.total_count = len(results)
+    return reporter.save()
+
 
 class ExcelReporter:
     """Excelレポート生成クラス"""
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", streaming: bool = False,
+                 timestamp: Optional[str] = None):
         """
         初期化
         
         Args:
             output_dir: 出力ディレクトリのパス
+            streaming: Trueの場合、書き込み専用ワークブックに結果を逐次出力する
+                       （結果をメモリに保持しないため、大量の結果でもメモリ使用量が一定）
+            timestamp: ファイル名に使用するタイムスタンプ（省略時は現在時刻）
         """
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
-        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         self.excel_file = os.path.join(output_dir, f"test_results_{self.timestamp}.xlsx")
         self.workbook = None
-        self.test_results: List[Dict[str, Any]] = []
-        
+        # テスト結果（カテゴリ別の振り分けはadd_test_result時に行う）
+        self.results = ResultStore()
+        # 結果ごとの件数（add_test_result時に集計）
+        self.status_counts: Dict[str, int] = {"passed": 0, "failed": 0, "skipped": 0}
+        self.total_count = 0
+        self.streaming = streaming
+        # ストリーミングモード用: シート名 -> (シート, 次に書き込む行のNo.)
+        self._stream_sheets: Dict[str, list] = {}
+        # 全件シートを作成するか（カテゴリ別ファイルの作成時はFalse）
+        self.include_all_tests = True
+        # セルスタイルのキャッシュ（通常モード用）
+        self._styles = StyleRegistry()
+        # 名前付きスタイル名 -> 適用後のスタイルID（ストリーミングモード用、ワークブックごと）
+        self._named_style_arrays: Dict[str, Any] = {}
+        # サマリーシートの実行時間の表の行（set_duration_history で設定）
+        self.duration_rows: List[Tuple] = []
+        # レポート処理のオーバーヘッドの行と全体の集計（set_overhead で設定）
+        self.overhead_rows: List[Tuple] = []
+        self.overhead_summary: List[Tuple[str, Any]] = []
+        # テスト本体のプロファイルの行（set_profile で設定）
+        self.profile_rows: List[Tuple] = []
+    
     def initialize_workbook(self):
         """ワークブックの初期化"""
+        if self.streaming:
+            self.workbook = Workbook(write_only=True)
+            register_named_styles(self.workbook)
+            self._named_style_arrays = {}
+            # サマリーと全件シートは先に作成しておく（行は保存時・結果追加時に書き込む）
+            self.workbook.create_sheet("Summary")
+            self._get_stream_sheet(ALL_TESTS_SHEET)
+            logger.info(f"Excelワークブックを初期化しました（ストリーミングモード）: {self.excel_file}")
+            return
+        
         self.workbook = Workbook()
         # デフォルトシートを削除
         if "Sheet" in self.workbook.sheetnames:
             del self.workbook["Sheet"]
         logger.info(f"Excelワークブックを初期化しました: {self.excel_file}")
+    
+    def _get_stream_sheet(self, sheet_name: str) -> list:
+        """
+        ストリーミングモードの詳細シートを取得（未作成の場合はヘッダー付きで作成）
+        
+        Args:
+            sheet_name: シート名
+        
+        Returns:
+            [シート, 次に書き込む行のNo.]
+        """
+        entry = self._stream_sheets.get(sheet_name)
+        if entry is None:
+            ws = self.workbook.create_sheet(sheet_name)
+            # 書き込み専用シートではカラム幅を行の書き込み前に設定する必要がある
+            for column, width in DETAIL_COLUMN_WIDTHS.items():
+                ws.column_dimensions[column].width = width
+            ws.append([self._styled_cell(ws, header, "header") for header in DETAIL_HEADERS])
+            entry = [ws, 1]
+            self._stream_sheets[sheet_name] = entry
+        return entry
+    
+    def _styled_cell(self, ws, value, style: str) -> WriteOnlyCell:
+        """
+        名前付きスタイルを適用した書き込み専用セルの作成
+        
+        名前付きスタイルの検索はスタイル名ごとに1回だけ行い、
+        2回目以降はキャッシュしたスタイルID（StyleArray）をコピーする。
+        
+        Args:
+            ws: 書き込み先のシート
+            value: セルの値
+            style: スタイル名（名前付きスタイルの接頭辞を除いたもの）
         
+        Returns:
+            書き込み専用セル
+        """
+        cell = WriteOnlyCell(ws, value=value)
+        style_array = self._named_style_arrays.get(style)
+        if style_array is None:
+            cell.style = NAMED_STYLE_PREFIX + style
+            self._named_style_arrays[style] = copy(cell._style)
+        else:
+            cell._style = copy(style_array)
+        return cell
+    
+    def _stream_result(self, result: Dict[str, Any]):
+        """
+        テスト結果をカテゴリ別シートと全件シートに逐次書き込む
+        
+        Args:
+            result: テスト結果
+        """
+        result_style = status_style(result["status"])
+        
+        for sheet_name in (result["category"], ALL_TESTS_SHEET):
+            entry = self._get_stream_sheet(sheet_name)
+            ws, number = entry
+            ws.append([
+                self._styled_cell(ws, number, "body"),
+                self._styled_cell(ws, result["test_name"], "body"),
+                self._styled_cell(ws, result["category"], "body"),
+                self._styled_cell(ws, result["status"], result_style),
+                self._styled_cell(ws, f"{result['duration']:.3f}", "body"),
+                self._styled_cell(ws, result["timestamp"], "body"),
+                self._styled_cell(ws, result["error_message"], "body"),
+            ])
+            entry[1] = number + 1
+    
     def add_test_result(self, test_name: str, status: str, duration: float, 
-                       error_message: str = "", category: str = "General"):
+                       error_message: str = "", category: str = "General",
+                       timestamp: Union[str, float, None] = None):
         """
         テスト結果を追加
         
@@ -49,35 +224,189 @@ class ExcelReporter:
             duration: 実行時間（秒）
             error_message: エラーメッセージ（失敗時）
             category: テストのカテゴリ
+            timestamp: 実行日時（文字列またはエポック秒、省略時は現在時刻）
+        """
+        self.total_count += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if self.streaming:
+            # ストリーミングモードでは結果を保持せず、件数のみ集計する
+            if timestamp is None:
+                timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+            elif not isinstance(timestamp, str):
+                timestamp = format_timestamp(timestamp)
+            self._stream_result({
+                "test_name": test_name,
+                "status": status,
+                "duration": duration,
+                "error_message": error_message,
+                "category": category,
+                "timestamp": timestamp
+            })
+        else:
+            # 実行日時はエポック秒で保持し、シート作成時に文字列に変換する
+            self.results.append(test_name, status, duration, error_message, category, timestamp)
+        logger.debug("テスト結果を追加: %s - %s", test_name, status)
+    
+    def set_duration_history(self, slowest: List[Tuple[str, float]],
+                             regressions: List[Tuple[str, float, float, float]]):
+        """
+        サマリーシートに表示する実行時間の上位・悪化テストの設定
+        
+        Args:
+            slowest: (テスト名, 実行時間) のリスト（ResultHistory.slowest）
+            regressions: (テスト名, 実行時間, 過去の中央値, 倍率) のリスト（ResultHistory.find_regressions）
+        """
+        self.duration_rows = (
+            [("悪化", duration, baseline, f"x{ratio:.2f}", test_name)
+             for test_name, duration, baseline, ratio in regressions]
+            + [("低速", duration, None, None, test_name) for test_name, duration in slowest]
+        )
+    
+    def _duration_table(self) -> List[List[Tuple[Any, str]]]:
+        """
+        サマリーシートの実行時間の表
+        
+        Returns:
+            行ごとの (値, スタイル名) のリスト（タイトル行、ヘッダー行、データ行の順）
+        """
+        table = [[(DURATION_TABLE_TITLE, "title")],
+                 [(header, "header") for header in DURATION_TABLE_HEADERS]]
+        for kind, duration, baseline, ratio, test_name in self.duration_rows:
+            table.append([
+                (kind, "body"),
+                (f"{duration:.3f}", "body"),
+                (f"{baseline:.3f}" if baseline is not None else "", "body"),
+                (ratio or "", "failed" if ratio else "body"),
+                (test_name, "body"),
+            ])
+        return table
+    
+    def set_overhead(self, rows: List[Tuple[str, int, float, float, float]],
+                     summary: List[Tuple[str, Any]]):
+        """
+        レポート処理のオーバーヘッドの設定（保存時に専用のシートを作成する）
+        
+        Args:
+            rows: (処理名, 呼び出し回数, 合計(ミリ秒), 平均(マイクロ秒), 最大(マイクロ秒)) のリスト
+                  （OverheadCounters.rows）
+            summary: (項目, 値) のリスト（セッションの実行時間に対する割合等）
+        """
+        self.overhead_rows = list(rows)
+        self.overhead_summary = list(summary)
+    
+    def _overhead_table(self) -> List[List[Tuple[Any, str]]]:
         """
-        result = {
-            "test_name": test_name,
-            "status": status,
-            "duration": duration,
-            "error_message": error_message,
-            "category": category,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        self.test_results.append(result)
-        logger.debug(f"テスト結果を追加: {test_name} - {status}")
+        レポート処理のオーバーヘッドのシートの内容
         
+        Returns:
+            行ごとの (値, スタイル名) のリスト（空のリストは空行）
+        """
+        table = [[(OVERHEAD_TITLE, "title")], []]
+        for item, value in self.overhead_summary:
+            table.append([(item, "body"), (value, "body")])
+        table.append([])
+        table.append([(header, "header") for header in OVERHEAD_HEADERS])
+        for name, count, total_ms, avg_us, max_us in self.overhead_rows:
+            table.append([
+                (name, "body"),
+                (count, "body"),
+                (round(total_ms, 3), "body"),
+                (round(avg_us, 1), "body"),
+                (round(max_us, 1), "body"),
+            ])
+        return table
+    
+    def _create_table_sheet(self, sheet_name: str, table: List[List[Tuple[Any, str]]],
+                            column_widths: Dict[str, int]):
+        """
+        表形式のシートの作成（通常モード・ストリーミングモード共通）
+        
+        Args:
+            sheet_name: シート名
+            table: 行ごとの (値, スタイル名) のリスト（空のリストは空行）
+            column_widths: 列 -> カラム幅
+        """
+        ws = self.workbook.create_sheet(sheet_name)
+        if self.streaming:
+            # 書き込み専用シートではカラム幅を行の書き込み前に設定する必要がある
+            for column, width in column_widths.items():
+                ws.column_dimensions[column].width = width
+            for cells in table:
+                ws.append([self._styled_cell(ws, value, style) for value, style in cells])
+        else:
+            apply_style = self._styles.apply
+            for row_idx, cells in enumerate(table, start=1):
+                for col, (value, style) in enumerate(cells, start=1):
+                    apply_style(ws.cell(row=row_idx, column=col, value=value), style)
+            for column, width in column_widths.items():
+                ws.column_dimensions[column].width = width
+    
+    def create_overhead_sheet(self):
+        """レポート処理のオーバーヘッドのシートの作成"""
+        self._create_table_sheet(OVERHEAD_SHEET, self._overhead_table(), OVERHEAD_COLUMN_WIDTHS)
+        logger.info(f"レポート処理のオーバーヘッドのシートを作成しました: {OVERHEAD_SHEET}")
+    
+    def set_profile(self, rows: List[Tuple[str, int, str, int, float, float]]):
+        """
+        テスト本体のプロファイルの設定（保存時に専用のシートを作成する）
+        
+        Args:
+            rows: (テスト名, 順位, 関数, 呼び出し回数, 自身の時間(秒), 累積時間(秒)) のリスト
+                  （CallProfiler.rows。全体の集計、テストごとの順）
+        """
+        self.profile_rows = list(rows)
+    
+    def _profile_table(self) -> List[List[Tuple[Any, str]]]:
+        """
+        テスト本体のプロファイルのシートの内容
+        
+        Returns:
+            行ごとの (値, スタイル名) のリスト（空のリストは空行）
+        """
+        table = [[(PROFILE_TITLE, "title")], []]
+        table.append([(header, "header") for header in PROFILE_HEADERS])
+        for test_name, rank, function, ncalls, tottime, cumtime in self.profile_rows:
+            table.append([
+                (test_name, "body"),
+                (rank, "body"),
+                (function, "body"),
+                (ncalls, "body"),
+                (round(tottime, 6), "body"),
+                (round(cumtime, 6), "body"),
+            ])
+        return table
+    
+    def create_profile_sheet(self):
+        """テスト本体のプロファイルのシートの作成"""
+        self._create_table_sheet(PROFILE_SHEET, self._profile_table(), PROFILE_COLUMN_WIDTHS)
+        logger.info(f"テスト本体のプロファイルのシートを作成しました: {PROFILE_SHEET}")
+    
+    def _summary_stats(self) -> List[tuple]:
+        """
+        サマリーの統計データ（add_test_result時に集計済みの件数から算出）
+        
+        Returns:
+            (項目, 件数, 割合, 備考) のリスト
+        """
+        total = self.total_count
+        passed = self.status_counts.get("passed", 0)
+        failed = self.status_counts.get("failed", 0)
+        skipped = self.status_counts.get("skipped", 0)
+        return [
+            ("総テスト数", total, 100.0, ""),
+            ("成功", passed, (passed/total*100 if total > 0 else 0), ""),
+            ("失敗", failed, (failed/total*100 if total > 0 else 0), ""),
+            ("スキップ", skipped, (skipped/total*100 if total > 0 else 0), "")
+        ]
+    
     def create_summary_sheet(self):
         """サマリーシートの作成"""
         ws = self.workbook.create_sheet("Summary", 0)
-        
-        # ヘッダースタイル
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        apply_style = self._styles.apply
         
         # タイトル
         ws["A1"] = "テスト実行サマリー"
-        ws["A1"].font = Font(bold=True, size=14)
+        apply_style(ws["A1"], "title")
         ws.merge_cells("A1:D1")
         
         # 実行情報
@@ -87,50 +416,35 @@ class ExcelReporter:
         # 統計情報のヘッダー
         headers = ["項目", "件数", "割合(%)", "備考"]
         for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=5, column=col, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center")
-            cell.border = border
-        
-        # 統計データの計算
-        total = len(self.test_results)
-        passed = sum(1 for r in self.test_results if r["status"] == "passed")
-        failed = sum(1 for r in self.test_results if r["status"] == "failed")
-        skipped = sum(1 for r in self.test_results if r["status"] == "skipped")
-        
-        stats = [
-            ("総テスト数", total, 100.0, ""),
-            ("成功", passed, (passed/total*100 if total > 0 else 0), ""),
-            ("失敗", failed, (failed/total*100 if total > 0 else 0), ""),
-            ("スキップ", skipped, (skipped/total*100 if total > 0 else 0), "")
-        ]
+            apply_style(ws.cell(row=5, column=col, value=header), "header")
         
         # 統計データの書き込み
-        for row_idx, (item, count, percentage, note) in enumerate(stats, start=6):
-            ws.cell(row=row_idx, column=1, value=item).border = border
-            ws.cell(row=row_idx, column=2, value=count).border = border
-            ws.cell(row=row_idx, column=3, value=f"{percentage:.1f}").border = border
-            ws.cell(row=row_idx, column=4, value=note).border = border
+        for row_idx, (item, count, percentage, note) in enumerate(self._summary_stats(), start=6):
+            apply_style(ws.cell(row=row_idx, column=1, value=item), "body")
+            apply_style(ws.cell(row=row_idx, column=3, value=f"{percentage:.1f}"), "body")
+            apply_style(ws.cell(row=row_idx, column=4, value=note), "body")
             
             # 結果に応じた色付け
+            count_style = "body"
             if item == "成功" and count > 0:
-                ws.cell(row=row_idx, column=2).fill = PatternFill(start_color="C6EFCE", 
-                                                                   end_color="C6EFCE", 
-                                                                   fill_type="solid")
+                count_style = "passed"
             elif item == "失敗" and count > 0:
-                ws.cell(row=row_idx, column=2).fill = PatternFill(start_color="FFC7CE", 
-                                                                   end_color="FFC7CE", 
-                                                                   fill_type="solid")
+                count_style = "failed"
+            apply_style(ws.cell(row=row_idx, column=2, value=count), count_style)
+        
+        # 実行時間の上位・悪化テスト（統計データの1行下から）
+        if self.duration_rows:
+            for row_idx, cells in enumerate(self._duration_table(), start=row_idx + 2):
+                for col, (value, style) in enumerate(cells, start=1):
+                    apply_style(ws.cell(row=row_idx, column=col, value=value), style)
+            ws.column_dimensions["E"].width = DURATION_TABLE_NAME_WIDTH
         
         # カラム幅の調整
-        ws.column_dimensions["A"].width = 15
-        ws.column_dimensions["B"].width = 12
-        ws.column_dimensions["C"].width = 12
-        ws.column_dimensions["D"].width = 30
+        for column, width in SUMMARY_COLUMN_WIDTHS.items():
+            ws.column_dimensions[column].width = width
         
         logger.info("サマリーシートを作成しました")
-        
+    
     def create_detail_sheet(self, category: str = None):
         """
         詳細結果シートの作成
@@ -138,76 +452,115 @@ class ExcelReporter:
         Args:
             category: フィルタするカテゴリ（Noneの場合は全件）
         """
-        sheet_name = category if category else "All Tests"
+        sheet_name = category if category else ALL_TESTS_SHEET
         ws = self.workbook.create_sheet(sheet_name)
-        
-        # ヘッダースタイル
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        apply_style = self._styles.apply
         
         # ヘッダー
-        headers = ["No.", "テスト名", "カテゴリ", "結果", "実行時間(秒)", "実行日時", "エラーメッセージ"]
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center")
-            cell.border = border
-        
-        # データのフィルタリング
-        filtered_results = [r for r in self.test_results 
-                          if category is None or r["category"] == category]
-        
-        # データの書き込み
-        for row_idx, result in enumerate(filtered_results, start=2):
-            ws.cell(row=row_idx, column=1, value=row_idx - 1).border = border
-            ws.cell(row=row_idx, column=2, value=result["test_name"]).border = border
-            ws.cell(row=row_idx, column=3, value=result["category"]).border = border
+        for col, header in enumerate(DETAIL_HEADERS, start=1):
+            apply_style(ws.cell(row=1, column=col, value=header), "header")
+        
+        # データの書き込み（カテゴリ別に振り分け済みの結果を使用）
+        for row_idx, (test_name, status, duration, error_message, result_category, timestamp) \
+                in enumerate(self.results.rows(category), start=2):
+            apply_style(ws.cell(row=row_idx, column=1, value=row_idx - 1), "body")
+            apply_style(ws.cell(row=row_idx, column=2, value=test_name), "body")
+            apply_style(ws.cell(row=row_idx, column=3, value=result_category), "body")
             
             # 結果セルの設定
-            status_cell = ws.cell(row=row_idx, column=4, value=result["status"])
-            status_cell.border = border
-            if result["status"] == "passed":
-                status_cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", 
-                                              fill_type="solid")
-            elif result["status"] == "failed":
-                status_cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", 
-                                              fill_type="solid")
-            elif result["status"] == "skipped":
-                status_cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", 
-                                              fill_type="solid")
+            apply_style(ws.cell(row=row_idx, column=4, value=status), status_style(status))
             
-            ws.cell(row=row_idx, column=5, value=f"{result['duration']:.3f}").border = border
-            ws.cell(row=row_idx, column=6, value=result["timestamp"]).border = border
-            ws.cell(row=row_idx, column=7, value=result["error_message"]).border = border
+            apply_style(ws.cell(row=row_idx, column=5, value=f"{duration:.3f}"), "body")
+            apply_style(ws.cell(row=row_idx, column=6, value=timestamp), "body")
+            apply_style(ws.cell(row=row_idx, column=7, value=error_message), "body")
         
         # カラム幅の調整
-        ws.column_dimensions["A"].width = 6
-        ws.column_dimensions["B"].width = 40
-        ws.column_dimensions["C"].width = 15
-        ws.column_dimensions["D"].width = 12
-        ws.column_dimensions["E"].width = 15
-        ws.column_dimensions["F"].width = 20
-        ws.column_dimensions["G"].width = 50
+        for column, width in DETAIL_COLUMN_WIDTHS.items():
+            ws.column_dimensions[column].width = width
         
         logger.info(f"詳細シートを作成しました: {sheet_name}")
+    
+    def _create_streaming_summary_sheet(self):
+        """サマリーシートの作成（ストリーミングモード）"""
+        ws = self.workbook["Summary"]
+        for column, width in SUMMARY_COLUMN_WIDTHS.items():
+            ws.column_dimensions[column].width = width
+        if self.duration_rows:
+            ws.column_dimensions["E"].width = DURATION_TABLE_NAME_WIDTH
+        ws.merged_cells.add("A1:D1")
+        
+        ws.append([self._styled_cell(ws, "テスト実行サマリー", "title")])
+        ws.append([])
+        ws.append(["実行日時:", datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
+        ws.append([])
+        ws.append([self._styled_cell(ws, header, "header")
+                   for header in ["項目", "件数", "割合(%)", "備考"]])
+        for item, count, percentage, note in self._summary_stats():
+            count_style = "body"
+            if item == "成功" and count > 0:
+                count_style = "passed"
+            elif item == "失敗" and count > 0:
+                count_style = "failed"
+            ws.append([
+                self._styled_cell(ws, item, "body"),
+                self._styled_cell(ws, count, count_style),
+                self._styled_cell(ws, f"{percentage:.1f}", "body"),
+                self._styled_cell(ws, note, "body"),
+            ])
+        
+        # 実行時間の上位・悪化テスト（統計データの1行下から）
+        if self.duration_rows:
+            ws.append([])
+            for cells in self._duration_table():
+                ws.append([self._styled_cell(ws, value, style) for value, style in cells])
+        
+        logger.info("サマリーシートを作成しました")
+    
+    def _save_streaming(self):
+        """Excelファイルの保存（ストリーミングモード）"""
+        self._create_streaming_summary_sheet()
+        if self.overhead_rows:
+            self.create_overhead_sheet()
+        if self.profile_rows:
+            self.create_profile_sheet()
         
+        # シート順を通常モードと揃える（Summary、カテゴリ別（名前順）、All Tests、Reporter Overhead、Profile）
+        def sheet_order(ws):
+            if ws.title == "Summary":
+                return (0, "")
+            if ws.title == ALL_TESTS_SHEET:
+                return (2, "")
+            if ws.title == OVERHEAD_SHEET:
+                return (3, "")
+            if ws.title == PROFILE_SHEET:
+                return (4, "")
+            return (1, ws.title)
+        self.workbook._sheets.sort(key=sheet_order)
+        
+        self.workbook.save(self.excel_file)
+        logger.info(f"Excelファイルを保存しました: {self.excel_file}")
+        return self.excel_file
+    
     def save(self):
         """Excelファイルの保存"""
+        if self.workbook and self.streaming:
+            return self._save_streaming()
         if self.workbook:
             # カテゴリ別のシート作成
-            categories = set(r["category"] for r in self.test_results)
-            for category in sorted(categories):
+            for category in sorted(self.results.categories()):
                 self.create_detail_sheet(category)
             
             # 全体の詳細シート作成
-            self.create_detail_sheet()
+            if self.include_all_tests:
+                self.create_detail_sheet()
+            
+            # レポート処理のオーバーヘッドのシート作成
+            if self.overhead_rows:
+                self.create_overhead_sheet()
+            
+            # テスト本体のプロファイルのシート作成
+            if self.profile_rows:
+                self.create_profile_sheet()
             
             # サマリーシート作成（最初に表示されるように）
             self.create_summary_sheet()
@@ -217,3 +570,45 @@ class ExcelReporter:
             logger.info(f"Excelファイルを保存しました: {self.excel_file}")
             return self.excel_file
         return None
+    
+    def submit_save(self, executor: Executor, split_categories: bool = False) -> List[Future]:
+        """
+        詳細レポートの保存をプロセスプールに依頼
+        
+        テスト結果は ResultStore（番号・エポック秒の配列）のまま子プロセスに渡し、文字列への変換、
+        ワークブックの作成と保存（XMLのシリアライズ）は子プロセスで行う。
+        カテゴリ別ファイルには、そのカテゴリの行のみを渡す。呼び出し元はその間に
+        他のワークブック（テンプレートベースの結果ファイル等）を保存できる。
+        ストリーミングモードでは結果を保持していないため、この場で保存する。
+        
+        Args:
+            executor: プロセスプール
+            split_categories: Trueの場合、カテゴリ別のファイルも作成する
+                              （test_results_YYYYMMDD_HHMMSS_<カテゴリ>.xlsx）
+        
+        Returns:
+            保存したファイルのパスを返すFutureのリスト
+        """
+        if self.streaming:
+            future: Future = Future()
+            future.set_result(self.save())
+            return [future]
+        
+        futures = [executor.submit(_build_report, self.output_dir, self.excel_file,
+                                   self.results, True, self.duration_rows,
+                                   (self.overhead_rows, self.overhead_summary), self.profile_rows)]
+        if split_categories:
+            base, ext = os.path.splitext(self.excel_file)
+            used_names = set()
+            for category in sorted(self.results.categories()):
+                # ファイル名に使えない文字の置き換えで異なるカテゴリが同じ名前になる場合は、連番を付けて区別する
+                safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in category)
+                file_name, suffix = safe_name, 2
+                while file_name.lower() in used_names:
+                    file_name = f"{safe_name}_{suffix}"
+                    suffix += 1
+                used_names.add(file_name.lower())
+                futures.append(executor.submit(_build_report, self.output_dir,
+                                               f"{base}_{file_name}{ext}", self.results.subset(category), False))
+        logger.info(f"詳細レポートの保存をプロセスプールに依頼しました: {len(futures)}ファイル")
+        return futures
@@ -2,18 +2,48 @@
 ロギング設定モジュール
 テスト実行のログを適切に記録するための設定を提供
 """
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
+from typing import Dict
 
+# キュー経由のロギングで使用中のリスナー（ロガー名 -> リスナー）
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
 
-def setup_logger(name: str = "pytest_logger", log_dir: str = "output") -> logging.Logger:
+
+def _use_direct_handlers_in_child():
+    """
+    fork後の子プロセスの処理
+    
+    子プロセスにはリスナースレッドが存在しないため、キューを経由せず
+    ファイル・コンソールのハンドラに直接出力するよう切り替える
+    """
+    for name, listener in _listeners.items():
+        logging.getLogger(name).handlers = [
+            getattr(handler, "target", None) or handler for handler in listener.handlers
+        ]
+    _listeners.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_use_direct_handlers_in_child)
+
+
+def setup_logger(name: str = "pytest_logger", log_dir: str = "output",
+                 queued: bool = False, flush_interval: int = 100) -> logging.Logger:
     """
     ロガーのセットアップ
     
     Args:
         name: ロガーの名前
         log_dir: ログファイルを保存するディレクトリ
+        queued: Trueの場合、ログをキューに登録するのみとし、ファイル・コンソールへの
+                出力は専用スレッド（QueueListener）で行う
+        flush_interval: queued の場合、ログファイルへまとめて書き出す件数
+                        （ERROR以上のログは即座に書き出す）
     
     Returns:
         設定されたロガーインスタンス
@@ -26,6 +56,7 @@ def setup_logger(name: str = "pytest_logger", log_dir: str = "output") -> loggin
     logger.setLevel(logging.DEBUG)
     
     # 既存のハンドラをクリア（重複を防ぐ）
+    shutdown_logger(name)
     if logger.handlers:
         logger.handlers.clear()
     
@@ -48,9 +79,48 @@ def setup_logger(name: str = "pytest_logger", log_dir: str = "output") -> loggin
     console_handler.setFormatter(formatter)
     
     # ハンドラの追加
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    if queued:
+        # ファイルへはまとめて書き出す（ERROR以上は即座に書き出す）
+        buffered_file_handler = logging.handlers.MemoryHandler(
+            capacity=max(1, flush_interval), flushLevel=logging.ERROR, target=file_handler
+        )
+        buffered_file_handler.setLevel(logging.DEBUG)
+        log_queue: queue.Queue = queue.Queue(-1)
+        listener = logging.handlers.QueueListener(
+            log_queue, buffered_file_handler, console_handler, respect_handler_level=True
+        )
+        listener.start()
+        _listeners[name] = listener
+        # shutdown_logger() が呼ばれずに終了した場合もキューに残ったログを出力する
+        atexit.register(shutdown_logger, name)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    else:
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
     
-    logger.info(f"ロガーを初期化しました: {log_file}")
+    logger.info("ロガーを初期化しました: %s%s", log_file, "（キュー経由）" if queued else "")
     
     return logger
+
+
+def shutdown_logger(name: str = "pytest_logger"):
+    """
+    キュー経由のロギングの終了
+    
+    キューに残っているログを全て出力してからリスナーを停止し、
+    バッファ中のログをファイルに書き出す。queued でない場合は何もしない。
+    
+    Args:
+        name: ロガーの名前
+    """
+    listener = _listeners.pop(name, None)
+    if listener is None:
+        return
+    
+    listener.stop()
+    for handler in listener.handlers:
+        # MemoryHandler は close() で出力先の参照を外すため、先に取得しておく
+        target = getattr(handler, "target", None)
+        handler.close()
+        if target is not None:
+            target.close()
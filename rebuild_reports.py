@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+レポート再生成スクリプト
+中断されたテスト実行の結果ジャーナル（output/test_results_*.jsonl）から
+テンプレートベースの結果ファイルと詳細レポートを再生成します
+
+使い方:
+    python rebuild_reports.py output/test_results_YYYYMMDD_HHMMSS.jsonl
+    python rebuild_reports.py output/test_results_YYYYMMDD_HHMMSS.jsonl --no-template
+"""
+import argparse
+import os
+import sys
+from logger_config import setup_logger
+from excel_reporter import ExcelReporter
+from testlib.config_manager import ConfigManager
+from testlib.excel_manager_group import create_excel_manager
+from testlib.result_exporter import ResultExporter
+from testlib.result_journal import read_journal, apply_result
+
+
+def journal_timestamp(journal_path: str) -> str:
+    """
+    ジャーナルのファイル名からタイムスタンプを取得
+    
+    Args:
+        journal_path: ジャーナルファイルのパス
+    
+    Returns:
+        タイムスタンプ（取得できない場合は空文字列）
+    """
+    stem = os.path.splitext(os.path.basename(journal_path))[0]
+    prefix = "test_results_"
+    return stem[len(prefix):] if stem.startswith(prefix) else ""
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description="結果ジャーナルからExcelレポートを再生成します")
+    parser.add_argument("journal", help="結果ジャーナルのパス（output/test_results_*.jsonl）")
+    parser.add_argument("--no-template", action="store_true",
+                        help="テンプレートベースの結果ファイルを更新しない")
+    parser.add_argument("--config", default="conf/config.yaml", help="設定ファイルのパス")
+    args = parser.parse_args()
+    
+    logger = setup_logger()
+    
+    if not os.path.exists(args.journal):
+        logger.error(f"結果ジャーナルが見つかりません: {args.journal}")
+        return 1
+    
+    config_manager = ConfigManager(args.config)
+    
+    # テンプレートベースのExcelマネージャーの初期化
+    excel_manager = None
+    if not args.no_template:
+        excel_manager = create_excel_manager(
+            config_manager.template_targets,
+            rom_version=config_manager.rom_version,
+            tester_name=config_manager.tester_name,
+            patch_mode=config_manager.template_patch_mode,
+            buffered=config_manager.template_buffered_writes
+        )
+        excel_manager.prepare_output_file()
+        excel_manager.open_workbook()
+        excel_manager.write_test_info()
+    
+    # 詳細レポートはジャーナルと同じタイムスタンプで出力する
+    excel_reporter = ExcelReporter(
+        output_dir=os.path.dirname(args.journal) or ".",
+        streaming=config_manager.report_streaming,
+        timestamp=journal_timestamp(args.journal) or None
+    )
+    excel_reporter.initialize_workbook()
+    
+    # 結果のエクスポート（設定で有効な場合のみ）
+    result_exporter = None
+    if config_manager.result_export != "none":
+        result_exporter = ResultExporter(
+            os.path.join(excel_reporter.output_dir, f"test_export_{excel_reporter.timestamp}"),
+            fmt=config_manager.result_export,
+            batch_size=config_manager.export_batch_size
+        )
+    
+    count = 0
+    for record in read_journal(args.journal):
+        apply_result(record, excel_reporter, excel_manager, result_exporter)
+        count += 1
+    logger.info(f"結果ジャーナルから{count}件の結果を読み込みました: {args.journal}")
+    
+    if excel_manager:
+        try:
+            excel_manager.save()
+        finally:
+            excel_manager.close()
+        logger.info(f"テンプレートベースの結果ファイルを保存しました: {excel_manager.output_path}")
+    
+    if result_exporter:
+        result_exporter.close()
+    
+    excel_file = excel_reporter.save()
+    logger.info(f"詳細レポートをExcelファイルに出力しました: {excel_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,38 @@
 """
 testlib - テスト実行サポートライブラリ
 テンプレート管理、設定管理、Excel操作などの機能を提供
+
+openpyxl・pyarrow 等の読み込みに時間がかかるため、各クラス・関数は初回参照時にモジュールを読み込む
+（--collect-only / --help 等のテストを実行しない起動を速くするため）
 """
-from .config_manager import ConfigManager
-from .excel_manager import ExcelManager
+import importlib
+
+# 公開する名前 -> 定義しているサブモジュール
+_EXPORTS = {
+    'ConfigManager': 'config_manager',
+    'ExcelManager': 'excel_manager',
+    'ExcelManagerGroup': 'excel_manager_group',
+    'create_excel_manager': 'excel_manager_group',
+    'ResultJournal': 'result_journal',
+    'read_journal': 'result_journal',
+    'apply_result': 'result_journal',
+    'ResultExporter': 'result_exporter',
+    'ResultHistory': 'result_history',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """公開する名前の初回参照時に、定義しているサブモジュールを読み込む"""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['ConfigManager', 'ExcelManager']
+def __dir__():
+    """公開する名前を含む属性の一覧"""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,115 @@
+"""
+バックグラウンド書き込みモジュール
+Excelへの書き込みをテスト実行スレッドから切り離し、専用スレッドで順番に処理する
+"""
+import queue
+import threading
+from typing import Callable, List, Optional
+import logging
+
+logger = logging.getLogger("pytest_logger")
+
+# キューが満杯の場合の動作
+OVERFLOW_BLOCK = "block"  # 空きができるまで待つ（結果は失われない）
+OVERFLOW_DROP = "drop"    # 書き込みを破棄して警告する（テスト実行を待たせない）
+
+# 書き込みエラー時の動作
+ERROR_LOG = "log"      # ログに記録して処理を続ける
+ERROR_RAISE = "raise"  # join() で最初のエラーを送出する
+
+# スレッド終了指示
+_STOP = object()
+
+
+class BackgroundWriter:
+    """バックグラウンド書き込みクラス"""
+    
+    def __init__(self, write_func: Callable, queue_size: int = 1000,
+                 overflow: str = OVERFLOW_BLOCK, on_error: str = ERROR_LOG):
+        """
+        初期化
+        
+        Args:
+            write_func: 書き込み処理（submit() に渡した引数で呼び出される）
+            queue_size: キューの最大件数
+            overflow: キューが満杯の場合の動作 (block/drop)
+            on_error: 書き込みエラー時の動作 (log/raise)
+        """
+        if overflow not in (OVERFLOW_BLOCK, OVERFLOW_DROP):
+            raise ValueError(f"不正なoverflow指定です: {overflow}")
+        if on_error not in (ERROR_LOG, ERROR_RAISE):
+            raise ValueError(f"不正なon_error指定です: {on_error}")
+        
+        self.write_func = write_func
+        self.overflow = overflow
+        self.on_error = on_error
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._thread: Optional[threading.Thread] = None
+        self.errors: List[Exception] = []
+        self.submitted = 0
+        self.dropped = 0
+        self.max_depth = 0
+    
+    def start(self):
+        """書き込みスレッドの開始"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="excel-writer", daemon=True)
+            self._thread.start()
+    
+    def submit(self, *args) -> bool:
+        """
+        書き込みの依頼
+        
+        Args:
+            *args: write_func に渡す引数
+        
+        Returns:
+            キューに登録できた場合True（dropで破棄した場合False）
+        """
+        if self.overflow == OVERFLOW_DROP:
+            try:
+                self._queue.put_nowait(args)
+            except queue.Full:
+                self.dropped += 1
+                logger.warning("書き込みキューが満杯のため、書き込みを破棄しました: %s", args[0] if args else "")
+                return False
+        else:
+            self._queue.put(args)
+        
+        self.submitted += 1
+        depth = self._queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return True
+    
+    def _run(self):
+        """書き込みスレッドの処理"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self.write_func(*item)
+            except Exception as e:
+                self.errors.append(e)
+                logger.error("バックグラウンド書き込みに失敗しました: %s", e)
+            finally:
+                self._queue.task_done()
+    
+    def join(self):
+        """
+        未処理の書き込みの完了を待ってスレッドを終了
+        
+        Raises:
+            Exception: on_error が raise で、書き込みエラーが発生していた場合（最初のエラー）
+        """
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+            logger.info(f"バックグラウンド書き込みを終了しました: "
+                        f"{self.submitted}件（破棄{self.dropped}件、エラー{len(self.errors)}件、"
+                        f"最大キュー長{self.max_depth}）")
+        
+        if self.errors and self.on_error == ERROR_RAISE:
+            raise self.errors[0]
@@ -4,7 +4,7 @@ conf/config.yaml からテスト実行設定を読み込む
 """
 import os
 import yaml
-from typing import Dict, Any
+from typing import Any, Dict, List
 
 
 class ConfigManager:
@@ -32,6 +32,22 @@ class ConfigManager:
         # デフォルト値の設定
         self.config.setdefault('rom_version', 'v0.0')
         self.config.setdefault('tester_name', '')
+        
+        self._check_template_targets()
+    
+    def _check_template_targets(self):
+        """
+        テンプレートの出力ファイルの重複確認
+        
+        Raises:
+            ValueError: 複数のテンプレートの出力ファイルが同じ場合（後から保存したものに上書きされるため）
+        """
+        seen = set()
+        for target in self.template_targets:
+            output_path = os.path.normpath(target["output_path"])
+            if os.path.normcase(output_path) in seen:
+                raise ValueError(f"複数のテンプレートの出力ファイルが同じです: {output_path}")
+            seen.add(os.path.normcase(output_path))
     
     def get(self, key: str, default=None):
         """
@@ -40,7 +56,7 @@ class ConfigManager:
         Args:
             key: 設定キー
             default: デフォルト値
-            
+        
         Returns:
             設定値
         """
@@ -68,8 +84,53 @@ class ConfigManager:
     
     @property
     def output_sheet(self) -> str:
-        """出力シート名"""
-        return self.config.get('output_sheet', 'テスト結果')
+        """出力シート名（複数のシートを指定した場合は先頭のシート）"""
+        return self.output_sheets[0]
+    
+    @property
+    def output_sheets(self) -> List[str]:
+        """出力シート名の一覧（output_sheet にはリストも指定可能）"""
+        return self._sheet_list(self.config.get('output_sheet', 'テスト結果'))
+    
+    @property
+    def template_targets(self) -> List[Dict[str, Any]]:
+        """
+        結果を記録するテンプレートの一覧
+        
+        templates が指定されている場合はその各要素、指定されていない場合は
+        template_file / output_file / output_sheet の1件。
+        
+        Returns:
+            {"template_path", "output_path", "sheet_names"} のリスト
+        """
+        templates = self.config.get('templates')
+        if not templates:
+            return [{"template_path": self.template_path, "output_path": self.output_path,
+                     "sheet_names": self.output_sheets}]
+        
+        targets = []
+        for entry in templates:
+            template_file = entry['template_file']
+            output_file = entry.get('output_file', template_file)
+            targets.append({
+                "template_path": os.path.join('template', template_file),
+                "output_path": os.path.join('output', output_file),
+                "sheet_names": self._sheet_list(entry.get('sheets', self.output_sheets)),
+            })
+        return targets
+    
+    @staticmethod
+    def _sheet_list(value) -> List[str]:
+        """
+        シート名の指定をリストに変換
+        
+        Args:
+            value: シート名またはシート名のリスト
+        
+        Returns:
+            シート名のリスト
+        """
+        return [value] if isinstance(value, str) else [str(name) for name in value]
     
     @property
     def rom_version(self) -> str:
@@ -80,3 +141,128 @@ class ConfigManager:
     def tester_name(self) -> str:
         """テスト実施者氏名"""
         return self.config.get('tester_name', '')
+    
+    @property
+    def report_streaming(self) -> bool:
+        """詳細レポートをストリーミングモード（書き込み専用ワークブック）で出力するか"""
+        return bool(self.config.get('report_streaming', False))
+    
+    @property
+    def result_journal(self) -> bool:
+        """テスト結果をジャーナル（JSON Lines）に逐次記録するか"""
+        return bool(self.config.get('result_journal', True))
+    
+    @property
+    def journal_fsync_interval(self) -> int:
+        """ジャーナルをディスクに同期する間隔（記録件数）"""
+        return int(self.config.get('journal_fsync_interval', 100))
+    
+    @property
+    def background_writer(self) -> bool:
+        """テンプレートへの結果書き込みをバックグラウンドスレッドで行うか"""
+        return bool(self.config.get('background_writer', False))
+    
+    @property
+    def writer_queue_size(self) -> int:
+        """バックグラウンド書き込みのキューの最大件数"""
+        return int(self.config.get('writer_queue_size', 1000))
+    
+    @property
+    def writer_overflow(self) -> str:
+        """キューが満杯の場合の動作 (block/drop)"""
+        return self.config.get('writer_overflow', 'block')
+    
+    @property
+    def writer_on_error(self) -> str:
+        """バックグラウンド書き込みエラー時の動作 (log/raise)"""
+        return self.config.get('writer_on_error', 'log')
+    
+    @property
+    def max_error_length(self) -> int:
+        """エラーメッセージ（トレースバック）を記録する最大文字数"""
+        return int(self.config.get('max_error_length', 32767))
+    
+    @property
+    def parallel_report(self) -> bool:
+        """セッション終了時、複数のワークブックをプロセスプールで並列に保存するか"""
+        return bool(self.config.get('parallel_report', False))
+    
+    @property
+    def report_split_categories(self) -> bool:
+        """詳細レポートとは別に、カテゴリ別のファイルを作成するか（parallel_report 有効時）"""
+        return bool(self.config.get('report_split_categories', False))
+    
+    @property
+    def result_export(self) -> str:
+        """テスト結果のエクスポート形式 (none/auto/parquet/csv/jsonl)"""
+        return str(self.config.get('result_export', 'none'))
+    
+    @property
+    def export_batch_size(self) -> int:
+        """エクスポートでまとめて書き出す件数"""
+        return int(self.config.get('export_batch_size', 10000))
+    
+    @property
+    def result_history(self) -> bool:
+        """テスト結果を履歴データベースに蓄積するか"""
+        return bool(self.config.get('result_history', False))
+    
+    @property
+    def history_path(self) -> str:
+        """テスト結果履歴データベースのパス"""
+        return os.path.join('output', self.config.get('history_file', 'test_history.db'))
+    
+    @property
+    def history_window(self) -> int:
+        """実行時間の悪化判定で比較する直前の実行数"""
+        return int(self.config.get('history_window', 10))
+    
+    @property
+    def regression_threshold(self) -> float:
+        """実行時間の悪化と判定する倍率（過去の中央値との比較）"""
+        return float(self.config.get('regression_threshold', 1.5))
+    
+    @property
+    def history_top_n(self) -> int:
+        """サマリーシートに表示する実行時間の上位・悪化テストの件数"""
+        return int(self.config.get('history_top_n', 10))
+    
+    @property
+    def reporter_overhead(self) -> bool:
+        """レポート処理（フック・結果の記録）の所要時間を計測し、ログと詳細レポートに出力するか"""
+        return bool(self.config.get('reporter_overhead', False))
+    
+    @property
+    def profile_top_n(self) -> int:
+        """--profile-tests 指定時に、テストごと・全体で Profile シートに表示する累積時間の上位の関数の数"""
+        return int(self.config.get('profile_top_n', 20))
+    
+    @property
+    def profile_max_tests(self) -> int:
+        """--profile-tests 指定時に、Profile シートにテストごとの上位の関数を表示するテストの数（実行時間の長い順）"""
+        return int(self.config.get('profile_max_tests', 50))
+    
+    @property
+    def template_buffered_writes(self) -> bool:
+        """テスト結果を保存時に行番号順にまとめてテンプレートに反映するか"""
+        return bool(self.config.get('template_buffered_writes', True))
+    
+    @property
+    def lazy_template_load(self) -> bool:
+        """起動時はテスト番号のみを読み取り専用で読み込み、ワークブック全体の読み込みを遅延するか"""
+        return bool(self.config.get('lazy_template_load', True))
+    
+    @property
+    def template_patch_mode(self) -> bool:
+        """結果ファイルの保存時、変更セルのみをXMLで直接書き換えるか"""
+        return bool(self.config.get('template_patch_mode', False))
+    
+    @property
+    def log_queue(self) -> bool:
+        """ログの出力を専用スレッドで行うか（テスト実行スレッドはキューへの登録のみ）"""
+        return bool(self.config.get('log_queue', False))
+    
+    @property
+    def log_flush_interval(self) -> int:
+        """log_queue 有効時、ログファイルへまとめて書き出す件数"""
+        return int(self.config.get('log_flush_interval', 100))
@@ -5,10 +5,13 @@
 import os
 import shutil
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from openpyxl import load_workbook
-from openpyxl.styles import Font, PatternFill
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
 import logging
+from .background_writer import BackgroundWriter, OVERFLOW_BLOCK, ERROR_LOG
+from .excel_styles import StyleRegistry, CELL_STYLES
+from .xlsx_patcher import CellPatches, patch_sheets
 
 logger = logging.getLogger("pytest_logger")
 
@@ -16,29 +19,132 @@ logger = logging.getLogger("pytest_logger")
 HEADER_ROW = 3
 FIRST_DATA_ROW = 4
 
+# 同じテスト番号の複数の結果を集約する場合の優先順位（値の大きいものを記録する）
+RESULT_PRIORITY = {"OK": 0, "SKIP": 1, "NG": 2}
+
+# テスト結果補足に列挙するエラー情報の最大件数（重複を除く）
+MAX_NOTE_ERRORS = 10
+
+# Excelの1セルに格納できる最大文字数
+CELL_MAX_LENGTH = 32767
+
+
+class ResultAggregate:
+    """
+    同じテスト番号（テンプレートの同じ行）に記録する複数のテスト結果の集約
+    
+    パラメータ化されたテストや、同じテスト番号を指定した複数のテスト関数の結果を、
+    NG > SKIP > OK の優先順位で1つのテスト結果にまとめる。
+    """
+    
+    __slots__ = ("result_text", "count", "counts", "errors", "errors_omitted")
+    
+    def __init__(self):
+        """初期化"""
+        self.result_text: Optional[str] = None
+        self.count = 0
+        # テスト結果 (OK/NG/SKIP) -> 件数
+        self.counts: Dict[str, int] = dict.fromkeys(RESULT_PRIORITY, 0)
+        # NGのエラー情報（重複を除き、記録順を保持するため dict のキーとして保持）
+        self.errors: Dict[str, None] = {}
+        self.errors_omitted = False
+    
+    def add(self, result_text: str, error_info: Optional[str] = None):
+        """
+        テスト結果の追加
+        
+        Args:
+            result_text: テスト結果 (OK/NG/SKIP)
+            error_info: エラー情報（NGの場合）
+        """
+        self.count += 1
+        self.counts[result_text] += 1
+        if self.result_text is None or RESULT_PRIORITY[result_text] > RESULT_PRIORITY[self.result_text]:
+            self.result_text = result_text
+        if error_info and error_info not in self.errors:
+            if len(self.errors) < MAX_NOTE_ERRORS:
+                self.errors[error_info] = None
+            else:
+                self.errors_omitted = True
+    
+    @property
+    def note(self) -> Optional[str]:
+        """
+        テスト結果補足
+        
+        結果が1件の場合はエラー情報（NGの場合のみ、それ以外はNone）。
+        複数の場合は件数の内訳とNGのエラー情報の一覧。
+        いずれもExcelの1セルに格納できる文字数で切り詰める。
+        """
+        if self.count == 1:
+            error_info = next(iter(self.errors), None)
+            return error_info[:CELL_MAX_LENGTH] if error_info is not None else None
+        lines = [f"{self.count}件の結果を集約（OK {self.counts['OK']}件, NG {self.counts['NG']}件, "
+                 f"SKIP {self.counts['SKIP']}件）"]
+        lines.extend(self.errors)
+        if self.errors_omitted:
+            lines.append("（以降のエラー情報は省略）")
+        return "\n".join(lines)[:CELL_MAX_LENGTH]
+
 
 class ExcelManager:
     """テンプレートベースExcel管理クラス"""
     
     def __init__(self, template_path: str, output_path: str, 
-                 sheet_name: str, rom_version: str, tester_name: str):
+                 sheet_name: Union[str, Sequence[str]], rom_version: str, tester_name: str,
+                 patch_mode: bool = False, buffered: bool = True):
         """
         初期化
         
         Args:
             template_path: テンプレートファイルのパス
             output_path: 出力ファイルのパス
-            sheet_name: 出力シート名
+            sheet_name: 出力シート名（複数のシートにテストケースがある場合はシート名のリスト）
             rom_version: ターゲットROMバージョン
             tester_name: テスト実施者氏名
+            patch_mode: Trueの場合、openpyxl でワークブックを読み書きせず、
+                        保存時にシートXMLの変更セルのみを直接書き換える
+                        （openpyxl 非対応の機能を含むテンプレートもそのまま維持される）
+            buffered: Trueの場合、write_test_result では書き込む内容を記録するのみとし、
+                      保存時（または apply_pending_results 呼び出し時）に行番号順にまとめてシートに反映する
+        
+        同じテスト番号の結果が複数ある場合は、セッション中の全ての結果を集約して記録する（ResultAggregate）。
         """
         self.template_path = template_path
         self.output_path = output_path
-        self.sheet_name = sheet_name
+        self.sheet_names: List[str] = [sheet_name] if isinstance(sheet_name, str) else list(sheet_name)
+        if not self.sheet_names:
+            raise ValueError("出力シートが指定されていません")
+        # 先頭のシート（単一シートの場合の互換用）
+        self.sheet_name = self.sheet_names[0]
         self.rom_version = rom_version
         self.tester_name = tester_name
+        self.patch_mode = patch_mode
+        self.buffered = buffered
+        # 集約したテスト結果: (シート名, 行番号) -> ResultAggregate
+        self._aggregates: Dict[Tuple[str, int], ResultAggregate] = {}
+        # シートへの反映待ちの行: (シート名, 行番号)
+        self._pending_rows: set = set()
+        # テスト実施日付（セッション中は同じ値を使用する。open_workbook時に決定）
+        self._test_date: Optional[str] = None
+        # パッチモード用: シート名 -> 書き換えるセル (行, 列) -> (値, 塗りつぶし)
+        self._patches: Dict[str, CellPatches] = {}
         self.workbook = None
         self.worksheet = None
+        # シート名 -> シート（ワークブック読み込み後）
+        self.worksheets: Dict[str, object] = {}
+        # セルスタイルのキャッシュ
+        self._styles = StyleRegistry()
+        # バックグラウンド書き込み（start_background_writer で有効化）
+        self._writer: Optional[BackgroundWriter] = None
+        # テスト番号 -> (シート名, 行番号) のインデックス（open_workbook時に構築）
+        self._row_index: Dict[str, Tuple[str, int]] = {}
+        # テンプレート内で重複しているテスト番号 -> 該当する (シート名, 行番号) の一覧
+        self.duplicate_ids: Dict[str, List[Tuple[str, int]]] = {}
+        # open_workbook済みか（遅延読み込みの場合、workbook は最初の書き込みまでNone）
+        self._opened = False
+        # 遅延読み込み時、ワークブック読み込み後にテスト諸情報を書き込むか
+        self._pending_test_info = False
     
     def prepare_output_file(self):
         """出力ファイルの準備（テンプレートのコピー）"""
@@ -57,29 +163,199 @@ class ExcelManager:
         else:
             logger.info(f"既存の出力ファイルを使用します: {self.output_path}")
     
-    def open_workbook(self):
-        """ワークブックを開く"""
+    def open_workbook(self, lazy: bool = False):
+        """
+        ワークブックを開く
+        
+        Args:
+            lazy: Trueの場合、読み取り専用モードで結果シートのA列のみを読み込んで
+                  テスト番号インデックスを構築し、ワークブック全体の読み込みは
+                  最初の書き込み（または保存）まで遅延する
+        """
         if not os.path.exists(self.output_path):
             raise FileNotFoundError(f"出力ファイルが見つかりません: {self.output_path}")
+        self._test_date = self._format_test_date()
         
+        # パッチモードではワークブック全体を読み込まない
+        if lazy or self.patch_mode:
+            workbook = load_workbook(self.output_path, read_only=True)
+            try:
+                self._check_sheets(workbook.sheetnames)
+                self._build_index({sheet_name: workbook[sheet_name] for sheet_name in self.sheet_names})
+            finally:
+                workbook.close()
+            self._opened = True
+            logger.info(f"テスト番号インデックスを読み取り専用で構築しました（ワークブックの読み込みは遅延）: "
+                        f"{', '.join(self.sheet_names)}")
+            return
+        
+        self._load_workbook()
+        self._opened = True
+        
+        # テスト番号インデックスの構築
+        self.build_index()
+    
+    def _load_workbook(self):
+        """ワークブック全体の読み込み"""
         self.workbook = load_workbook(self.output_path)
+        # スタイルIDはワークブックごとに異なるため、キャッシュを作り直す
+        self._styles = StyleRegistry()
         
-        # シートの取得または作成
-        if self.sheet_name in self.workbook.sheetnames:
-            self.worksheet = self.workbook[self.sheet_name]
-            logger.info(f"既存のシートを使用します: {self.sheet_name}")
-        else:
-            # シートが存在しない場合はエラー（テンプレートに含まれているべき）
-            raise ValueError(f"シート '{self.sheet_name}' がテンプレートに存在しません")
+        # シートの取得（シートが存在しない場合はエラー。テンプレートに含まれているべき）
+        self._check_sheets(self.workbook.sheetnames)
+        self.worksheets = {sheet_name: self.workbook[sheet_name] for sheet_name in self.sheet_names}
+        self.worksheet = self.worksheets[self.sheet_name]
+        logger.info(f"既存のシートを使用します: {', '.join(self.sheet_names)}")
+    
+    def _check_sheets(self, sheetnames: Sequence[str]):
+        """
+        出力シートがワークブックに存在するかの確認
+        
+        Args:
+            sheetnames: ワークブックのシート名の一覧
+        """
+        missing = [sheet_name for sheet_name in self.sheet_names if sheet_name not in sheetnames]
+        if missing:
+            raise ValueError(f"シート '{', '.join(missing)}' がテンプレートに存在しません")
+    
+    def _ensure_loaded(self):
+        """遅延読み込みの場合、ワークブック全体を読み込む"""
+        if self.workbook is not None:
+            return
+        if not self._opened:
+            raise RuntimeError("ワークブックが開かれていません")
+        
+        self._load_workbook()
+        if self._pending_test_info:
+            self._pending_test_info = False
+            self._write_test_info()
+    
+    def build_index(self):
+        """
+        テスト番号 -> 行番号 のインデックスを構築
+        
+        各シートのA列を1回だけ走査する。テスト番号が重複している場合は
+        最初に出現した行（シートは sheet_names の順）を採用し、重複は duplicate_ids に記録する。
+        A列（テスト番号）を変更した場合は再度呼び出すこと。
+        """
+        self._build_index(self.worksheets)
+    
+    def _build_index(self, worksheets: Dict[str, object]):
+        """
+        各シートのA列の値からテスト番号インデックスを構築
+        
+        Args:
+            worksheets: シート名 -> シート（sheet_names の順）
+        """
+        self._row_index = {}
+        self.duplicate_ids = {}
+        for sheet_name, worksheet in worksheets.items():
+            rows = worksheet.iter_rows(min_row=FIRST_DATA_ROW, max_col=1, values_only=True)
+            for row, (cell_value,) in enumerate(rows, start=FIRST_DATA_ROW):
+                if not cell_value:
+                    continue
+                key = str(cell_value).strip()
+                if key in self._row_index:
+                    self.duplicate_ids.setdefault(key, [self._row_index[key]]).append((sheet_name, row))
+                else:
+                    self._row_index[key] = (sheet_name, row)
+        
+        for test_id, locations in self.duplicate_ids.items():
+            text = ", ".join(f"{sheet_name}!行{row}" for sheet_name, row in locations)
+            logger.warning(f"テスト番号 '{test_id}' がテンプレート内で重複しています（{text}）。"
+                           f"{locations[0][0]}!行{locations[0][1]}に記録します。")
+        logger.info(f"テスト番号インデックスを構築しました: {len(self._row_index)}件")
+    
+    def update_index(self, test_id: str, row: int, sheet_name: Optional[str] = None):
+        """
+        インデックスへのテスト番号の登録・更新
+        
+        Args:
+            test_id: テスト番号
+            row: 行番号
+            sheet_name: シート名（省略時は先頭のシート）
+        """
+        self._row_index[str(test_id).strip()] = (sheet_name or self.sheet_name, row)
+    
+    def test_ids(self) -> Iterable[str]:
+        """
+        インデックスに登録されているテスト番号
+        
+        Returns:
+            テスト番号の一覧
+        """
+        return self._row_index.keys()
+    
+    def check_test_ids(self, test_ids: Iterable[str]) -> List[str]:
+        """
+        テンプレートに存在しないテスト番号の確認
+        
+        Args:
+            test_ids: テストスクリプトで使用されているテスト番号
+        
+        Returns:
+            テンプレートに見つからないテスト番号のリスト（ソート済み）
+        """
+        missing = sorted({str(test_id).strip() for test_id in test_ids} - self._row_index.keys())
+        for test_id in missing:
+            logger.warning(f"テスト番号 '{test_id}' がテンプレートに見つかりません。このテストの結果は記録されません。")
+        return missing
+    
+    def read_recorded_results(self) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        出力ファイルに記録済みのテスト結果の読み込み
+        
+        保存前の出力ファイルを読み取り専用で開き、先頭のシートのB1（記録時のROMバージョン）と
+        各シートのG列（テスト結果）を読み込む。テスト番号との対応にはインデックスを使用する。
+        
+        Returns:
+            (記録時のROMバージョン, テスト番号 -> テスト結果 (OK/NG/SKIP)、未実施のテストは含まない)
+        """
+        if not self._opened:
+            raise RuntimeError("ワークブックが開かれていません")
+        
+        workbook = load_workbook(self.output_path, read_only=True)
+        try:
+            (recorded_version,), = workbook[self.sheet_name].iter_rows(min_row=1, max_row=1, min_col=2,
+                                                                       max_col=2, values_only=True)
+            results_by_cell = {}
+            for sheet_name in self.sheet_names:
+                rows = workbook[sheet_name].iter_rows(min_row=FIRST_DATA_ROW, min_col=7, max_col=7,
+                                                      values_only=True)
+                for row, (value,) in enumerate(rows, start=FIRST_DATA_ROW):
+                    if value:
+                        results_by_cell[(sheet_name, row)] = str(value).strip()
+        finally:
+            workbook.close()
+        
+        results = {test_id: results_by_cell[location]
+                   for test_id, location in self._row_index.items() if location in results_by_cell}
+        return (str(recorded_version).strip() if recorded_version is not None else None), results
     
     def write_test_info(self):
         """テスト諸情報の書き込み"""
-        if not self.worksheet:
+        if not self._opened:
             raise RuntimeError("ワークブックが開かれていません")
         
-        # 1行目にROMバージョンを記載（B1セルに書き込む）
+        if self.patch_mode:
+            for sheet_name in self.sheet_names:
+                self._patches.setdefault(sheet_name, {})[(1, 2)] = (self.rom_version, None)
+            logger.info(f"ROMバージョンを記載しました: {self.rom_version}")
+            return
+        
+        # 遅延読み込みの場合は、ワークブック読み込み時に書き込む
+        if self.workbook is None:
+            self._pending_test_info = True
+            return
+        
+        self._write_test_info()
+    
+    def _write_test_info(self):
+        """テスト諸情報のセルへの書き込み"""
+        # 各シートの1行目にROMバージョンを記載（B1セルに書き込む）
         # A1には "ターゲットROMバージョン:" というラベルが既に記載されていると仮定
-        self.worksheet['B1'] = self.rom_version
+        for worksheet in self.worksheets.values():
+            worksheet['B1'] = self.rom_version
         logger.info(f"ROMバージョンを記載しました: {self.rom_version}")
     
     def find_test_row(self, test_id: str) -> Optional[int]:
@@ -88,20 +364,41 @@ class ExcelManager:
         
         Args:
             test_id: テスト番号
-            
+        
         Returns:
             行番号（見つからない場合はNone）
         """
-        if not self.worksheet:
+        location = self.find_test_location(test_id)
+        return location[1] if location else None
+    
+    def find_test_location(self, test_id: str) -> Optional[Tuple[str, int]]:
+        """
+        テスト番号からテスト行のシートと行番号を検索
+        
+        Args:
+            test_id: テスト番号
+        
+        Returns:
+            (シート名, 行番号)（見つからない場合はNone）
+        """
+        if not self._opened:
             return None
         
-        # FIRST_DATA_ROW以降でテスト番号列（A列）を検索
-        for row in range(FIRST_DATA_ROW, self.worksheet.max_row + 1):
-            cell_value = self.worksheet.cell(row=row, column=1).value
-            if cell_value and str(cell_value).strip() == str(test_id).strip():
-                return row
+        return self._row_index.get(str(test_id).strip())
+    
+    def find_test_workbook_location(self, test_id: str) -> Optional[Tuple[str, str, int]]:
+        """
+        テスト番号からテスト行のワークブック・シート・行番号を検索
+        （ExcelManagerGroup と同じ形式。create_excel_manager の戻り値に対してはこちらを使用する）
         
-        return None
+        Args:
+            test_id: テスト番号
+        
+        Returns:
+            (出力ファイルのパス, シート名, 行番号)（見つからない場合はNone）
+        """
+        location = self.find_test_location(test_id)
+        return (self.output_path,) + location if location else None
     
     def _format_test_date(self) -> str:
         """
@@ -114,6 +411,37 @@ class ExcelManager:
         # 月/日形式で、先頭のゼロを削除
         return f"{now.month}/{now.day}"
     
+    def start_background_writer(self, queue_size: int = 1000,
+                                overflow: str = OVERFLOW_BLOCK, on_error: str = ERROR_LOG):
+        """
+        バックグラウンド書き込みの開始
+        
+        以降の write_test_result はキューに登録するのみとなり、
+        セルへの書き込みは専用スレッドで行われる。
+        
+        Args:
+            queue_size: キューの最大件数
+            overflow: キューが満杯の場合の動作 (block/drop)
+            on_error: 書き込みエラー時の動作 (log/raise)
+        """
+        self._writer = BackgroundWriter(self._write_test_result, queue_size=queue_size,
+                                        overflow=overflow, on_error=on_error)
+        self._writer.start()
+        logger.info(f"バックグラウンド書き込みを開始しました（キュー{queue_size}件、"
+                    f"満杯時: {overflow}、エラー時: {on_error}）")
+    
+    def join_background_writer(self):
+        """
+        バックグラウンド書き込みの完了待ち
+        
+        Raises:
+            Exception: on_error が raise で、書き込みエラーが発生していた場合
+        """
+        if self._writer:
+            writer = self._writer
+            self._writer = None
+            writer.join()
+    
     def write_test_result(self, test_id: str, status: str, error_info: str = ""):
         """
         テスト結果の書き込み
@@ -123,43 +451,151 @@ class ExcelManager:
             status: テスト結果 (passed/failed/skipped)
             error_info: エラー情報（NGの場合）
         """
-        if not self.worksheet:
+        if not self._opened:
             raise RuntimeError("ワークブックが開かれていません")
         
-        row = self.find_test_row(test_id)
-        if row is None:
-            logger.warning(f"テスト番号 '{test_id}' がテンプレートに見つかりません。スキップします。")
+        if self._writer:
+            self._writer.submit(test_id, status, error_info)
+            return
+        
+        self._write_test_result(test_id, status, error_info)
+    
+    def _write_test_result(self, test_id: str, status: str, error_info: str = ""):
+        """
+        テスト結果のセルへの書き込み
+        
+        Args:
+            test_id: テスト番号
+            status: テスト結果 (passed/failed/skipped)
+            error_info: エラー情報（NGの場合）
+        """
+        location = self.find_test_location(test_id)
+        if location is None:
+            logger.warning("テスト番号 '%s' がテンプレートに見つかりません。スキップします。", test_id)
+            return
+        sheet_name, row = location
+        
+        result_text = "OK" if status == "passed" else "NG" if status == "failed" else "SKIP"
+        
+        # 同じ行の結果を集約（後の結果で先のNGが上書きされないようにする）
+        aggregate = self._aggregates.get(location)
+        if aggregate is None:
+            aggregate = self._aggregates[location] = ResultAggregate()
+        aggregate.add(result_text, error_info if status == "failed" else None)
+        
+        if self.buffered and not self.patch_mode:
+            # 保存時にまとめて反映する（同じ行は1回だけ書き込む）
+            self._pending_rows.add(location)
+            logger.info("テスト結果を記録しました: %s -> %s (%s 行%d)", test_id, result_text, sheet_name, row)
             return
         
+        test_date = self._test_date or self._format_test_date()
+        note = aggregate.note
+        
+        if self.patch_mode:
+            # 保存時にまとめて書き換える
+            fill = None
+            if aggregate.result_text == "OK":
+                fill = CELL_STYLES["result_passed"]["fill"]
+            elif aggregate.result_text == "NG":
+                fill = CELL_STYLES["result_failed"]["fill"]
+            patches = self._patches.setdefault(sheet_name, {})
+            patches[(row, 6)] = (test_date, None)
+            patches[(row, 7)] = (aggregate.result_text, fill)
+            if note is not None:
+                patches[(row, 8)] = (note, None)
+            logger.info("テスト結果を記録しました: %s -> %s (%s 行%d)", test_id, result_text, sheet_name, row)
+            return
+        
+        self._ensure_loaded()
+        self._apply_result(self.worksheets[sheet_name], row, test_date, aggregate.result_text, note)
+        logger.info("テスト結果を記録しました: %s -> %s (%s 行%d)", test_id, result_text, sheet_name, row)
+    
+    def _apply_result(self, worksheet, row: int, test_date: str, result_text: str, note: Optional[str]):
+        """
+        テスト結果の1行分のセルへの書き込み
+        
+        Args:
+            worksheet: 書き込み先のシート
+            row: 行番号
+            test_date: テスト実施日付
+            result_text: テスト結果 (OK/NG/SKIP)
+            note: テスト結果補足（Noneの場合は書き込まない）
+        """
         # テスト実施日付を記入（F列）
-        test_date = self._format_test_date()
-        self.worksheet.cell(row=row, column=6, value=test_date)
+        worksheet.cell(row=row, column=6, value=test_date)
         
         # テスト結果を記入（G列）
-        result_text = "OK" if status == "passed" else "NG" if status == "failed" else "SKIP"
-        result_cell = self.worksheet.cell(row=row, column=7, value=result_text)
+        result_cell = worksheet.cell(row=row, column=7, value=result_text)
         
         # 結果に応じた色付け
-        if status == "passed":
-            result_cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-        elif status == "failed":
-            result_cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+        if result_text == "OK":
+            self._styles.apply(result_cell, "result_passed")
+        elif result_text == "NG":
+            self._styles.apply(result_cell, "result_failed")
+        
+        # テスト結果補足を記入（H列、NGの場合のみ。Excelに格納できない制御文字は除去する）
+        if note is not None:
+            worksheet.cell(row=row, column=8, value=ILLEGAL_CHARACTERS_RE.sub("", note))
+    
+    def apply_pending_results(self) -> int:
+        """
+        反映待ちのテスト結果をシートにまとめて反映
         
-        # テスト結果補足を記入（H列、NGの場合のみ）
-        if status == "failed" and error_info:
-            self.worksheet.cell(row=row, column=8, value=error_info)
+        シート・行番号の順に並べ替えて1回の走査で書き込む（同じ行の複数の結果は集約済みのものを1回だけ書き込む）。
+        書き込みに失敗した行はログに出力して残りの行の反映を続ける（1件の失敗で保存できなくならないようにする）。
+        保存時に自動で呼び出されるが、途中経過を保存する場合にも使用できる。
         
-        logger.info(f"テスト結果を記録しました: {test_id} -> {result_text} (行{row})")
+        Returns:
+            反映した行数
+        """
+        if not self._pending_rows:
+            return 0
+        self._ensure_loaded()
+        pending, self._pending_rows = self._pending_rows, set()
+        test_date = self._test_date or self._format_test_date()
+        apply_result = self._apply_result
+        aggregates = self._aggregates
+        sheet_order = {sheet_name: i for i, sheet_name in enumerate(self.sheet_names)}
+        applied = 0
+        for location in sorted(pending, key=lambda location: (sheet_order[location[0]], location[1])):
+            aggregate = aggregates[location]
+            try:
+                apply_result(self.worksheets[location[0]], location[1], test_date, aggregate.result_text,
+                             aggregate.note)
+                applied += 1
+            except Exception as e:
+                logger.error(f"テスト結果を反映できませんでした: {location[0]} 行{location[1]}: {e}")
+        logger.info(f"テスト結果をまとめて反映しました: {applied}行")
+        return applied
     
     def save(self):
         """ワークブックの保存"""
-        if self.workbook:
+        # 未処理のバックグラウンド書き込みを反映してから保存する
+        self.join_background_writer()
+        if self._opened and self.patch_mode:
+            if self._patches:
+                patch_sheets(self.output_path, self._patches)
+            self._patches = {}
+            logger.info(f"テスト結果を保存しました: {self.output_path}")
+        elif self._opened:
+            self._ensure_loaded()
+            self.apply_pending_results()
             self.workbook.save(self.output_path)
             logger.info(f"テスト結果を保存しました: {self.output_path}")
     
     def close(self):
         """ワークブックを閉じる"""
+        self.join_background_writer()
         if self.workbook:
             self.workbook.close()
             self.workbook = None
             self.worksheet = None
+            self.worksheets = {}
+        self._opened = False
+        self._pending_test_info = False
+        self._patches = {}
+        self._aggregates = {}
+        self._pending_rows = set()
+        self._row_index = {}
+        self.duplicate_ids = {}
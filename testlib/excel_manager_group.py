@@ -0,0 +1,285 @@
+"""
+複数テンプレート管理モジュール
+テスト仕様書がサブシステムごとに複数のワークブックに分かれている場合に、
+全ワークブックのテスト番号インデックスを起動時に1回だけ構築し、結果を該当するワークブックに振り分ける
+"""
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import logging
+from .background_writer import OVERFLOW_BLOCK, ERROR_LOG
+from .excel_manager import ExcelManager
+
+logger = logging.getLogger("pytest_logger")
+
+
+class ExcelManagerGroup:
+    """
+    複数のテンプレートベースExcelの管理クラス
+    
+    以下は ExcelManager と同じ引数・戻り値で、conftest からは区別せずに使用できる
+    （create_excel_manager の戻り値に対して使用してよいのはこれらのみ）:
+    output_path, rom_version, prepare_output_file, open_workbook, build_index, test_ids,
+    check_test_ids, read_recorded_results, write_test_info, start_background_writer,
+    join_background_writer, write_test_result, apply_pending_results,
+    find_test_workbook_location, save, close
+    
+    単一のワークブック内の位置を扱う find_test_location / find_test_row / update_index は
+    ExcelManager のみが持つ。duplicate_ids の値の形式も異なる（こちらは出力ファイルのパスのリスト）。
+    各ワークブックの読み込み・保存は、それぞれの ExcelManager で1回のみ行う。
+    """
+    
+    def __init__(self, managers: List[ExcelManager]):
+        """
+        初期化
+        
+        Args:
+            managers: ワークブックごとの ExcelManager（テスト番号が重複する場合は先のものを優先）
+        """
+        if not managers:
+            raise ValueError("テンプレートが指定されていません")
+        self.managers = managers
+        self.rom_version = managers[0].rom_version
+        # テスト番号 -> 記録先の ExcelManager（open_workbook時に構築）
+        self._targets: Dict[str, ExcelManager] = {}
+        # 複数のワークブックに存在するテスト番号 -> 該当するワークブックの出力ファイルのパス
+        self.duplicate_ids: Dict[str, List[str]] = {}
+    
+    @property
+    def output_path(self) -> str:
+        """出力ファイルのパス（ログ表示用。複数の場合はカンマ区切り）"""
+        return ", ".join(manager.output_path for manager in self.managers)
+    
+    def prepare_output_file(self):
+        """出力ファイルの準備（テンプレートのコピー）"""
+        for manager in self.managers:
+            manager.prepare_output_file()
+    
+    def open_workbook(self, lazy: bool = False):
+        """
+        全てのワークブックを開き、テスト番号インデックスを構築
+        
+        Args:
+            lazy: Trueの場合、各ワークブックの読み込みを最初の書き込みまで遅延する
+        """
+        for manager in self.managers:
+            manager.open_workbook(lazy=lazy)
+        self.build_index()
+    
+    def build_index(self):
+        """テスト番号 -> 記録先のワークブック のインデックスを構築"""
+        self._targets = {}
+        self.duplicate_ids = {}
+        for manager in self.managers:
+            for test_id in manager.test_ids():
+                target = self._targets.get(test_id)
+                if target is None:
+                    self._targets[test_id] = manager
+                else:
+                    self.duplicate_ids.setdefault(test_id, [target.output_path]).append(manager.output_path)
+        
+        for test_id, paths in self.duplicate_ids.items():
+            logger.warning(f"テスト番号 '{test_id}' が複数のテンプレートに存在します（{', '.join(paths)}）。"
+                           f"{paths[0]} に記録します。")
+        logger.info(f"テスト番号インデックスを構築しました: {len(self._targets)}件"
+                    f"（{len(self.managers)}ファイル）")
+    
+    def find_target(self, test_id: str) -> Optional[ExcelManager]:
+        """
+        テスト番号の記録先のワークブックを検索
+        
+        Args:
+            test_id: テスト番号
+        
+        Returns:
+            記録先の ExcelManager（見つからない場合はNone）
+        """
+        return self._targets.get(str(test_id).strip())
+    
+    def find_test_workbook_location(self, test_id: str) -> Optional[Tuple[str, str, int]]:
+        """
+        テスト番号からテスト行のワークブック・シート・行番号を検索
+        
+        Args:
+            test_id: テスト番号
+        
+        Returns:
+            (出力ファイルのパス, シート名, 行番号)（見つからない場合はNone）
+        """
+        manager = self.find_target(test_id)
+        if manager is None:
+            return None
+        return manager.find_test_workbook_location(test_id)
+    
+    def test_ids(self) -> Iterable[str]:
+        """
+        インデックスに登録されているテスト番号
+        
+        Returns:
+            テスト番号の一覧
+        """
+        return self._targets.keys()
+    
+    def check_test_ids(self, test_ids: Iterable[str]) -> List[str]:
+        """
+        どのテンプレートにも存在しないテスト番号の確認
+        
+        Args:
+            test_ids: テストスクリプトで使用されているテスト番号
+        
+        Returns:
+            テンプレートに見つからないテスト番号のリスト（ソート済み）
+        """
+        missing = sorted({str(test_id).strip() for test_id in test_ids} - self._targets.keys())
+        for test_id in missing:
+            logger.warning(f"テスト番号 '{test_id}' がテンプレートに見つかりません。このテストの結果は記録されません。")
+        return missing
+    
+    def read_recorded_results(self) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        全ての出力ファイルに記録済みのテスト結果の読み込み
+        
+        ROMバージョンはワークブックごとに確認し、現在のROMバージョンと異なるワークブックの
+        テスト結果は未実施とみなす（含めない）。
+        
+        Returns:
+            (現在のROMバージョン, テスト番号 -> テスト結果 (OK/NG/SKIP)、未実施のテストは含まない)
+        """
+        results = {}
+        for manager in self.managers:
+            recorded_version, manager_results = manager.read_recorded_results()
+            if recorded_version != manager.rom_version:
+                logger.info(f"結果ファイルのROMバージョン（{recorded_version}）が異なるため、"
+                            f"{manager.output_path} のテストを未実施とみなします")
+                continue
+            results.update((test_id, result) for test_id, result in manager_results.items()
+                           if self._targets.get(test_id) is manager)
+        return self.rom_version, results
+    
+    def write_test_info(self):
+        """テスト諸情報の書き込み"""
+        for manager in self.managers:
+            manager.write_test_info()
+    
+    def start_background_writer(self, queue_size: int = 1000,
+                                overflow: str = OVERFLOW_BLOCK, on_error: str = ERROR_LOG):
+        """
+        バックグラウンド書き込みの開始（ワークブックごとに書き込みスレッドを作成）
+        
+        Args:
+            queue_size: キューの最大件数（ワークブックごと）
+            overflow: キューが満杯の場合の動作 (block/drop)
+            on_error: 書き込みエラー時の動作 (log/raise)
+        """
+        for manager in self.managers:
+            manager.start_background_writer(queue_size=queue_size, overflow=overflow, on_error=on_error)
+    
+    def join_background_writer(self):
+        """
+        全てのバックグラウンド書き込みの完了待ち
+        
+        Raises:
+            Exception: on_error が raise で、いずれかの書き込みでエラーが発生していた場合
+                       （全ての書き込みスレッドの終了を待ってから、最初のエラーを送出する）
+        """
+        error = None
+        for manager in self.managers:
+            try:
+                manager.join_background_writer()
+            except Exception as e:
+                error = error or e
+        if error:
+            raise error
+    
+    def write_test_result(self, test_id: str, status: str, error_info: str = ""):
+        """
+        テスト結果を該当するワークブックに書き込む
+        
+        Args:
+            test_id: テスト番号
+            status: テスト結果 (passed/failed/skipped)
+            error_info: エラー情報（NGの場合）
+        """
+        manager = self.find_target(test_id)
+        if manager is None:
+            logger.warning("テスト番号 '%s' がテンプレートに見つかりません。スキップします。", test_id)
+            return
+        manager.write_test_result(test_id, status, error_info)
+    
+    def apply_pending_results(self) -> int:
+        """
+        全てのワークブックの反映待ちのテスト結果をシートに反映
+        
+        Returns:
+            反映した行数
+        """
+        return sum(manager.apply_pending_results() for manager in self.managers)
+    
+    def save(self):
+        """
+        全てのワークブックの保存
+        
+        Raises:
+            Exception: いずれかのワークブックの保存に失敗した場合
+                       （残りのワークブックも保存してから、最初のエラーを送出する）
+        """
+        error = None
+        for manager in self.managers:
+            try:
+                manager.save()
+            except Exception as e:
+                logger.error(f"テスト結果を保存できませんでした: {manager.output_path}: {e}")
+                error = error or e
+        if error:
+            raise error
+    
+    def close(self):
+        """
+        全てのワークブックを閉じる
+        
+        Raises:
+            Exception: いずれかのワークブックを閉じる際にエラーが発生した場合
+                       （残りのワークブックも閉じてから、最初のエラーを送出する）
+        """
+        error = None
+        for manager in self.managers:
+            try:
+                manager.close()
+            except Exception as e:
+                logger.error(f"ワークブックを閉じられませんでした: {manager.output_path}: {e}")
+                error = error or e
+        self._targets = {}
+        self.duplicate_ids = {}
+        if error:
+            raise error
+
+
+def create_excel_manager(targets: List[Dict], rom_version: str, tester_name: str,
+                         patch_mode: bool = False, buffered: bool = True) -> Union[ExcelManager, ExcelManagerGroup]:
+    """
+    記録先のテンプレートに応じた Excel マネージャーの作成
+    
+    Args:
+        targets: テンプレートごとの {"template_path", "output_path", "sheet_names"}
+                 （ConfigManager.template_targets）
+        rom_version: ターゲットROMバージョン
+        tester_name: テスト実施者氏名
+        patch_mode: パッチモードで書き込むか
+        buffered: 結果を保存時にまとめてシートに反映するか
+    
+    Returns:
+        テンプレートが1つの場合は ExcelManager、複数の場合は ExcelManagerGroup
+    """
+    managers = [
+        ExcelManager(
+            template_path=target["template_path"],
+            output_path=target["output_path"],
+            sheet_name=target["sheet_names"],
+            rom_version=rom_version,
+            tester_name=tester_name,
+            patch_mode=patch_mode,
+            buffered=buffered
+        )
+        for target in targets
+    ]
+    if len(managers) == 1:
+        return managers[0]
+    return ExcelManagerGroup(managers)
@@ -0,0 +1,104 @@
+"""
+Excelスタイル管理モジュール
+excel_reporter と ExcelManager で共有するセルスタイルを一元管理する
+"""
+from copy import copy
+from typing import Any, Dict, Tuple
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+# 共有スタイルオブジェクト（セルごとに生成しない）
+THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+HEADER_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_ALIGNMENT = Alignment(horizontal="center")
+TITLE_FONT = Font(bold=True, size=14)
+PASSED_FILL = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+FAILED_FILL = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+SKIPPED_FILL = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
+
+# スタイル名 -> セルに設定する属性
+CELL_STYLES: Dict[str, Dict[str, Any]] = {
+    # 詳細レポート用
+    "header": {"fill": HEADER_FILL, "font": HEADER_FONT, "alignment": HEADER_ALIGNMENT, "border": THIN_BORDER},
+    "title": {"font": TITLE_FONT},
+    "body": {"border": THIN_BORDER},
+    "passed": {"border": THIN_BORDER, "fill": PASSED_FILL},
+    "failed": {"border": THIN_BORDER, "fill": FAILED_FILL},
+    "skipped": {"border": THIN_BORDER, "fill": SKIPPED_FILL},
+    # テンプレートの結果セル用（既存の罫線・フォントは維持し、塗りつぶしのみ設定）
+    "result_passed": {"fill": PASSED_FILL},
+    "result_failed": {"fill": FAILED_FILL},
+}
+
+# 名前付きスタイルとして登録するスタイル名（ストリーミングモード用）
+NAMED_STYLE_PREFIX = "report_"
+NAMED_STYLES = ["header", "title", "body", "passed", "failed", "skipped"]
+
+
+def status_style(status: str) -> str:
+    """
+    テスト結果に対応するスタイル名
+    
+    Args:
+        status: テスト結果 (passed/failed/skipped)
+    
+    Returns:
+        スタイル名
+    """
+    return status if status in ("passed", "failed", "skipped") else "body"
+
+
+def register_named_styles(workbook: Workbook):
+    """
+    名前付きスタイルをワークブックに登録
+    
+    登録名は NAMED_STYLE_PREFIX + スタイル名（例: report_header）。
+    フォント未指定のスタイルには既定フォントを設定し、通常モードの見た目と揃える。
+    
+    Args:
+        workbook: 登録先のワークブック
+    """
+    for name in NAMED_STYLES:
+        attrs = dict(CELL_STYLES[name])
+        attrs.setdefault("font", DEFAULT_FONT)
+        workbook.add_named_style(NamedStyle(name=NAMED_STYLE_PREFIX + name, **attrs))
+
+
+class StyleRegistry:
+    """
+    セルスタイルのキャッシュ
+    
+    スタイル名と適用前のスタイルIDの組ごとに、適用後のスタイルID（StyleArray）を
+    1回だけ計算して再利用する。2回目以降はスタイルオブジェクトの生成や
+    ワークブックのスタイルテーブルの検索を行わず、IDのコピーのみで済む。
+    スタイルIDはワークブックごとに異なるため、インスタンスはワークブックごとに作成すること。
+    """
+    
+    def __init__(self):
+        """初期化"""
+        self._cache: Dict[Tuple[str, Tuple[int, ...]], Any] = {}
+    
+    def apply(self, cell, name: str):
+        """
+        セルにスタイルを適用
+        
+        Args:
+            cell: 対象セル
+            name: スタイル名（CELL_STYLES のキー）
+        """
+        # 未スタイルのセルは _style が None（既定スタイル）
+        key = (name, tuple(cell._style) if cell._style else ())
+        style_array = self._cache.get(key)
+        if style_array is None:
+            for attr, value in CELL_STYLES[name].items():
+                setattr(cell, attr, value)
+            self._cache[key] = copy(cell._style)
+        else:
+            cell._style = copy(style_array)
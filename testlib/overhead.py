@@ -0,0 +1,110 @@
+"""
+レポート処理オーバーヘッド計測モジュール
+フックやレポート処理の所要時間を perf_counter_ns で計測し、処理ごとに集計する
+（呼び出しごとのログ出力は行わず、回数・合計・最大のみを保持する）
+"""
+import functools
+from time import perf_counter_ns
+from typing import Dict, Iterable, List, Tuple
+
+
+class OverheadCounters:
+    """処理ごとの所要時間の集計"""
+    
+    def __init__(self):
+        """初期化"""
+        # 処理名 -> [呼び出し回数, 合計(ns), 最大(ns)]
+        self._counters: Dict[str, List[int]] = {}
+    
+    def add(self, name: str, elapsed_ns: int):
+        """
+        所要時間の加算
+        
+        Args:
+            name: 処理名
+            elapsed_ns: 所要時間（ナノ秒）
+        """
+        counter = self._counters.get(name)
+        if counter is None:
+            self._counters[name] = [1, elapsed_ns, elapsed_ns]
+            return
+        counter[0] += 1
+        counter[1] += elapsed_ns
+        if elapsed_ns > counter[2]:
+            counter[2] = elapsed_ns
+    
+    def instrument(self, obj, method_name: str, name: str = None):
+        """
+        オブジェクトのメソッドを計測付きのものに置き換える（そのインスタンスのみ）
+        
+        Args:
+            obj: 対象のオブジェクト
+            method_name: メソッド名
+            name: 処理名（省略時は "クラス名.メソッド名"）
+        """
+        method = getattr(obj, method_name)
+        name = name or f"{type(obj).__name__}.{method_name}"
+        add = self.add
+        
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                add(name, perf_counter_ns() - start)
+        
+        setattr(obj, method_name, timed)
+    
+    def merge(self, snapshot: Dict[str, List[int]]):
+        """
+        他プロセス（pytest-xdist のワーカー）の集計結果の加算
+        
+        Args:
+            snapshot: snapshot() の戻り値
+        """
+        for name, (count, total_ns, max_ns) in snapshot.items():
+            counter = self._counters.setdefault(name, [0, 0, 0])
+            counter[0] += count
+            counter[1] += total_ns
+            counter[2] = max(counter[2], max_ns)
+    
+    def snapshot(self) -> Dict[str, List[int]]:
+        """
+        集計結果の取得（プロセス間で受け渡せる形式）
+        
+        Returns:
+            処理名 -> [呼び出し回数, 合計(ns), 最大(ns)]
+        """
+        return {name: list(counter) for name, counter in self._counters.items()}
+    
+    def total_seconds(self, names: Iterable[str]) -> float:
+        """
+        指定した処理の合計所要時間
+        
+        Args:
+            names: 処理名（入れ子になっていない処理を指定する）
+        
+        Returns:
+            合計所要時間（秒）
+        """
+        return sum(self._counters[name][1] for name in names if name in self._counters) / 1e9
+    
+    def rows(self, order: Iterable[str] = ()) -> List[Tuple[str, int, float, float, float]]:
+        """
+        集計結果の一覧
+        
+        Args:
+            order: 先頭に並べる処理名（残りは合計所要時間の長い順）
+        
+        Returns:
+            (処理名, 呼び出し回数, 合計(ミリ秒), 平均(マイクロ秒), 最大(マイクロ秒)) のリスト
+        """
+        order = [name for name in order if name in self._counters]
+        rest = sorted((name for name in self._counters if name not in order),
+                      key=lambda name: self._counters[name][1], reverse=True)
+        rows = []
+        for name in order + rest:
+            count, total_ns, max_ns = self._counters[name]
+            rows.append((name, count, total_ns / 1e6, total_ns / count / 1e3, max_ns / 1e3))
+        return rows
@@ -0,0 +1,279 @@
+"""
+テスト実行プロファイリングモジュール
+テスト本体（テスト関数の呼び出し）を cProfile で計測し、全体と実行時間の長いテストごとの累積時間の上位の関数を集計する
+（--profile-tests 指定時のみ使用する）
+"""
+import cProfile
+import hashlib
+import heapq
+import marshal
+import os
+import pstats
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+import _pytest
+import pluggy
+
+logger = logging.getLogger("pytest_logger")
+
+# 全体の集計の行に表示するテスト名
+ALL_TESTS_LABEL = "（全テスト）"
+
+# 上位の関数から除外するディレクトリ（テストの呼び出しを行う pytest・pluggy の内部処理）
+EXCLUDED_DIRS = tuple(os.path.dirname(module.__file__) + os.sep for module in (_pytest, pluggy))
+
+# 上位の関数から除外する組み込み関数（プロファイラ自身の停止処理）
+EXCLUDED_BUILTINS = ("<method 'disable' of '_lsprof.Profiler' objects>",)
+
+
+class _RawStats:
+    """pstats.Stats に計測結果の辞書を読み込ませるためのラッパー（他プロセスの集計結果の加算用）"""
+    
+    def __init__(self, stats: Dict):
+        """
+        初期化
+        
+        Args:
+            stats: pstats.Stats.stats と同じ形式の辞書
+        """
+        self.stats = stats
+    
+    def create_stats(self):
+        """pstats.Stats から呼び出される（計測結果は作成済み）"""
+
+
+def format_function(func: Tuple[str, int, str]) -> str:
+    """
+    関数の表示名
+    
+    Args:
+        func: (ファイル名, 行番号, 関数名)（pstats のキー）
+    
+    Returns:
+        "ファイル名:行番号(関数名)"（カレントディレクトリ配下のファイルは相対パス、組み込み関数は関数名のみ）
+    """
+    filename, line, name = func
+    if filename == "~":
+        return name
+    if os.path.isabs(filename) and filename.startswith(os.getcwd() + os.sep):
+        filename = os.path.relpath(filename)
+    return f"{filename}:{line}({name})"
+
+
+def is_excluded(func: Tuple[str, int, str]) -> bool:
+    """
+    上位の関数から除外するか
+    
+    Args:
+        func: (ファイル名, 行番号, 関数名)（pstats のキー）
+    
+    Returns:
+        pytest・pluggy の内部処理、またはプロファイラ自身の処理の場合True
+    """
+    filename, _, name = func
+    if filename == "~":
+        return name in EXCLUDED_BUILTINS
+    return filename.startswith(EXCLUDED_DIRS)
+
+
+def stats_file_name(test_name: str) -> str:
+    """
+    テストごとの計測結果のファイル名
+    
+    Args:
+        test_name: テスト名（nodeid）
+    
+    Returns:
+        ファイル名（ファイル名に使えない文字を置き換え、同じ名前にならないようテスト名のハッシュを付ける）
+    """
+    safe_name = re.sub(r"[^\w.-]", "_", test_name)[:120]
+    digest = hashlib.md5(test_name.encode("utf-8")).hexdigest()[:8]
+    return f"{safe_name}_{digest}.prof"
+
+
+class CallProfiler:
+    """テスト本体のプロファイリングと集計"""
+    
+    def __init__(self, top_n: int = 20, targets: Optional[Iterable[str]] = None, max_tests: int = 50,
+                 stats_dir: Optional[str] = None):
+        """
+        初期化
+        
+        Args:
+            top_n: テストごと・全体で集計する、累積時間の上位の関数の数
+            targets: 計測するテスト名（nodeid）。Noneの場合は全てのテストを計測する
+            max_tests: テストごとの上位の関数を集計するテストの数（テスト本体の実行時間の長い順）
+            stats_dir: テストごとの計測結果（pstats 形式）の保存先。Noneの場合は保存しない
+        """
+        self.top_n = top_n
+        self.targets = set(targets) if targets is not None else None
+        self.max_tests = max(0, max_tests)
+        self.stats_dir = stats_dir
+        # 全テストの計測結果の合算（最初の計測時に作成）
+        self._stats: Optional[pstats.Stats] = None
+        # 実行時間の長い max_tests 件のテストの上位の関数（実行時間の短い順のヒープ）:
+        # (実行時間(秒), テスト名, [(テスト名, 順位, 関数, 呼び出し回数, 自身の時間(秒), 累積時間(秒)), ...])
+        self._tests: List[Tuple[float, str, List[Tuple[str, int, str, int, float, float]]]] = []
+        # 計測したテストの数
+        self.profiled_count = 0
+    
+    def is_target(self, test_name: str) -> bool:
+        """
+        計測対象のテストかどうか
+        
+        Args:
+            test_name: テスト名（nodeid）
+        
+        Returns:
+            計測対象の場合True
+        """
+        return self.targets is None or test_name in self.targets
+    
+    def start(self, test_name: str) -> Optional[cProfile.Profile]:
+        """
+        計測の開始
+        
+        Args:
+            test_name: テスト名（nodeid）
+        
+        Returns:
+            計測中のプロファイラ（stop に渡す）。開始できなかった場合はNone
+        """
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # 他のプロファイラ（デバッガ・カバレッジ計測等）が動作中の場合
+            logger.warning("プロファイリングを開始できませんでした: %s: %s", test_name, e)
+            return None
+        return profiler
+    
+    def stop(self, test_name: str, profiler: Optional[cProfile.Profile]):
+        """
+        計測の終了と結果の追加
+        
+        Args:
+            test_name: テスト名（nodeid）
+            profiler: start の戻り値
+        """
+        if profiler is None:
+            return
+        profiler.disable()
+        stats = pstats.Stats(profiler)
+        if self.stats_dir:
+            try:
+                os.makedirs(self.stats_dir, exist_ok=True)
+                stats.dump_stats(os.path.join(self.stats_dir, stats_file_name(test_name)))
+            except Exception as e:
+                logger.error("テストの計測結果を保存できませんでした: %s: %s", test_name, e)
+        self.add_stats(test_name, stats)
+    
+    def add_stats(self, test_name: str, stats: pstats.Stats):
+        """
+        1件のテストの計測結果の追加
+        
+        Args:
+            test_name: テスト名（nodeid）
+            stats: 計測結果
+        """
+        self._add_test(stats.total_tt, test_name, self._top_rows(test_name, stats.stats))
+        if self._stats is None:
+            self._stats = stats
+        else:
+            self._stats.add(stats)
+        self.profiled_count += 1
+    
+    def _add_test(self, duration: float, test_name: str, rows: List[Tuple[str, int, str, int, float, float]]):
+        """
+        テストごとの上位の関数の追加（実行時間の長い max_tests 件のテストのみ保持する）
+        
+        Args:
+            duration: テスト本体の実行時間（秒）
+            test_name: テスト名（nodeid）
+            rows: テストの上位の関数
+        """
+        if not self.max_tests:
+            return
+        entry = (duration, test_name, rows)
+        if len(self._tests) < self.max_tests:
+            heapq.heappush(self._tests, entry)
+        elif duration > self._tests[0][0]:
+            heapq.heapreplace(self._tests, entry)
+    
+    def _top_rows(self, test_name: str, stats: Dict) -> List[Tuple[str, int, str, int, float, float]]:
+        """
+        累積時間の上位の関数
+        
+        Args:
+            test_name: 行に表示するテスト名
+            stats: pstats.Stats.stats と同じ形式の辞書
+        
+        Returns:
+            (テスト名, 順位, 関数, 呼び出し回数, 自身の時間(秒), 累積時間(秒)) のリスト
+        """
+        entries = sorted(((func, value) for func, value in stats.items() if not is_excluded(func)),
+                         key=lambda entry: entry[1][3], reverse=True)
+        return [(test_name, rank, format_function(func), ncalls, tottime, cumtime)
+                for rank, (func, (_, ncalls, tottime, cumtime, _)) in enumerate(entries[:self.top_n], start=1)]
+    
+    def rows(self) -> List[Tuple[str, int, str, int, float, float]]:
+        """
+        集計結果の一覧
+        
+        Returns:
+            (テスト名, 順位, 関数, 呼び出し回数, 自身の時間(秒), 累積時間(秒)) のリスト
+            （全体の集計、実行時間の長い max_tests 件のテストごと（実行時間の長い順）の順）
+        """
+        if self._stats is None:
+            return []
+        rows = self._top_rows(ALL_TESTS_LABEL, self._stats.stats)
+        for _, _, test_rows in sorted(self._tests, key=lambda entry: entry[0], reverse=True):
+            rows.extend(test_rows)
+        return rows
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        集計結果の取得（プロセス間で受け渡せる形式）
+        
+        Returns:
+            {"count": 計測したテストの数, "tests": 実行時間の長いテストの上位の関数, "stats": 計測結果（marshal形式）}
+        """
+        return {
+            "count": self.profiled_count,
+            "tests": list(self._tests),
+            "stats": marshal.dumps(self._stats.stats) if self._stats else None,
+        }
+    
+    def merge(self, snapshot: Dict[str, Any]):
+        """
+        他プロセス（pytest-xdist のワーカー）の集計結果の加算
+        
+        Args:
+            snapshot: snapshot() の戻り値
+        """
+        # 各ワーカーの上位 max_tests 件には、全体の上位 max_tests 件が必ず含まれる
+        for duration, test_name, rows in snapshot["tests"]:
+            self._add_test(duration, test_name, [tuple(row) for row in rows])
+        self.profiled_count += snapshot["count"]
+        if snapshot["stats"]:
+            stats = pstats.Stats(_RawStats(marshal.loads(snapshot["stats"])))
+            if self._stats is None:
+                self._stats = stats
+            else:
+                self._stats.add(stats)
+    
+    def save(self, path: str) -> bool:
+        """
+        全テストの計測結果の保存（pstats / snakeviz 等で読み込める形式）
+        
+        Args:
+            path: 保存先のパス
+        
+        Returns:
+            保存した場合True（計測したテストがない場合はFalse）
+        """
+        if self._stats is None:
+            return False
+        self._stats.dump_stats(path)
+        return True
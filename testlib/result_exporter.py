@@ -0,0 +1,209 @@
+"""
+テスト結果エクスポートモジュール
+テスト結果をダッシュボード等で読み込みやすい列指向の形式（Parquet）で出力する
+（pyarrow がインストールされていない場合は CSV / JSON Lines で出力）
+"""
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+import logging
+from testlib.result_store import format_timestamp, parse_timestamp
+
+# pyarrow は任意の依存パッケージ（読み込みに時間がかかるため、load_pyarrow() で初回使用時に読み込む）
+pa = pq = None
+_pyarrow_loaded = False
+
+logger = logging.getLogger("pytest_logger")
+
+# エクスポートする項目（この順で出力する）
+EXPORT_FIELDS = ("test_name", "test_id", "status", "duration", "category", "timestamp", "error_message")
+
+# 出力形式 -> 拡張子
+EXPORT_FORMATS = {"parquet": ".parquet", "csv": ".csv", "jsonl": ".jsonl"}
+
+
+def load_pyarrow() -> bool:
+    """
+    pyarrow の読み込み（2回目以降は読み込み済みのものを使用）
+    
+    Returns:
+        pyarrow が使用できるか
+    """
+    global pa, pq, _pyarrow_loaded
+    if not _pyarrow_loaded:
+        _pyarrow_loaded = True
+        try:
+            import pyarrow
+            import pyarrow.parquet
+            pa, pq = pyarrow, pyarrow.parquet
+        except ImportError:
+            pass
+    return pa is not None
+
+
+def to_epoch(timestamp: Union[str, float, None]) -> Optional[float]:
+    """
+    実行日時をエポック秒に変換
+    
+    Args:
+        timestamp: 実行日時（エポック秒、または再生成元の古いジャーナルの文字列）
+    
+    Returns:
+        エポック秒（省略時・変換できない場合はNone）
+    """
+    if timestamp is None or not isinstance(timestamp, str):
+        return timestamp
+    try:
+        return parse_timestamp(timestamp)
+    except ValueError:
+        return None
+
+
+def resolve_format(fmt: str) -> str:
+    """
+    出力形式の決定
+    
+    Args:
+        fmt: 出力形式 (auto/parquet/csv/jsonl)。auto の場合、pyarrow があれば parquet、なければ csv
+    
+    Returns:
+        実際に使用する出力形式
+    """
+    if fmt == "auto":
+        return "parquet" if load_pyarrow() else "csv"
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"未対応のエクスポート形式です: {fmt}")
+    if fmt == "parquet" and not load_pyarrow():
+        logger.warning("pyarrow がインストールされていないため、CSV形式でエクスポートします")
+        return "csv"
+    return fmt
+
+
+class ResultExporter:
+    """テスト結果のエクスポート（一定件数ごとにまとめて書き出す）"""
+    
+    def __init__(self, path_base: str, fmt: str = "auto", batch_size: int = 10000):
+        """
+        初期化
+        
+        Args:
+            path_base: 出力ファイルのパス（拡張子を除く）
+            fmt: 出力形式 (auto/parquet/csv/jsonl)
+            batch_size: まとめて書き出す件数（Parquet では1行グループの件数）
+        """
+        self.format = resolve_format(fmt)
+        self.path = path_base + EXPORT_FORMATS[self.format]
+        self.batch_size = max(1, batch_size)
+        self.count = 0
+        # 項目ごとの値のリスト（列指向で保持し、batch_size 件ごとに書き出す）
+        self._columns: Dict[str, List[Any]] = {field: [] for field in EXPORT_FIELDS}
+        self._pending = 0
+        self._writer = None
+        self._file = None
+        
+        output_dir = os.path.dirname(self.path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+    
+    def add(self, record: Dict[str, Any]):
+        """
+        テスト結果の追加
+        
+        Args:
+            record: テスト結果（ジャーナルと同じ形式）
+        """
+        columns = self._columns
+        columns["test_name"].append(record["test_name"])
+        columns["test_id"].append(record.get("test_id"))
+        columns["status"].append(record["status"])
+        columns["duration"].append(float(record["duration"]))
+        columns["category"].append(record.get("category", "General"))
+        columns["timestamp"].append(to_epoch(record.get("timestamp")))
+        columns["error_message"].append(record.get("error_message", ""))
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """保持している結果をファイルに書き出す"""
+        if not self._pending:
+            return
+        
+        if self.format == "parquet":
+            self._write_parquet()
+        elif self.format == "csv":
+            self._write_csv()
+        else:
+            self._write_jsonl()
+        
+        self.count += self._pending
+        self._pending = 0
+        for values in self._columns.values():
+            values.clear()
+    
+    def _write_parquet(self):
+        """Parquet形式で書き出す（1回の書き出しを1行グループとする）"""
+        columns = self._columns
+        table = pa.table({
+            "test_name": pa.array(columns["test_name"], pa.string()),
+            "test_id": pa.array(columns["test_id"], pa.string()),
+            "status": pa.array(columns["status"], pa.string()).dictionary_encode(),
+            "duration": pa.array(columns["duration"], pa.float64()),
+            "category": pa.array(columns["category"], pa.string()).dictionary_encode(),
+            # エポック秒をローカル時刻に変換（ミリ秒まで保持）
+            "timestamp": pa.array([datetime.fromtimestamp(epoch) if epoch is not None else None
+                                   for epoch in columns["timestamp"]], pa.timestamp("ms")),
+            "error_message": pa.array(columns["error_message"], pa.string()),
+        })
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+    
+    def _write_csv(self):
+        """CSV形式で書き出す"""
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(EXPORT_FIELDS)
+        self._writer.writerows(zip(*self._text_columns()))
+    
+    def _write_jsonl(self):
+        """JSON Lines形式で書き出す"""
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8")
+        self._file.writelines(
+            json.dumps(dict(zip(EXPORT_FIELDS, values)), ensure_ascii=False) + "\n"
+            for values in zip(*self._text_columns())
+        )
+    
+    def _text_columns(self) -> List[List[Any]]:
+        """
+        CSV / JSON Lines に書き出す項目ごとの値（実行日時は文字列に変換する）
+        
+        Returns:
+            EXPORT_FIELDS の順の値のリスト
+        """
+        return [[format_timestamp(epoch) if epoch is not None else None for epoch in self._columns[field]]
+                if field == "timestamp" else self._columns[field]
+                for field in EXPORT_FIELDS]
+    
+    def close(self) -> Optional[str]:
+        """
+        残りの結果を書き出してファイルを閉じる
+        
+        Returns:
+            出力したファイルのパス（結果が1件もない場合はNone）
+        """
+        self.flush()
+        if self.format == "parquet" and self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = None
+        self._file = None
+        if not self.count:
+            return None
+        logger.info(f"テスト結果をエクスポートしました: {self.path} ({self.count}件)")
+        return self.path
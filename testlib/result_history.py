@@ -0,0 +1,236 @@
+"""
+テスト結果履歴モジュール
+実行ごとのテスト結果をローカルの SQLite データベースに蓄積し、
+実行時間の推移（パーセンタイル）や実行時間が悪化したテストの検出に使用する
+"""
+import os
+import sqlite3
+from datetime import datetime
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger("pytest_logger")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_key TEXT NOT NULL,
+    rom_version TEXT,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    test_name TEXT NOT NULL,
+    test_id TEXT,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL,
+    category TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_test ON results (test_name, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+"""
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """
+    パーセンタイルの算出（最近傍順位法）
+    
+    Args:
+        sorted_values: 昇順に並べた値
+        p: パーセンタイル（0〜100）
+    
+    Returns:
+        パーセンタイル値
+    """
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class ResultHistory:
+    """テスト結果履歴（SQLite データベース）"""
+    
+    def __init__(self, path: str, batch_size: int = 1000):
+        """
+        初期化
+        
+        Args:
+            path: データベースファイルのパス
+            batch_size: まとめて登録する件数
+        """
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.run_id: Optional[int] = None
+        self._pending: List[Tuple] = []
+        
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(SCHEMA)
+    
+    def start_run(self, run_key: str, rom_version: str = "") -> int:
+        """
+        実行の登録
+        
+        Args:
+            run_key: 実行の識別子（詳細レポートのタイムスタンプ）
+            rom_version: ターゲットROMバージョン
+        
+        Returns:
+            実行ID
+        """
+        cursor = self._conn.execute(
+            "INSERT INTO runs (run_key, rom_version, started_at) VALUES (?, ?, ?)",
+            (run_key, rom_version, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        )
+        self._conn.commit()
+        self.run_id = cursor.lastrowid
+        logger.info(f"テスト結果履歴に実行を登録しました: {self.path} (実行ID {self.run_id})")
+        return self.run_id
+    
+    def add(self, record: Dict[str, Any]):
+        """
+        テスト結果の追加（batch_size 件ごとにまとめて登録）
+        
+        Args:
+            record: テスト結果（ジャーナルと同じ形式）
+        """
+        self._pending.append((
+            self.run_id,
+            record["test_name"],
+            record.get("test_id"),
+            record["status"],
+            float(record["duration"]),
+            record.get("category", "General"),
+        ))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """保持しているテスト結果を登録"""
+        if not self._pending:
+            return
+        self._conn.executemany(
+            "INSERT INTO results (run_id, test_name, test_id, status, duration, category)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            self._pending
+        )
+        self._conn.commit()
+        self._pending.clear()
+    
+    def recent_runs(self, window: Optional[int] = None, before: Optional[int] = None) -> List[int]:
+        """
+        直近の実行IDの取得
+        
+        Args:
+            window: 取得する実行数（Noneの場合は全て）
+            before: この実行IDより前の実行のみを対象とする
+        
+        Returns:
+            実行IDのリスト（新しい順）
+        """
+        sql = "SELECT run_id FROM runs"
+        params: List[Any] = []
+        if before is not None:
+            sql += " WHERE run_id < ?"
+            params.append(before)
+        sql += " ORDER BY run_id DESC"
+        if window is not None:
+            sql += " LIMIT ?"
+            params.append(window)
+        return [row[0] for row in self._conn.execute(sql, params)]
+    
+    def duration_percentiles(self, percentiles: Iterable[float] = (50, 90, 95),
+                             run_ids: Optional[Sequence[int]] = None,
+                             test_names: Optional[Sequence[str]] = None) -> Dict[str, Dict[float, float]]:
+        """
+        テストごとの実行時間のパーセンタイル（成功した結果のみ対象）
+        
+        Args:
+            percentiles: 算出するパーセンタイル
+            run_ids: 対象の実行ID（Noneの場合は全ての実行）
+            test_names: 対象のテスト名（Noneの場合は全てのテスト）
+        
+        Returns:
+            テスト名 -> {パーセンタイル: 実行時間（秒）}
+        """
+        self.flush()
+        sql = "SELECT test_name, duration FROM results WHERE status = 'passed'"
+        params: List[Any] = []
+        for column, values in (("run_id", run_ids), ("test_name", test_names)):
+            if values is not None:
+                sql += f" AND {column} IN ({', '.join('?' * len(values))})"
+                params.extend(values)
+        sql += " ORDER BY test_name, duration"
+        
+        percentiles = tuple(percentiles)
+        result = {}
+        for test_name, rows in groupby(self._conn.execute(sql, params), key=lambda row: row[0]):
+            durations = [row[1] for row in rows]
+            result[test_name] = {p: percentile(durations, p) for p in percentiles}
+        return result
+    
+    def slowest(self, limit: int = 10, run_id: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        実行時間の長いテストの取得（成功した結果のみ対象）
+        
+        Args:
+            limit: 取得する件数
+            run_id: 対象の実行ID（Noneの場合は現在の実行）
+        
+        Returns:
+            (テスト名, 実行時間) のリスト（実行時間の長い順）
+        """
+        self.flush()
+        return self._conn.execute(
+            "SELECT test_name, duration FROM results WHERE run_id = ? AND status = 'passed'"
+            " ORDER BY duration DESC LIMIT ?",
+            (self.run_id if run_id is None else run_id, limit)
+        ).fetchall()
+    
+    def find_regressions(self, threshold: float = 1.5, window: int = 10, min_duration: float = 0.01,
+                         run_id: Optional[int] = None) -> List[Tuple[str, float, float, float]]:
+        """
+        実行時間が悪化したテストの検出
+        
+        直前 window 回の実行での実行時間の中央値と比べ、threshold 倍を超えたテストを返す。
+        実行時間が min_duration 秒未満のテストは誤差が大きいため対象外とする。
+        
+        Args:
+            threshold: 悪化と判定する倍率
+            window: 比較対象とする直前の実行数
+            min_duration: 対象とする最小の実行時間（秒）
+            run_id: 対象の実行ID（Noneの場合は現在の実行）
+        
+        Returns:
+            (テスト名, 実行時間, 過去の中央値, 倍率) のリスト（倍率の大きい順）
+        """
+        self.flush()
+        run_id = self.run_id if run_id is None else run_id
+        previous_runs = self.recent_runs(window, before=run_id)
+        if not previous_runs:
+            return []
+        
+        current = self._conn.execute(
+            "SELECT test_name, duration FROM results WHERE run_id = ? AND status = 'passed' AND duration >= ?",
+            (run_id, min_duration)
+        ).fetchall()
+        if not current:
+            return []
+        baselines = self.duration_percentiles((50,), run_ids=previous_runs)
+        
+        regressions = []
+        for test_name, duration in current:
+            baseline = baselines.get(test_name, {}).get(50)
+            if baseline and duration > baseline * threshold:
+                regressions.append((test_name, duration, baseline, duration / baseline))
+        regressions.sort(key=lambda row: row[3], reverse=True)
+        return regressions
+    
+    def close(self):
+        """データベースを閉じる"""
+        if self._conn:
+            self.flush()
+            self._conn.close()
+            self._conn = None
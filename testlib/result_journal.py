@@ -0,0 +1,129 @@
+"""
+テスト結果ジャーナルモジュール
+テスト結果を1件ずつ JSON Lines 形式で追記し、異常終了時にも結果を失わないようにする
+"""
+import json
+import os
+from typing import Any, Dict, Iterator
+import logging
+from testlib.result_store import format_timestamp
+
+logger = logging.getLogger("pytest_logger")
+
+
+class ResultJournal:
+    """テスト結果ジャーナル（追記専用の JSON Lines ファイル）"""
+    
+    def __init__(self, path: str, fsync_interval: int = 100):
+        """
+        初期化
+        
+        Args:
+            path: ジャーナルファイルのパス
+            fsync_interval: fsync を行う間隔（記録件数）
+        """
+        self.path = path
+        self.fsync_interval = max(1, fsync_interval)
+        self._pending = 0
+        self.count = 0
+        
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        logger.info(f"結果ジャーナルを開きました: {path}")
+    
+    def append(self, record: Dict[str, Any]):
+        """
+        テスト結果の追記
+        
+        1件ごとにOSへ書き出す（プロセスが強制終了されても失われない）。
+        ディスクへの同期（fsync）は fsync_interval 件ごとにまとめて行う。
+        実行日時（エポック秒）は文字列に変換して記録する。
+        
+        Args:
+            record: テスト結果
+        """
+        timestamp = record.get("timestamp")
+        if timestamp is not None and not isinstance(timestamp, str):
+            record = dict(record, timestamp=format_timestamp(timestamp))
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.fsync_interval:
+            self.sync()
+    
+    def sync(self):
+        """未同期の記録をディスクに同期"""
+        if self._file and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+    
+    def close(self):
+        """ジャーナルを閉じる"""
+        if self._file:
+            self.sync()
+            self._file.close()
+            self._file = None
+            logger.info(f"結果ジャーナルを閉じました: {self.path} ({self.count}件)")
+
+
+def read_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    ジャーナルの読み込み
+    
+    異常終了により最終行が途中で切れている場合、その行は読み飛ばす。
+    
+    Args:
+        path: ジャーナルファイルのパス
+    
+    Yields:
+        テスト結果
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"ジャーナルの{line_no}行目を読み込めませんでした。スキップします: {path}")
+
+
+def apply_result(record: Dict[str, Any], excel_reporter, excel_manager=None, result_exporter=None,
+                 result_history=None):
+    """
+    テスト結果をExcelレポートに反映
+    
+    テスト実行時と、ジャーナルからのレポート再生成時の両方で使用する。
+    
+    Args:
+        record: テスト結果（ジャーナルの1レコード）
+        excel_reporter: 詳細レポート（ExcelReporter）
+        excel_manager: テンプレートベースの結果ファイル（ExcelManager、省略可）
+        result_exporter: テスト結果のエクスポート（ResultExporter、省略可）
+        result_history: テスト結果履歴（ResultHistory、省略可）
+    """
+    test_id = record.get("test_id")
+    if excel_manager and test_id:
+        try:
+            excel_manager.write_test_result(test_id, record["status"], record.get("error_info", ""))
+        except Exception as e:
+            logger.error("テンプレートベースのExcel記録に失敗しました: %s", e)
+    
+    excel_reporter.add_test_result(
+        test_name=record["test_name"],
+        status=record["status"],
+        duration=record["duration"],
+        error_message=record.get("error_message", ""),
+        category=record.get("category", "General"),
+        timestamp=record.get("timestamp")
+    )
+    
+    if result_exporter:
+        result_exporter.add(record)
+    if result_history:
+        result_history.add(record)
@@ -0,0 +1,247 @@
+"""
+テスト結果ストアモジュール
+大量のテスト結果を少ないメモリで保持する
+（項目ごとの配列に格納し、カテゴリ・結果は番号に置き換えて保持）
+"""
+import time
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# 実行日時の表示形式
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_timestamp(text: str) -> float:
+    """
+    実行日時の文字列をエポック秒に変換
+    
+    Args:
+        text: 実行日時（TIMESTAMP_FORMAT 形式、ローカル時刻）
+    
+    Returns:
+        エポック秒
+    """
+    return time.mktime(time.strptime(text, TIMESTAMP_FORMAT))
+
+
+def format_timestamp(epoch: float) -> str:
+    """
+    エポック秒を実行日時の文字列に変換
+    
+    Args:
+        epoch: エポック秒
+    
+    Returns:
+        実行日時（TIMESTAMP_FORMAT 形式、ローカル時刻）
+    """
+    return time.strftime(TIMESTAMP_FORMAT, time.localtime(epoch))
+
+
+class ResultStore:
+    """
+    テスト結果ストア
+    
+    テスト名とエラーメッセージ以外は数値の配列に格納する。
+    エラーメッセージは失敗したテストのみ保持し、実行日時は表示時に文字列へ変換する。
+    """
+    
+    def __init__(self):
+        """初期化"""
+        self._names: List[str] = []
+        self._statuses = array("B")
+        self._categories = array("I")
+        self._durations = array("d")
+        self._timestamps = array("d")
+        # 行番号 -> エラーメッセージ（空でないもののみ）
+        self._errors: Dict[int, str] = {}
+        # 結果・カテゴリの名前と番号の対応
+        self._status_names: List[str] = []
+        self._status_codes: Dict[str, int] = {}
+        self._category_names: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        # カテゴリ番号 -> そのカテゴリの行番号の配列（追加時に振り分け）
+        self._category_rows: Dict[int, array] = {}
+        # 直前に変換した実行日時（同じ秒の結果が続くため、変換結果を使い回す）
+        self._last_text: Optional[str] = None
+        self._last_epoch = 0.0
+        self._last_second: Optional[int] = None
+        self._last_formatted = ""
+    
+    @staticmethod
+    def _intern(value: str, names: List[str], codes: Dict[str, int]) -> int:
+        """
+        名前を番号に変換（未登録の場合は登録する）
+        
+        Args:
+            value: 名前
+            names: 番号 -> 名前のリスト
+            codes: 名前 -> 番号の辞書
+        
+        Returns:
+            番号
+        """
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+    
+    def _to_epoch(self, timestamp: Union[str, float, None]) -> float:
+        """
+        実行日時をエポック秒に変換
+        
+        Args:
+            timestamp: 実行日時（エポック秒、ジャーナルから再生成する場合は文字列、Noneの場合は現在時刻）
+        
+        Returns:
+            エポック秒
+        """
+        if timestamp is None:
+            return time.time()
+        if not isinstance(timestamp, str):
+            return float(timestamp)
+        # 文字列の場合のみ変換する（同じ秒の結果が続くため、直前の変換結果を使い回す）
+        if timestamp != self._last_text:
+            self._last_epoch = parse_timestamp(timestamp)
+            self._last_text = timestamp
+        return self._last_epoch
+    
+    def _format(self, epoch: float) -> str:
+        """
+        エポック秒を実行日時の文字列に変換（同じ秒が続く場合は変換結果を使い回す）
+        
+        Args:
+            epoch: エポック秒
+        
+        Returns:
+            実行日時
+        """
+        second = int(epoch)
+        if second != self._last_second:
+            self._last_formatted = format_timestamp(epoch)
+            self._last_second = second
+        return self._last_formatted
+    
+    def append(self, test_name: str, status: str, duration: float, error_message: str = "",
+               category: str = "General", timestamp: Union[str, float, None] = None):
+        """
+        テスト結果の追加
+        
+        Args:
+            test_name: テスト名
+            status: テスト結果 (passed/failed/skipped)
+            duration: 実行時間（秒）
+            error_message: エラーメッセージ
+            category: テストのカテゴリ
+            timestamp: 実行日時（文字列またはエポック秒、Noneの場合は現在時刻）
+        """
+        row = len(self._names)
+        category_code = self._intern(category, self._category_names, self._category_codes)
+        self._names.append(test_name)
+        self._statuses.append(self._intern(status, self._status_names, self._status_codes))
+        self._categories.append(category_code)
+        self._durations.append(duration)
+        self._timestamps.append(self._to_epoch(timestamp))
+        if error_message:
+            self._errors[row] = error_message
+        
+        rows = self._category_rows.get(category_code)
+        if rows is None:
+            rows = self._category_rows[category_code] = array("I")
+        rows.append(row)
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def subset(self, category: str) -> "ResultStore":
+        """
+        指定したカテゴリの結果のみを持つストア（カテゴリ別ファイルの作成用に、そのカテゴリの行のみを渡す）
+        
+        Args:
+            category: カテゴリ
+        
+        Returns:
+            同じ形式（番号・エポック秒の配列）のストア
+        """
+        code = self._category_codes.get(category)
+        indices = self._category_rows[code] if code is not None else array("I")
+        store = ResultStore()
+        store._names = [self._names[i] for i in indices]
+        store._statuses = array("B", [self._statuses[i] for i in indices])
+        store._categories = array("I", [0]) * len(indices)
+        store._durations = array("d", [self._durations[i] for i in indices])
+        store._timestamps = array("d", [self._timestamps[i] for i in indices])
+        store._errors = {row: self._errors[i] for row, i in enumerate(indices) if i in self._errors}
+        store._status_names = list(self._status_names)
+        store._status_codes = dict(self._status_codes)
+        if indices:
+            store._category_names = [category]
+            store._category_codes = {category: 0}
+            store._category_rows = {0: array("I", range(len(indices)))}
+        return store
+    
+    def status_counts(self) -> Dict[str, int]:
+        """
+        結果ごとの件数
+        
+        Returns:
+            テスト結果 (passed/failed/skipped) -> 件数
+        """
+        counts = [0] * len(self._status_names)
+        for code in self._statuses:
+            counts[code] += 1
+        return dict(zip(self._status_names, counts))
+    
+    def categories(self) -> List[str]:
+        """
+        カテゴリの一覧（追加された順）
+        
+        Returns:
+            カテゴリ名のリスト
+        """
+        return list(self._category_names)
+    
+    def count(self, category: Optional[str] = None) -> int:
+        """
+        テスト結果の件数
+        
+        Args:
+            category: カテゴリ（Noneの場合は全件）
+        
+        Returns:
+            件数
+        """
+        if category is None:
+            return len(self._names)
+        code = self._category_codes.get(category)
+        return 0 if code is None else len(self._category_rows[code])
+    
+    def rows(self, category: Optional[str] = None) -> Iterator[Tuple[str, str, float, str, str, str]]:
+        """
+        テスト結果を追加された順に取得
+        
+        Args:
+            category: カテゴリ（Noneの場合は全件）
+        
+        Yields:
+            (テスト名, 結果, 実行時間, エラーメッセージ, カテゴリ, 実行日時) のタプル
+        """
+        if category is None:
+            indices = range(len(self._names))
+        else:
+            code = self._category_codes.get(category)
+            indices = self._category_rows[code] if code is not None else ()
+        
+        names = self._names
+        errors = self._errors
+        status_names = self._status_names
+        category_names = self._category_names
+        for i in indices:
+            yield (
+                names[i],
+                status_names[self._statuses[i]],
+                self._durations[i],
+                errors.get(i, ""),
+                category_names[self._categories[i]],
+                self._format(self._timestamps[i]),
+            )
@@ -0,0 +1,221 @@
+"""
+テスト実行順序・分割・選択モジュール
+過去の実行時間をもとに、合計実行時間の長いモジュールから順に並べる（LPT: Longest Processing Time first）。
+CI で複数のジョブに分割する場合は、各ジョブの合計実行時間が均等になるようにモジュール単位で割り当てる。
+モジュール・クラススコープのフィクスチャを何度も作り直さないよう、同じモジュールのテストは収集順のまま連続させる。
+結果ファイルに記録済みのテスト結果をもとに、再実行するテストを選択する。
+"""
+import glob
+import heapq
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+from .result_history import ResultHistory
+from .result_journal import read_journal
+
+logger = logging.getLogger("pytest_logger")
+
+# 過去の実行時間が不明なテストの実行時間（既知のテストが1件もない場合）
+DEFAULT_DURATION = 1.0
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """
+    分割指定（i/N）の解析
+    
+    Args:
+        text: 分割指定（例: "1/4" = 4分割の1番目）
+    
+    Returns:
+        (番号（1始まり）, 分割数)
+    """
+    try:
+        index, count = (int(value) for value in text.split("/"))
+    except ValueError:
+        raise ValueError(f"分割指定は i/N の形式で指定してください: {text}")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"分割指定が範囲外です: {text}")
+    return index, count
+
+
+def load_durations(history_path: str, output_dir: str = "output", window: int = 10) -> Dict[str, float]:
+    """
+    過去のテストごとの実行時間の読み込み
+    
+    テスト結果履歴がある場合は直近 window 回の中央値を使用する。
+    ない場合は直近 window 個の結果ジャーナル（output/test_results_*.jsonl）の実行時間を
+    使用する（同じテストが複数のジャーナルにある場合は新しいものを優先）。
+    
+    Args:
+        history_path: テスト結果履歴データベースのパス
+        output_dir: 結果ジャーナルを探すディレクトリ
+        window: 中央値の算出に使用する直近の実行数
+    
+    Returns:
+        テスト名（nodeid） -> 実行時間（秒）
+    """
+    if os.path.exists(history_path):
+        history = ResultHistory(history_path)
+        try:
+            run_ids = history.recent_runs(window)
+            if run_ids:
+                medians = history.duration_percentiles((50,), run_ids=run_ids)
+                durations = {name: values[50] for name, values in medians.items()}
+                logger.info(f"テスト結果履歴から実行時間を読み込みました: {len(durations)}件")
+                return durations
+        finally:
+            history.close()
+    
+    journals = sorted(glob.glob(os.path.join(output_dir, "test_results_*.jsonl")))[-window:]
+    if journals:
+        durations = {}
+        for journal in journals:
+            for record in read_journal(journal):
+                durations[record["test_name"]] = float(record["duration"])
+        logger.info(f"結果ジャーナルから実行時間を読み込みました: {len(journals)}ファイル ({len(durations)}件)")
+        return durations
+    
+    logger.info("過去の実行時間がないため、収集順に実行します")
+    return {}
+
+
+def _estimate(items: Sequence, durations: Dict[str, float]) -> List[float]:
+    """
+    テストごとの見積もり実行時間（不明なテストは既知のテストの平均値）
+    
+    Args:
+        items: テスト項目
+        durations: テスト名 -> 実行時間
+    
+    Returns:
+        items と同じ順の見積もり実行時間
+    """
+    known = [durations[item.nodeid] for item in items if item.nodeid in durations]
+    default = sum(known) / len(known) if known else DEFAULT_DURATION
+    return [durations.get(item.nodeid, default) for item in items]
+
+
+def _module_groups(items: Sequence, durations: Dict[str, float]) -> List[Tuple[float, List]]:
+    """
+    モジュールごとのテスト項目と見積もり合計時間
+    
+    Args:
+        items: テスト項目
+        durations: テスト名 -> 実行時間
+    
+    Returns:
+        (見積もり合計時間, テスト項目（収集順）) のリスト（モジュールの収集順）
+    """
+    groups: Dict[str, List] = {}
+    totals: Dict[str, float] = {}
+    for item, estimate in zip(items, _estimate(items, durations)):
+        module = item.nodeid.split("::", 1)[0]
+        groups.setdefault(module, []).append(item)
+        totals[module] = totals.get(module, 0.0) + estimate
+    return [(totals[module], group) for module, group in groups.items()]
+
+
+def lpt_order(items: Sequence, durations: Dict[str, float]) -> List:
+    """
+    合計実行時間の長いモジュールから順に並べ替え（同じ場合は収集順、モジュール内は収集順）
+    
+    過去の実行時間がない場合は収集順のままとする。
+    
+    Args:
+        items: テスト項目
+        durations: テスト名 -> 実行時間
+    
+    Returns:
+        並べ替えたテスト項目のリスト
+    """
+    if not durations:
+        return list(items)
+    groups = sorted(_module_groups(items, durations), key=lambda group: -group[0])
+    return [item for _, group in groups for item in group]
+
+
+def select_shard(items: Sequence, durations: Dict[str, float], index: int,
+                 count: int) -> Tuple[List, List, List[float]]:
+    """
+    分割したテストのうち、指定された番号のものを選択
+    
+    合計実行時間の長いモジュールから順に、その時点で合計実行時間が最も短い分割に割り当てる。
+    同じモジュールのテストは同じ分割に割り当てる。
+    同じ収集結果と実行時間からは常に同じ割り当てになる。
+    
+    Args:
+        items: テスト項目
+        durations: テスト名 -> 実行時間
+        index: 選択する分割の番号（1始まり）
+        count: 分割数
+    
+    Returns:
+        (選択したテスト項目（lpt_order の順）, 選択しなかったテスト項目, 分割ごとの見積もり合計時間)
+    """
+    loads = [0.0] * count
+    # (合計時間, 分割番号) のヒープ（合計時間が同じ場合は番号の小さい分割）
+    heap = [(0.0, shard) for shard in range(count)]
+    selected, deselected = [], []
+    for total, group in sorted(_module_groups(items, durations), key=lambda group: -group[0]):
+        load, shard = heapq.heappop(heap)
+        loads[shard] = load + total
+        heapq.heappush(heap, (loads[shard], shard))
+        (selected if shard == index - 1 else deselected).extend(group)
+    return selected, deselected, loads
+
+
+def select_by_recorded_results(items: Sequence,
+                               results: Dict[str, Optional[str]]) -> Tuple[List, List, List[str]]:
+    """
+    記録済みのテスト結果によるテストの選択（--skip-ok）
+    
+    結果ファイルに OK が記録されているテストのみ選択しない（NG・SKIP・未記入のテストは再実行する）。
+    テスト番号のないテストは結果ファイルとは関係がないため選択する。
+    テンプレートに存在しないテスト番号のテストは、結果を記録できず毎回選択されてしまうため選択しない。
+    
+    Args:
+        items: テスト項目（excel_test_id を設定済みのもの）
+        results: テンプレートの全テスト番号 -> 記録済みのテスト結果 (OK/NG/SKIP、未記入の場合はNone)
+    
+    Returns:
+        (選択したテスト項目（元の順）, 選択しなかったテスト項目, テンプレートに存在しないテスト番号（ソート済み）)
+    """
+    selected, deselected = [], []
+    unknown_ids = set()
+    for item in items:
+        if item.excel_test_id is None:
+            selected.append(item)
+            continue
+        test_id = str(item.excel_test_id).strip()
+        if test_id not in results:
+            unknown_ids.add(test_id)
+            deselected.append(item)
+        elif results[test_id] == "OK":
+            deselected.append(item)
+        else:
+            selected.append(item)
+    return selected, deselected, sorted(unknown_ids)
+
+
+def schedule_items(items: List, durations: Dict[str, float], shard: Optional[Tuple[int, int]] = None) -> List:
+    """
+    テスト項目の並べ替え・分割（items をその場で変更する）
+    
+    Args:
+        items: テスト項目（pytest_collection_modifyitems の items）
+        durations: テスト名 -> 実行時間
+        shard: (番号, 分割数)。Noneの場合は並べ替えのみ行う
+    
+    Returns:
+        選択しなかったテスト項目のリスト
+    """
+    if shard is None:
+        items[:] = lpt_order(items, durations)
+        return []
+    
+    selected, deselected, loads = select_shard(items, durations, *shard)
+    items[:] = selected
+    logger.info("テストを分割しました: %d/%d (%d件, 見積もり %.1f秒 / 各分割 %s秒)",
+                shard[0], shard[1], len(selected), loads[shard[0] - 1],
+                ", ".join(f"{load:.1f}" for load in loads))
+    return deselected
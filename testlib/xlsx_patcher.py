@@ -0,0 +1,353 @@
+"""
+xlsxパッチモジュール
+openpyxl でワークブック全体を読み書きせずに、シートXMLの指定セルのみを書き換える
+
+変更するのは対象シートのXMLと（塗りつぶしを追加する場合の）styles.xml のみで、
+その他のパート（画像、データの入力規則、マクロ等）はそのままコピーする。
+"""
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import escape
+from openpyxl.styles import PatternFill
+from openpyxl.utils import column_index_from_string, get_column_letter
+import logging
+
+logger = logging.getLogger("pytest_logger")
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+REL_TYPE_STYLES = NS_REL + "/styles"
+
+# (行番号, 列番号) -> (値, 塗りつぶし（Noneの場合は既存のスタイルを維持）)
+CellPatches = Dict[Tuple[int, int], Tuple[str, Optional[PatternFill]]]
+
+_ATTR_RE = re.compile(r'([\w:]+)="([^"]*)"')
+_CELL_REF_RE = re.compile(r'([A-Z]+)(\d+)')
+
+
+def _parse_attrs(attr_text: str) -> List[Tuple[str, str]]:
+    """開始タグの属性文字列を (名前, 値) のリストに変換"""
+    return _ATTR_RE.findall(attr_text)
+
+
+def _format_attrs(attrs: List[Tuple[str, str]]) -> str:
+    """(名前, 値) のリストを属性文字列に変換"""
+    return "".join(f' {name}="{value}"' for name, value in attrs)
+
+
+def _resolve_target(base_dir: str, target: str) -> str:
+    """リレーションシップのTargetをzip内のパスに変換"""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+
+def _find_parts(zin: zipfile.ZipFile, sheet_names: Iterable[str]) -> Tuple[Dict[str, str], Optional[str]]:
+    """
+    シートとスタイルのパート名の取得
+    
+    Args:
+        zin: xlsxファイル
+        sheet_names: シート名
+    
+    Returns:
+        (シートXMLのパス -> シート名, styles.xmlのパス)
+    """
+    workbook = ET.fromstring(zin.read("xl/workbook.xml"))
+    rels = ET.fromstring(zin.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel for rel in rels.iter(f"{{{NS_PKG_REL}}}Relationship")}
+    
+    sheet_names = set(sheet_names)
+    sheet_parts = {}
+    for sheet in workbook.iter(f"{{{NS_MAIN}}}sheet"):
+        if sheet.get("name") in sheet_names:
+            rel = targets[sheet.get(f"{{{NS_REL}}}id")]
+            sheet_parts[_resolve_target("xl", rel.get("Target"))] = sheet.get("name")
+    missing = sheet_names - set(sheet_parts.values())
+    if missing:
+        raise ValueError(f"シート '{', '.join(sorted(missing))}' がワークブックに存在しません")
+    
+    styles_part = None
+    for rel in targets.values():
+        if rel.get("Type") == REL_TYPE_STYLES:
+            styles_part = _resolve_target("xl", rel.get("Target"))
+    return sheet_parts, styles_part
+
+
+class _StylePatcher:
+    """styles.xml への塗りつぶし・セル書式の追加"""
+    
+    def __init__(self, xml: Optional[str]):
+        """
+        初期化
+        
+        Args:
+            xml: styles.xml の内容（存在しない場合はNone）
+        """
+        self.xml = xml
+        self.prefix = ""
+        self._fills: List[str] = []
+        self._xfs: List[str] = []
+        self._fill_count = 0
+        self._xf_count = 0
+        self._existing_xfs: List[str] = []
+        self._fill_ids: Dict[str, int] = {}
+        self._xf_ids: Dict[Tuple[int, int], int] = {}
+        if xml is None:
+            return
+        
+        match = re.search(r"<(\w+:)?styleSheet\b", xml)
+        self.prefix = (match.group(1) or "") if match else ""
+        p = re.escape(self.prefix)
+        fills = re.search(rf"<{p}fills\b[^>]*?(?:/>|>(.*?)</{p}fills>)", xml, re.S)
+        self._fill_count = len(re.findall(rf"<{p}fill\b", fills.group(1) or "")) if fills else 0
+        xfs = re.search(rf"<{p}cellXfs\b[^>]*?(?:/>|>(.*?)</{p}cellXfs>)", xml, re.S)
+        self._existing_xfs = re.findall(rf"<{p}xf\b[^>]*?(?:/>|>.*?</{p}xf>)", (xfs.group(1) or "") if xfs else "", re.S)
+        self._xf_count = len(self._existing_xfs)
+    
+    def style_with_fill(self, style_id: int, fill: PatternFill) -> int:
+        """
+        既存のセル書式の塗りつぶしのみを変更したセル書式の取得（なければ追加）
+        
+        Args:
+            style_id: 既存のセル書式ID（s属性）
+            fill: 塗りつぶし
+        
+        Returns:
+            セル書式ID
+        """
+        if self.xml is None:
+            raise ValueError("styles.xml が存在しないため、塗りつぶしを設定できません")
+        
+        fill_xml = ET.tostring(fill.to_tree(), encoding="unicode")
+        if self.prefix:
+            fill_xml = re.sub(r"<(/?)(?=\w)", rf"<\1{self.prefix}", fill_xml)
+        fill_id = self._fill_ids.get(fill_xml)
+        if fill_id is None:
+            fill_id = self._fill_count + len(self._fills)
+            self._fills.append(fill_xml)
+            self._fill_ids[fill_xml] = fill_id
+        
+        key = (style_id, fill_id)
+        xf_id = self._xf_ids.get(key)
+        if xf_id is None:
+            base = self._existing_xfs[style_id] if style_id < len(self._existing_xfs) else f"<{self.prefix}xf/>"
+            start_end = base.index(">") + 1
+            start_tag, rest = base[:start_end], base[start_end:]
+            closing = "/>" if start_tag.endswith("/>") else ">"
+            attrs = [(k, v) for k, v in _parse_attrs(start_tag) if k not in ("fillId", "applyFill")]
+            attrs += [("fillId", str(fill_id)), ("applyFill", "1")]
+            self._xfs.append(f"<{self.prefix}xf{_format_attrs(attrs)}{closing}{rest}")
+            xf_id = self._xf_count + len(self._xfs) - 1
+            self._xf_ids[key] = xf_id
+        return xf_id
+    
+    def patched(self) -> Optional[str]:
+        """
+        追加した塗りつぶし・セル書式を反映した styles.xml
+        
+        Returns:
+            styles.xml の内容（変更がない場合はNone）
+        """
+        if not self._fills and not self._xfs:
+            return None
+        xml = self.xml
+        xml = self._append(xml, "fills", self._fills, self._fill_count)
+        xml = self._append(xml, "cellXfs", self._xfs, self._xf_count)
+        return xml
+    
+    def _append(self, xml: str, tag: str, items: List[str], count: int) -> str:
+        """コレクション要素（fills/cellXfs）の末尾に要素を追加し、count属性を更新"""
+        if not items:
+            return xml
+        p = re.escape(self.prefix)
+        pattern = re.compile(rf"<{p}{tag}\b([^>]*?)(/>|>(.*?)</{p}{tag}>)", re.S)
+        match = pattern.search(xml)
+        new_count = count + len(items)
+        if match is None:
+            raise ValueError(f"styles.xml に {tag} 要素がありません")
+        attrs = [(k, v) for k, v in _parse_attrs(match.group(1)) if k != "count"]
+        attrs.insert(0, ("count", str(new_count)))
+        body = (match.group(3) or "") + "".join(items)
+        replacement = f"<{self.prefix}{tag}{_format_attrs(attrs)}>{body}</{self.prefix}{tag}>"
+        return xml[:match.start()] + replacement + xml[match.end():]
+
+
+# XML 1.0 で使用できない文字（タブ・改行・復帰以外の制御文字等）。
+# escape() ではエスケープされず、そのまま書き込むとシートXMLが壊れて読み込めなくなるため除去する
+XML_ILLEGAL_CHARACTERS_RE = re.compile("[^\u0009\u000a\u000d\u0020-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+
+
+def _cell_xml(prefix: str, ref: str, value: str, style_id: Optional[str]) -> str:
+    """インライン文字列のセル要素を作成"""
+    attrs = [("r", ref)]
+    if style_id is not None:
+        attrs.append(("s", style_id))
+    value = "" if value is None else XML_ILLEGAL_CHARACTERS_RE.sub("", str(value))
+    if value == "":
+        return f"<{prefix}c{_format_attrs(attrs)}/>"
+    attrs.append(("t", "inlineStr"))
+    space = ' xml:space="preserve"' if value != value.strip() or "\n" in value else ""
+    return f"<{prefix}c{_format_attrs(attrs)}><{prefix}is><{prefix}t{space}>{escape(value)}</{prefix}t></{prefix}is></{prefix}c>"
+
+
+def _patch_row(prefix: str, row_number: int, row_attrs: str, row_body: str,
+               patches: Dict[int, Tuple[str, Optional[PatternFill]]], styles: _StylePatcher) -> str:
+    """
+    行要素の書き換え
+    
+    Args:
+        prefix: 名前空間の接頭辞
+        row_number: 行番号
+        row_attrs: 行要素の属性文字列
+        row_body: 行要素の内容（セル要素の並び）
+        patches: 列番号 -> (値, 塗りつぶし)
+        styles: スタイルの追加処理
+    
+    Returns:
+        書き換えた行要素
+    """
+    p = re.escape(prefix)
+    cells: List[Tuple[int, str, Dict[str, str]]] = []
+    column = 0
+    for match in re.finditer(rf"<{p}c\b([^>]*?)(?:/>|>.*?</{p}c>)", row_body, re.S):
+        attrs = dict(_parse_attrs(match.group(1)))
+        ref = attrs.get("r")
+        column = column_index_from_string(_CELL_REF_RE.match(ref).group(1)) if ref else column + 1
+        cells.append((column, match.group(0), attrs))
+    
+    existing = {column: attrs for column, _, attrs in cells}
+    result = [(column, xml) for column, xml, _ in cells if column not in patches]
+    for column, (value, fill) in patches.items():
+        style_id = existing.get(column, {}).get("s")
+        if fill is not None:
+            style_id = str(styles.style_with_fill(int(style_id or 0), fill))
+        ref = f"{get_column_letter(column)}{row_number}"
+        result.append((column, _cell_xml(prefix, ref, value, style_id)))
+    result.sort(key=lambda item: item[0])
+    
+    # spans はセル範囲のヒントのため、変更した行では削除する
+    attrs = [(k, v) for k, v in _parse_attrs(row_attrs) if k != "spans"]
+    return f"<{prefix}row{_format_attrs(attrs)}>{''.join(xml for _, xml in result)}</{prefix}row>"
+
+
+def _patch_sheet(xml: str, patches: CellPatches, styles: _StylePatcher) -> str:
+    """
+    シートXMLの書き換え（変更対象の行のみ再構築し、その他はそのまま残す）
+    
+    Args:
+        xml: シートXMLの内容
+        patches: (行番号, 列番号) -> (値, 塗りつぶし)
+        styles: スタイルの追加処理
+    
+    Returns:
+        書き換えたシートXML
+    """
+    match = re.search(r"<(\w+:)?worksheet\b", xml)
+    prefix = (match.group(1) or "") if match else ""
+    p = re.escape(prefix)
+    
+    by_row: Dict[int, Dict[int, Tuple[str, Optional[PatternFill]]]] = {}
+    for (row, column), patch in patches.items():
+        by_row.setdefault(row, {})[column] = patch
+    pending = sorted(by_row)
+    
+    sheet_data = re.search(rf"<{p}sheetData\b[^>]*?(/>|>)", xml)
+    if sheet_data is None:
+        raise ValueError("シートXMLに sheetData 要素がありません")
+    if sheet_data.group(1) == "/>":
+        xml = xml[:sheet_data.start()] + f"<{prefix}sheetData></{prefix}sheetData>" + xml[sheet_data.end():]
+        sheet_data = re.search(rf"<{p}sheetData\b[^>]*?>", xml)
+    data_start = sheet_data.end()
+    data_end = xml.index(f"</{prefix}sheetData>", data_start)
+    
+    out = [xml[:data_start]]
+    position = data_start
+    row_pattern = re.compile(rf"<{p}row\b([^>]*?)(?:/>|>(.*?)</{p}row>)", re.S)
+    last_row = 0
+    for row_match in row_pattern.finditer(xml, data_start, data_end):
+        attrs = dict(_parse_attrs(row_match.group(1)))
+        row_number = int(attrs["r"]) if "r" in attrs else last_row + 1
+        last_row = row_number
+        
+        # 存在しない行は、行番号順の位置に挿入する
+        while pending and pending[0] < row_number:
+            out.append(xml[position:row_match.start()])
+            position = row_match.start()
+            row = pending.pop(0)
+            out.append(_patch_row(prefix, row, f' r="{row}"', "", by_row[row], styles))
+        
+        if pending and pending[0] == row_number:
+            pending.pop(0)
+            out.append(xml[position:row_match.start()])
+            out.append(_patch_row(prefix, row_number, row_match.group(1), row_match.group(2) or "",
+                                  by_row[row_number], styles))
+            position = row_match.end()
+    
+    out.append(xml[position:data_end])
+    for row in pending:
+        out.append(_patch_row(prefix, row, f' r="{row}"', "", by_row[row], styles))
+    out.append(xml[data_end:])
+    return "".join(out)
+
+
+def patch_cells(path: str, sheet_name: str, patches: CellPatches, output_path: Optional[str] = None):
+    """
+    xlsxファイルの指定セルの書き換え
+    
+    対象シートのXMLで変更のある行のみを書き換え、その他のパートはそのままコピーする。
+    値はインライン文字列として書き込む。
+    
+    Args:
+        path: xlsxファイルのパス
+        sheet_name: シート名
+        patches: (行番号, 列番号) -> (値, 塗りつぶし)
+        output_path: 出力先のパス（省略時は path を置き換える）
+    """
+    patch_sheets(path, {sheet_name: patches}, output_path)
+
+
+def patch_sheets(path: str, sheet_patches: Dict[str, CellPatches], output_path: Optional[str] = None):
+    """
+    xlsxファイルの複数シートの指定セルの書き換え（ファイルの書き換えは1回のみ）
+    
+    Args:
+        path: xlsxファイルのパス
+        sheet_patches: シート名 -> (行番号, 列番号) -> (値, 塗りつぶし)
+        output_path: 出力先のパス（省略時は path を置き換える）
+    """
+    output_path = output_path or path
+    with zipfile.ZipFile(path) as zin:
+        sheet_parts, styles_part = _find_parts(zin, sheet_patches)
+        styles = _StylePatcher(zin.read(styles_part).decode("utf-8") if styles_part else None)
+        sheet_xmls = {
+            part: _patch_sheet(zin.read(part).decode("utf-8"), sheet_patches[sheet_name], styles)
+            for part, sheet_name in sheet_parts.items()
+        }
+        styles_xml = styles.patched()
+        
+        fd, temp_path = tempfile.mkstemp(suffix=".xlsx", dir=os.path.dirname(os.path.abspath(output_path)))
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(temp_path, "w") as zout:
+                for info in zin.infolist():
+                    if info.filename in sheet_xmls:
+                        zout.writestr(info, sheet_xmls[info.filename].encode("utf-8"))
+                    elif info.filename == styles_part and styles_xml is not None:
+                        zout.writestr(info, styles_xml.encode("utf-8"))
+                    else:
+                        with zin.open(info) as src, zout.open(info, "w") as dst:
+                            shutil.copyfileobj(src, dst)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    for sheet_name, patches in sheet_patches.items():
+        logger.info(f"{len(patches)}セルを書き換えました: {output_path} ({sheet_name})")
@@ -0,0 +1,70 @@
+"""
+テンプレートベースExcel管理の単体テストモジュール
+ResultAggregate によるテスト結果の集約のテストケース
+"""
+import pytest
+from testlib.excel_manager import CELL_MAX_LENGTH, MAX_NOTE_ERRORS, ResultAggregate
+
+
+def aggregate(*results) -> ResultAggregate:
+    """(テスト結果, エラー情報) を順に追加した ResultAggregate"""
+    agg = ResultAggregate()
+    for result_text, error_info in results:
+        agg.add(result_text, error_info)
+    return agg
+
+
+class TestResultAggregate:
+    """テスト結果の集約のテストクラス"""
+    
+    @pytest.mark.parametrize("results, expected", [
+        (["OK", "OK"], "OK"),
+        (["OK", "SKIP", "OK"], "SKIP"),
+        (["SKIP", "OK"], "SKIP"),
+        (["OK", "NG", "SKIP"], "NG"),
+        (["NG", "SKIP", "OK"], "NG"),
+    ])
+    def test_priority(self, results, expected):
+        """NG > SKIP > OK の優先順位のテスト（追加順に依存しないこと）"""
+        agg = aggregate(*[(result_text, None) for result_text in results])
+        assert agg.result_text == expected
+        assert agg.count == len(results)
+    
+    def test_single_result_note(self):
+        """結果が1件の場合の補足のテスト（NGのエラー情報のみ）"""
+        assert aggregate(("OK", None)).note is None
+        assert aggregate(("NG", "AssertionError")).note == "AssertionError"
+    
+    def test_multiple_results_note(self):
+        """結果が複数の場合の補足のテスト（件数の内訳と重複を除いたエラー情報）"""
+        agg = aggregate(("OK", None), ("NG", "エラーA"), ("SKIP", None), ("NG", "エラーB"), ("NG", "エラーA"))
+        assert agg.note.split("\n") == [
+            "5件の結果を集約（OK 1件, NG 3件, SKIP 1件）",
+            "エラーA",
+            "エラーB",
+        ]
+    
+    def test_error_cap(self):
+        """補足に列挙するエラー情報が MAX_NOTE_ERRORS 件で打ち切られることのテスト"""
+        agg = aggregate(*[("NG", f"エラー{i}") for i in range(MAX_NOTE_ERRORS + 5)])
+        lines = agg.note.split("\n")
+        assert lines[1:-1] == [f"エラー{i}" for i in range(MAX_NOTE_ERRORS)]
+        assert lines[-1] == "（以降のエラー情報は省略）"
+    
+    def test_error_cap_duplicates(self):
+        """上限に達した後の重複したエラー情報では省略にならないことのテスト"""
+        agg = aggregate(*[("NG", f"エラー{i}") for i in range(MAX_NOTE_ERRORS)], ("NG", "エラー0"))
+        assert not agg.errors_omitted
+        assert "（以降のエラー情報は省略）" not in agg.note
+    
+    def test_truncate_single(self):
+        """結果が1件の場合に補足がセルの最大文字数で切り詰められることのテスト"""
+        agg = aggregate(("NG", "x" * (CELL_MAX_LENGTH + 100)))
+        assert agg.note == "x" * CELL_MAX_LENGTH
+    
+    def test_truncate_multiple(self):
+        """結果が複数の場合に補足がセルの最大文字数で切り詰められることのテスト"""
+        agg = aggregate(*[("NG", f"{i}" * 5000) for i in range(MAX_NOTE_ERRORS)])
+        note = agg.note
+        assert len(note) == CELL_MAX_LENGTH
+        assert note.startswith(f"{MAX_NOTE_ERRORS}件の結果を集約")
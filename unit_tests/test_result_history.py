@@ -0,0 +1,103 @@
+"""
+テスト結果履歴の単体テストモジュール
+result_history のテストケース
+"""
+import pytest
+from testlib.result_history import ResultHistory, percentile
+
+
+@pytest.fixture
+def history(tmp_path):
+    """空のテスト結果履歴"""
+    history = ResultHistory(str(tmp_path / "history.db"), batch_size=2)
+    yield history
+    history.close()
+
+
+def add_run(history: ResultHistory, durations: dict, status: str = "passed") -> int:
+    """実行の登録（テスト名 -> 実行時間）"""
+    run_id = history.start_run(f"run{len(history.recent_runs()) + 1}", "v1.0")
+    for test_name, duration in durations.items():
+        history.add({"test_name": test_name, "status": status, "duration": duration})
+    return run_id
+
+
+class TestPercentile:
+    """パーセンタイルの算出のテストクラス"""
+    
+    @pytest.mark.parametrize("p, expected", [(0, 1), (10, 1), (25, 3), (50, 5), (90, 9), (95, 10), (100, 10)])
+    def test_nearest_rank(self, p, expected):
+        """最近傍順位法のテスト"""
+        assert percentile(list(range(1, 11)), p) == expected
+    
+    def test_single_value(self):
+        """値が1件の場合のテスト"""
+        assert all(percentile([2.5], p) == 2.5 for p in (0, 50, 100))
+    
+    def test_even_count_median(self):
+        """値が偶数件の場合の中央値（補間せず下側の値）のテスト"""
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+
+
+class TestResultHistory:
+    """テスト結果履歴のテストクラス"""
+    
+    def test_recent_runs(self, history):
+        """直近の実行IDの取得のテスト"""
+        run_ids = [add_run(history, {}) for _ in range(4)]
+        assert history.recent_runs() == run_ids[::-1]
+        assert history.recent_runs(2) == run_ids[:1:-1]
+        assert history.recent_runs(2, before=run_ids[2]) == run_ids[1::-1]
+    
+    def test_duration_percentiles(self, history):
+        """成功した結果のみでテストごとのパーセンタイルを算出するテスト（未登録分も含める）"""
+        for duration in (3.0, 1.0, 2.0):
+            add_run(history, {"test_a": duration, "test_b": duration * 10})
+        add_run(history, {"test_a": 100.0}, status="failed")
+        assert history.duration_percentiles((50, 100)) == {
+            "test_a": {50: 2.0, 100: 3.0},
+            "test_b": {50: 20.0, 100: 30.0},
+        }
+        assert history.duration_percentiles((50,), test_names=["test_b"]) == {"test_b": {50: 20.0}}
+    
+    def test_find_regressions(self, history):
+        """直前の実行の中央値の threshold 倍を超えたテストを倍率の大きい順に返すテスト"""
+        for _ in range(3):
+            add_run(history, {"test_a": 1.0, "test_b": 1.0, "test_c": 1.0, "test_d": 1.0})
+        add_run(history, {"test_a": 1.4, "test_b": 3.0, "test_c": 2.0, "test_new": 5.0})
+        assert history.find_regressions(threshold=1.5) == [
+            ("test_b", 3.0, 1.0, 3.0),
+            ("test_c", 2.0, 1.0, 2.0),
+        ]
+    
+    def test_find_regressions_window(self, history):
+        """比較対象が直前 window 回の実行に限られるテスト"""
+        for duration in (1.0, 1.0, 3.0, 3.0, 4.0):
+            add_run(history, {"test_a": duration})
+        assert history.find_regressions(threshold=1.5, window=2) == []
+        assert history.find_regressions(threshold=1.5, window=4) == [("test_a", 4.0, 1.0, 4.0)]
+    
+    def test_find_regressions_run_id(self, history):
+        """指定した実行を、それより前の実行と比較するテスト"""
+        first = add_run(history, {"test_a": 1.0})
+        target = add_run(history, {"test_a": 2.0})
+        add_run(history, {"test_a": 2.0})
+        assert history.find_regressions(threshold=1.5, run_id=target) == [("test_a", 2.0, 1.0, 2.0)]
+        assert history.find_regressions(threshold=1.5, run_id=first) == []
+    
+    def test_find_regressions_filters(self, history):
+        """過去の実行がない場合・失敗した結果・min_duration 未満のテストを対象外とするテスト"""
+        add_run(history, {"test_a": 1.0})
+        assert history.find_regressions() == []
+        add_run(history, {"test_a": 0.001, "test_b": 0.004})
+        # 失敗した結果は中央値に含めない（含めると test_a の中央値は 0.5 になる）
+        add_run(history, {"test_a": 0.5}, status="failed")
+        add_run(history, {"test_a": 0.009, "test_b": 0.02})
+        assert history.find_regressions(threshold=1.5, min_duration=0.01) == [
+            ("test_b", 0.02, 0.004, pytest.approx(5.0))]
+        assert history.find_regressions(threshold=1.5, min_duration=0.001) == [
+            ("test_a", 0.009, 0.001, pytest.approx(9.0)),
+            ("test_b", 0.02, 0.004, pytest.approx(5.0)),
+        ]
+        add_run(history, {"test_a": 100.0}, status="failed")
+        assert history.find_regressions() == []
@@ -0,0 +1,128 @@
+"""
+テスト結果ジャーナル・レポート再生成の単体テストモジュール
+result_journal と rebuild_reports のテストケース
+"""
+import json
+import logging
+import os
+import shutil
+import sys
+import pytest
+from openpyxl import load_workbook
+import rebuild_reports
+from testlib.result_journal import ResultJournal, read_journal
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TIMESTAMP = "20260101_120000"
+
+RECORDS = [
+    {"test_name": "tests/test_a.py::test_1", "test_id": "TC001", "status": "passed", "duration": 0.5,
+     "error_message": "", "error_info": "", "category": "計算", "timestamp": "2026-01-01 12:00:00"},
+    {"test_name": "tests/test_a.py::test_2", "test_id": "TC002", "status": "failed", "duration": 1.5,
+     "error_message": "AssertionError: 1 != 2", "error_info": "AssertionError", "category": "計算",
+     "timestamp": "2026-01-01 12:00:01"},
+    {"test_name": "tests/test_b.py::test_1", "status": "skipped", "duration": 0.0,
+     "category": "General", "timestamp": "2026-01-01 12:00:02"},
+]
+
+
+def write_lines(path, lines):
+    """ジャーナルファイルの作成（1要素を1行として書き込む）"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(line + "\n" for line in lines))
+
+
+class TestReadJournal:
+    """ジャーナルの読み込みのテストクラス"""
+    
+    def test_round_trip(self, tmp_path):
+        """追記した結果を同じ内容で読み込み、エポック秒の実行日時を文字列で記録するテスト"""
+        path = str(tmp_path / "journal.jsonl")
+        journal = ResultJournal(path, fsync_interval=2)
+        journal.append(RECORDS[0])
+        journal.append(dict(RECORDS[1], timestamp=0.0))
+        journal.close()
+        
+        records = list(read_journal(path))
+        assert records[0] == RECORDS[0]
+        assert isinstance(records[1]["timestamp"], str)
+        assert dict(records[1], timestamp=None) == dict(RECORDS[1], timestamp=None)
+        assert journal.count == 2
+    
+    def test_skip_corrupt_lines(self, tmp_path, caplog):
+        """壊れた行・途中で切れた最終行・空行を読み飛ばし、警告を出力するテスト"""
+        path = str(tmp_path / "journal.jsonl")
+        lines = [json.dumps(record, ensure_ascii=False) for record in RECORDS]
+        write_lines(path, [lines[0], "{broken", "", lines[1], lines[2][:20]])
+        
+        with caplog.at_level(logging.WARNING, logger="pytest_logger"):
+            records = list(read_journal(path))
+        assert records == RECORDS[:2]
+        warnings = [record.getMessage() for record in caplog.records if record.levelno == logging.WARNING]
+        assert len(warnings) == 2
+        assert "2行目" in warnings[0]
+        assert "5行目" in warnings[1]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """設定ファイル・テンプレートを複製した作業ディレクトリ（終了時にロガーのハンドラを閉じる）"""
+    shutil.copytree(os.path.join(REPO_DIR, "conf"), tmp_path / "conf")
+    shutil.copytree(os.path.join(REPO_DIR, "template"), tmp_path / "template")
+    (tmp_path / "output").mkdir()
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    logger = logging.getLogger("pytest_logger")
+    for handler in logger.handlers[:]:
+        handler.close()
+        logger.removeHandler(handler)
+
+
+def run_rebuild(monkeypatch, *args) -> int:
+    """rebuild_reports.main をコマンドライン引数を指定して実行"""
+    monkeypatch.setattr(sys, "argv", ["rebuild_reports.py", *args])
+    return rebuild_reports.main()
+
+
+class TestRebuildReports:
+    """レポート再生成のテストクラス"""
+    
+    @pytest.mark.parametrize("path, expected", [
+        (f"output/test_results_{TIMESTAMP}.jsonl", TIMESTAMP),
+        (f"/tmp/test_results_{TIMESTAMP}.jsonl", TIMESTAMP),
+        ("output/journal.jsonl", ""),
+    ])
+    def test_journal_timestamp(self, path, expected):
+        """ジャーナルのファイル名からのタイムスタンプの取得のテスト"""
+        assert rebuild_reports.journal_timestamp(path) == expected
+    
+    def test_missing_journal(self, workdir, monkeypatch):
+        """ジャーナルが存在しない場合のテスト"""
+        assert run_rebuild(monkeypatch, "output/test_results_missing.jsonl", "--no-template") == 1
+    
+    def test_rebuild_detail_report(self, workdir, monkeypatch):
+        """ジャーナルと同じタイムスタンプで詳細レポートを再生成するテスト（壊れた行は読み飛ばす）"""
+        journal = f"output/test_results_{TIMESTAMP}.jsonl"
+        write_lines(journal, [json.dumps(record, ensure_ascii=False) for record in RECORDS] + ['{"test_name"'])
+        
+        assert run_rebuild(monkeypatch, journal, "--no-template") == 0
+        assert not os.path.exists("output/test_results.xlsx")
+        
+        workbook = load_workbook(f"output/test_results_{TIMESTAMP}.xlsx", read_only=True)
+        rows = list(workbook["All Tests"].iter_rows(min_row=2, values_only=True))
+        assert [(row[1], row[3], row[5]) for row in rows] == [
+            (record["test_name"], record["status"], record["timestamp"]) for record in RECORDS]
+        assert {"計算", "General"} <= set(workbook.sheetnames)
+        workbook.close()
+    
+    def test_rebuild_template(self, workdir, monkeypatch):
+        """テンプレートベースの結果ファイルにテスト番号のある結果を記録するテスト"""
+        journal = f"output/test_results_{TIMESTAMP}.jsonl"
+        write_lines(journal, [json.dumps(record, ensure_ascii=False) for record in RECORDS])
+        
+        assert run_rebuild(monkeypatch, journal) == 0
+        
+        ws = load_workbook("output/test_results.xlsx")["テスト結果"]
+        results = {row[0]: (row[6], row[7]) for row in ws.iter_rows(min_row=4, values_only=True)}
+        assert results["TC001"] == ("OK", None)
+        assert results["TC002"] == ("NG", "AssertionError")
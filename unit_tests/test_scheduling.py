@@ -0,0 +1,200 @@
+"""
+テスト実行順序・分割・選択の単体テストモジュール
+scheduling のテストケース
+"""
+from types import SimpleNamespace
+import pytest
+from testlib.scheduling import (lpt_order, parse_shard, schedule_items, select_by_recorded_results,
+                                select_shard)
+
+
+def make_item(nodeid: str, test_id=None):
+    """テスト項目の代わりのオブジェクト"""
+    return SimpleNamespace(nodeid=nodeid, excel_test_id=test_id)
+
+
+def nodeids(items) -> list:
+    """テスト項目の nodeid のリスト"""
+    return [item.nodeid for item in items]
+
+
+# モジュールごとの実行時間: a.py 6秒、b.py 5秒、c.py 4秒、d.py 3秒
+DURATIONS = {
+    "a.py::test_1": 1.0, "a.py::test_2": 5.0,
+    "b.py::TestB::test_1": 4.0, "b.py::TestB::test_2": 0.5, "b.py::test_3": 0.5,
+    "c.py::test_1": 4.0,
+    "d.py::test_1": 1.0, "d.py::test_2": 2.0,
+}
+
+
+def collected_items() -> list:
+    """DURATIONS のテストを収集順（c, a, d, b）に並べたテスト項目"""
+    modules = ["c.py", "a.py", "d.py", "b.py"]
+    return [make_item(nodeid) for module in modules for nodeid in DURATIONS if nodeid.startswith(module)]
+
+
+class TestParseShard:
+    """分割指定の解析のテストクラス"""
+    
+    @pytest.mark.parametrize("text, expected", [("1/1", (1, 1)), ("1/4", (1, 4)), ("4/4", (4, 4)), (" 2 / 3 ", (2, 3))])
+    def test_valid(self, text, expected):
+        """正しい分割指定のテスト"""
+        assert parse_shard(text) == expected
+    
+    @pytest.mark.parametrize("text", ["", "1", "1/", "/4", "a/4", "1/4/2", "1.5/4"])
+    def test_invalid_format(self, text):
+        """i/N の形式でない分割指定のテスト"""
+        with pytest.raises(ValueError, match="i/N の形式"):
+            parse_shard(text)
+    
+    @pytest.mark.parametrize("text", ["0/4", "5/4", "-1/4", "1/0", "0/0", "1/-1"])
+    def test_out_of_range(self, text):
+        """範囲外の分割指定のテスト"""
+        with pytest.raises(ValueError, match="範囲外"):
+            parse_shard(text)
+
+
+class TestLptOrder:
+    """実行時間による並べ替えのテストクラス"""
+    
+    def test_module_order(self):
+        """合計実行時間の長いモジュールから順に、モジュール内は収集順のまま並べるテスト"""
+        assert nodeids(lpt_order(collected_items(), DURATIONS)) == [
+            "a.py::test_1", "a.py::test_2",
+            "b.py::TestB::test_1", "b.py::TestB::test_2", "b.py::test_3",
+            "c.py::test_1",
+            "d.py::test_1", "d.py::test_2",
+        ]
+    
+    def test_tie_keeps_collection_order(self):
+        """合計実行時間が同じモジュールは収集順のまま並べるテスト"""
+        items = [make_item("y.py::test_1"), make_item("x.py::test_1"), make_item("z.py::test_1")]
+        durations = {"x.py::test_1": 1.0, "y.py::test_1": 1.0, "z.py::test_1": 2.0}
+        assert nodeids(lpt_order(items, durations)) == ["z.py::test_1", "y.py::test_1", "x.py::test_1"]
+    
+    def test_unknown_duration(self):
+        """実行時間が不明なテストを既知のテストの平均値で見積もるテスト"""
+        items = [make_item("x.py::test_1"), make_item("y.py::test_1"), make_item("y.py::test_2"),
+                 make_item("z.py::test_1")]
+        durations = {"x.py::test_1": 3.0, "z.py::test_1": 1.0}
+        # y.py は不明な2件（平均 2秒 x 2件）で 4秒
+        assert nodeids(lpt_order(items, durations)) == [
+            "y.py::test_1", "y.py::test_2", "x.py::test_1", "z.py::test_1"]
+    
+    def test_no_durations(self):
+        """過去の実行時間がない場合は収集順のままのテスト"""
+        items = collected_items()
+        assert nodeids(lpt_order(items, {})) == nodeids(items)
+
+
+class TestSelectShard:
+    """テストの分割のテストクラス"""
+    
+    @pytest.mark.parametrize("count", [1, 2, 3, 4, 6])
+    def test_complete(self, count):
+        """全ての分割を合わせると全テストを重複なく1回ずつ選択するテスト"""
+        items = collected_items()
+        selected = []
+        for index in range(1, count + 1):
+            shard_items, deselected, loads = select_shard(items, DURATIONS, index, count)
+            assert len(shard_items) + len(deselected) == len(items)
+            assert len(loads) == count
+            selected.extend(nodeids(shard_items))
+        assert sorted(selected) == sorted(nodeids(items))
+    
+    def test_balance(self):
+        """モジュール単位で合計実行時間が均等になるように割り当てるテスト"""
+        items = collected_items()
+        shards = [nodeids(select_shard(items, DURATIONS, index, 2)[0]) for index in (1, 2)]
+        # a(6) -> 1, b(5) -> 2, c(4) -> 2, d(3) -> 1
+        assert shards == [
+            ["a.py::test_1", "a.py::test_2", "d.py::test_1", "d.py::test_2"],
+            ["b.py::TestB::test_1", "b.py::TestB::test_2", "b.py::test_3", "c.py::test_1"],
+        ]
+        assert select_shard(items, DURATIONS, 1, 2)[2] == [9.0, 9.0]
+    
+    def test_module_not_split(self):
+        """同じモジュールのテストを別の分割に割り当てないテスト"""
+        items = collected_items()
+        shard_of_module = {}
+        for index in range(1, 4):
+            for nodeid in nodeids(select_shard(items, DURATIONS, index, 3)[0]):
+                assert shard_of_module.setdefault(nodeid.split("::")[0], index) == index
+        assert len(shard_of_module) == 4
+    
+    def test_more_shards_than_modules(self):
+        """分割数がモジュール数より多い場合は空の分割があるテスト"""
+        items = collected_items()
+        shards = [select_shard(items, DURATIONS, index, 6)[0] for index in range(1, 7)]
+        assert [len(shard) for shard in shards] == [2, 3, 1, 2, 0, 0]
+    
+    def test_deterministic(self):
+        """同じ収集結果と実行時間からは常に同じ割り当てになるテスト"""
+        first = nodeids(select_shard(collected_items(), DURATIONS, 2, 3)[0])
+        second = nodeids(select_shard(collected_items(), DURATIONS, 2, 3)[0])
+        assert first == second
+
+
+class TestScheduleItems:
+    """テスト項目の並べ替え・分割のテストクラス"""
+    
+    def test_order_in_place(self):
+        """分割指定がない場合は items をその場で並べ替え、選択しなかったテスト項目がないテスト"""
+        items = collected_items()
+        original = items
+        assert schedule_items(items, DURATIONS) == []
+        assert items is original
+        assert nodeids(items) == nodeids(lpt_order(collected_items(), DURATIONS))
+    
+    def test_shard_in_place(self):
+        """分割指定がある場合は items を選択したテスト項目に置き換え、選択しなかったテスト項目を返すテスト"""
+        items = collected_items()
+        deselected = schedule_items(items, DURATIONS, (2, 2))
+        assert nodeids(items) == ["b.py::TestB::test_1", "b.py::TestB::test_2", "b.py::test_3", "c.py::test_1"]
+        assert sorted(nodeids(items + deselected)) == sorted(DURATIONS)
+
+
+class TestSelectByRecordedResults:
+    """記録済みのテスト結果による選択のテストクラス"""
+    
+    RESULTS = {"TC001": "OK", "TC002": "NG", "TC003": "SKIP", "TC004": None}
+    
+    def test_deselect_only_ok(self):
+        """OKのテストのみ選択せず、NG・SKIP・未記入のテストを選択するテスト"""
+        items = [make_item(f"test_{i}", f"TC00{i}") for i in range(1, 5)]
+        selected, deselected, unknown_ids = select_by_recorded_results(items, self.RESULTS)
+        assert [item.excel_test_id for item in selected] == ["TC002", "TC003", "TC004"]
+        assert [item.excel_test_id for item in deselected] == ["TC001"]
+        assert unknown_ids == []
+    
+    def test_without_test_id(self):
+        """テスト番号のないテストは選択されるテスト"""
+        items = [make_item("test_a"), make_item("test_b", "TC001")]
+        selected, deselected, _ = select_by_recorded_results(items, self.RESULTS)
+        assert [item.nodeid for item in selected] == ["test_a"]
+        assert [item.nodeid for item in deselected] == ["test_b"]
+    
+    def test_unknown_test_id(self):
+        """テンプレートに存在しないテスト番号のテストは選択されず、テスト番号が返されるテスト"""
+        items = [make_item("test_a", "TC999"), make_item("test_b", "TC002"), make_item("test_c", "TC999"),
+                 make_item("test_d", "TC100")]
+        selected, deselected, unknown_ids = select_by_recorded_results(items, self.RESULTS)
+        assert [item.nodeid for item in selected] == ["test_b"]
+        assert [item.nodeid for item in deselected] == ["test_a", "test_c", "test_d"]
+        assert unknown_ids == ["TC100", "TC999"]
+    
+    def test_test_id_normalized(self):
+        """テスト番号の前後の空白・数値のテスト番号をインデックスと同じ形式で照合するテスト"""
+        results = {"TC001": "OK", "42": "NG"}
+        items = [make_item("test_a", " TC001 "), make_item("test_b", 42)]
+        selected, deselected, unknown_ids = select_by_recorded_results(items, results)
+        assert [item.nodeid for item in selected] == ["test_b"]
+        assert [item.nodeid for item in deselected] == ["test_a"]
+        assert unknown_ids == []
+    
+    def test_keeps_order(self):
+        """選択したテストの順序が維持されるテスト"""
+        items = [make_item(f"test_{i}", f"TC00{4 - i % 4}") for i in range(8)]
+        selected, _, _ = select_by_recorded_results(items, self.RESULTS)
+        assert [item.nodeid for item in selected] == [item.nodeid for item in items
+                                                      if item.excel_test_id != "TC001"]
@@ -0,0 +1,67 @@
+"""
+パッチモードの単体テストモジュール
+xlsx_patcher によるセルの書き換えのテストケース
+"""
+import re
+import zipfile
+import pytest
+from openpyxl import Workbook, load_workbook
+from testlib.xlsx_patcher import patch_cells
+
+SHEET_NAME = "テスト結果"
+SHEET_PART = "xl/worksheets/sheet1.xml"
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    """書き換え対象のワークブック"""
+    path = tmp_path / "results.xlsx"
+    workbook = Workbook()
+    ws = workbook.active
+    ws.title = SHEET_NAME
+    ws["A1"] = "TC001"
+    workbook.save(path)
+    return str(path)
+
+
+def read_parts(path: str) -> dict:
+    """xlsxファイルのパート名 -> 内容"""
+    with zipfile.ZipFile(path) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+def dimension_element(xml: bytes) -> bytes:
+    """シートXMLの dimension 要素"""
+    return re.search(rb"<(?:\w+:)?dimension\b[^>]*/>", xml).group(0)
+
+
+class TestPatchCells:
+    """セルの書き換えのテストクラス"""
+    
+    def test_plain_text(self, workbook_path):
+        """通常の文字列の書き換えのテスト"""
+        patch_cells(workbook_path, SHEET_NAME, {(1, 7): ("OK", None), (1, 8): ("a < b & c\n2行目", None)})
+        ws = load_workbook(workbook_path)[SHEET_NAME]
+        assert ws["G1"].value == "OK"
+        assert ws["H1"].value == "a < b & c\n2行目"
+    
+    def test_control_characters(self, workbook_path):
+        """XMLで使用できない制御文字を含むエラーメッセージのテスト（除去して書き込み、ファイルが壊れないこと）"""
+        message = "\x1b[31mAssertionError\x1b[0m: \x00\x08\x0b\x0c\x1f\ufffe値"
+        patch_cells(workbook_path, SHEET_NAME, {(1, 8): (message, None)})
+        ws = load_workbook(workbook_path)[SHEET_NAME]
+        assert ws["H1"].value == "[31mAssertionError[0m: 値"
+        assert ws["A1"].value == "TC001"
+    
+    def test_other_parts_unchanged(self, workbook_path):
+        """対象シートのXML以外のパートと、シートの dimension 要素が変更されないことのテスト"""
+        before = read_parts(workbook_path)
+        patch_cells(workbook_path, SHEET_NAME, {(1, 8): ("\x1bエラー", None), (5, 2): ("追加行", None)})
+        after = read_parts(workbook_path)
+        
+        assert list(after) == list(before)
+        for name, content in before.items():
+            if name != SHEET_PART:
+                assert after[name] == content, name
+        assert after[SHEET_PART] != before[SHEET_PART]
+        assert dimension_element(after[SHEET_PART]) == dimension_element(before[SHEET_PART])